@@ -1,12 +1,18 @@
 """Command-line application for generating a complete HTML documentation site."""
 
 import argparse
+import contextlib
+import io
 import json
+import logging
 import webbrowser
 from pathlib import Path
 
 from pytexmd.core import process_file
-from pytexmd.sphinx_doc import make_html
+from pytexmd.log import add_logging_arguments, configure_logging
+from pytexmd.sphinx_doc import SphinxBuilder, make_html, resolve_jobs
+
+logger = logging.getLogger("pytexmd.converter")
 
 
 def generate_html(
@@ -17,13 +23,39 @@ def generate_html(
     author: str = "Author",
     version: str = "1.0",
     mathjax_macros: dict | None = None,
+    prune_bibliography: bool = False,
+    jobs: int | str = 1,
+    prerender_tikz: bool = False,
+    optimize_assets: bool = False,
+    profile: bool | str = False,
+    time_budget: float | None = None,
+    step_budget: int | None = None,
 ) -> Path:
-    """Convert a LaTeX project to MyST sources and a Sphinx HTML site."""
+    """Convert a LaTeX project to MyST sources and a Sphinx HTML site.
+
+    ``jobs`` is the number of parallel Sphinx workers, or ``"auto"``.
+    ``prerender_tikz`` renders the TikZ pictures in parallel before the build.
+    ``optimize_assets`` precompresses the site and writes its asset manifest.
+    ``profile`` prints the conversion and build stage profile; a path also
+    receives the JSON report. ``time_budget`` (seconds) and ``step_budget``
+    abort a conversion that runs longer (see :mod:`pytexmd.filter.budget`).
+    """
+    if profile:
+        from pytexmd.profiling import profiled
+
+        with profiled(None if profile is True else profile):
+            return generate_html(
+                input_file, output_folder, depth, project_name, author, version,
+                mathjax_macros, prune_bibliography, jobs, prerender_tikz, optimize_assets,
+                time_budget=time_budget, step_budget=step_budget,
+            )
     input_path = Path(input_file).expanduser().resolve()
     if not input_path.is_file():
         raise FileNotFoundError(f"LaTeX input file not found: {input_path}")
 
     output_path = Path(output_folder).expanduser().resolve()
+    budgets = {name: value for name, value in (("time_budget", time_budget), ("step_budget", step_budget))
+               if value is not None}
     process_file(
         str(input_path),
         str(output_path),
@@ -32,14 +64,85 @@ def generate_html(
         author=author,
         version=version,
         mathjax_macros=mathjax_macros,
+        prune_bibliography=prune_bibliography,
+        prerender_tikz=prerender_tikz,
+        **budgets,
+    )
+    html_directory = make_html(
+        str(output_path), raise_on_error=True, jobs=jobs, optimize_assets=optimize_assets
     )
-    html_directory = make_html(str(output_path), raise_on_error=True)
     index_path = html_directory / "index.html"
     if not index_path.is_file():
         raise RuntimeError(f"Sphinx did not generate {index_path}")
     return index_path
 
 
+def watch_html(
+    input_file: str,
+    output_folder: str,
+    open_browser: bool = False,
+    port: int = 8000,
+    poll_interval: float = 0.5,
+    **options,
+) -> None:
+    """Generate the site, then regenerate it whenever a project source changes.
+
+    ``options`` are the keyword arguments of :func:`generate_html`. Each
+    change reconverts the document; only pages whose Markdown changed are
+    rewritten, so the warm Sphinx application re-reads just those. With
+    ``open_browser`` the site is served on ``127.0.0.1:port`` and open pages
+    reload after every build. Stops on Ctrl+C.
+    """
+    from pytexmd.file_loader import load_tex_file
+    from pytexmd.watch import PreviewServer, ProjectWatcher, watch
+
+    index_path = generate_html(input_file, output_folder, **options)
+    input_path = Path(input_file).expanduser().resolve()
+    output_path = Path(output_folder).expanduser().resolve()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bib_paths = load_tex_file(str(input_path)).bib_paths
+    watcher = ProjectWatcher(str(input_path), str(output_path), bib_paths)
+    build_options = {name: options.pop(name) for name in ("jobs", "optimize_assets") if name in options}
+    builder = SphinxBuilder(output_path, build_options.get("jobs", 1))
+    preview = PreviewServer(index_path.parent, port) if open_browser else None
+
+    def rebuild(changed):
+        try:
+            process_file(str(input_path), str(output_path), **options)
+        except Exception as exc:
+            logger.error("pytexmd-html: conversion failed: %s", exc)
+            return
+        html_directory = builder.build()
+        if html_directory is None:
+            return
+        if build_options.get("optimize_assets"):
+            from pytexmd.static_assets import optimize_html_output
+
+            optimize_html_output(html_directory)
+        if preview is not None:
+            preview.notify()
+
+    if preview is not None:
+        logger.info("Previewing at %s (pages reload after each build)", preview.url)
+        webbrowser.open(preview.url)
+    logger.info("Watching %s for changes; press Ctrl+C to stop", watcher.root)
+    try:
+        watch(watcher, rebuild, poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if preview is not None:
+            preview.close()
+
+
+def _jobs_argument(value: str) -> int | str:
+    try:
+        resolve_jobs(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+    return value if value == "auto" else int(value)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Convert a LaTeX project into a PyTeXmd/Furo HTML site."
@@ -55,13 +158,67 @@ def main() -> None:
         type=Path,
         help="JSON file containing the MathJax macros object",
     )
+    parser.add_argument(
+        "--prune-bibliography",
+        action="store_true",
+        help="Only include cited bibliography entries in the generated site",
+    )
+    parser.add_argument(
+        "--prerender-tikz",
+        action="store_true",
+        help="Render TikZ pictures in parallel before the Sphinx build",
+    )
+    parser.add_argument(
+        "--jobs",
+        default=1,
+        type=_jobs_argument,
+        help='Parallel Sphinx build workers: a number or "auto" (default: 1)',
+    )
+    parser.add_argument(
+        "--optimize-assets",
+        action="store_true",
+        help="Write precompressed .gz/.br files and an asset manifest after the build",
+    )
     parser.add_argument(
         "--open",
         action="store_true",
         dest="open_browser",
         help="Open the generated site in the default browser",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rebuild the site whenever a project file changes",
+    )
+    parser.add_argument(
+        "--port",
+        default=8000,
+        type=int,
+        help="Local preview port for --watch --open (default: 8000)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=True,
+        default=False,
+        metavar="REPORT",
+        help="Print the time and memory of each stage; REPORT also receives the JSON report",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Abort a conversion that takes longer than SECONDS",
+    )
+    parser.add_argument(
+        "--step-budget",
+        type=int,
+        metavar="STEPS",
+        help="Abort a conversion that takes more than STEPS expansion steps",
+    )
+    add_logging_arguments(parser)
     args = parser.parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
 
     mathjax_macros = None
     if args.macros_file is not None:
@@ -75,20 +232,38 @@ def main() -> None:
                 1, "pytexmd-html: error: macros file must contain a JSON object\n"
             )
 
+    options = dict(
+        depth=args.depth,
+        project_name=args.project_name,
+        author=args.author,
+        version=args.version,
+        mathjax_macros=mathjax_macros,
+        prune_bibliography=args.prune_bibliography,
+        jobs=args.jobs,
+        prerender_tikz=args.prerender_tikz,
+        optimize_assets=args.optimize_assets,
+        time_budget=args.time_budget,
+        step_budget=args.step_budget,
+    )
     try:
+        if args.watch:
+            if args.profile:
+                parser.error("--profile cannot be combined with --watch")
+            watch_html(
+                args.input_file,
+                args.output_folder,
+                open_browser=args.open_browser,
+                port=args.port,
+                **options,
+            )
+            return
         index_path = generate_html(
-            args.input_file,
-            args.output_folder,
-            depth=args.depth,
-            project_name=args.project_name,
-            author=args.author,
-            version=args.version,
-            mathjax_macros=mathjax_macros,
+            args.input_file, args.output_folder, profile=args.profile, **options
         )
     except (OSError, RuntimeError) as exc:
         parser.exit(1, f"pytexmd-html: error: {exc}\n")
 
-    print(f"HTML site generated at: {index_path}")
+    logger.info("HTML site generated at: %s", index_path)
     if args.open_browser:
         webbrowser.open(index_path.as_uri())
 
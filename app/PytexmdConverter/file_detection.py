@@ -2,16 +2,14 @@
 
 from __future__ import annotations
 
-import os
-import re
 from dataclasses import dataclass
 from pathlib import Path
 
 from pytexmd.file_loader import (
     BIB_EXTENSIONS,
     IMAGE_EXTENSIONS,
-    INPUT_PATTERN,
     TEX_EXTENSIONS,
+    get_project_index,
 )
 
 
@@ -32,11 +30,17 @@ class DetectionReport:
 
 
 def detect_project_files(input_file: str | Path) -> DetectionReport:
-    r"""Mirror the loader's filesystem scan and exact ``\input{}`` resolution."""
+    r"""Report the loader's filesystem scan and exact ``\input{}`` resolution.
+
+    The scan is served by the same cached :class:`ProjectIndex` that
+    :func:`pytexmd.file_loader.load_tex_file` uses, so a conversion started
+    after the preview reuses it.
+    """
     entry = Path(input_file).expanduser().resolve()
     if not entry.is_file():
         raise FileNotFoundError(f"LaTeX input file not found: {entry}")
     root = entry.parent
+    index = get_project_index(str(root))
     categories = {
         **{extension: "LaTeX inventory" for extension in TEX_EXTENSIONS},
         **{extension: "Bibliography" for extension in BIB_EXTENSIONS},
@@ -44,108 +48,47 @@ def detect_project_files(input_file: str | Path) -> DetectionReport:
     }
     mechanisms: dict[Path, list[str]] = {}
     file_categories: dict[Path, str] = {}
-    scanned: list[Path] = []
-    warnings: list[str] = []
-
-    def record_walk_error(error: OSError) -> None:
-        warnings.append(f"Could not scan {error.filename}: {error}")
-
-    for directory, directories, filenames in os.walk(root, onerror=record_walk_error):
-        directories.sort(key=str.casefold)
-        filenames.sort(key=str.casefold)
-        for filename in filenames:
-            path = Path(directory, filename).resolve()
-            category = categories.get(path.suffix.lower())
-            if category is None:
-                continue
-            scanned.append(path)
-            file_categories[path] = category
-            mechanisms.setdefault(path, []).append("recursive extension scan")
+    warnings: list[str] = list(index.warnings)
+
+    for scanned in index.files:
+        path = Path(scanned)
+        file_categories[path] = categories[path.suffix.lower()]
+        mechanisms.setdefault(path, []).append("recursive extension scan")
 
     file_categories[entry] = "Entry source"
     mechanisms.setdefault(entry, []).insert(0, "selected entry file")
 
-    known_extensions = TEX_EXTENSIONS + IMAGE_EXTENSIONS + BIB_EXTENSIONS
-
-    def key(path: Path) -> str:
-        return path.stem if path.suffix.lower() in known_extensions else path.name
-
-    tex = {key(path): path for path in scanned if path.suffix.lower() in TEX_EXTENSIONS}
-    bib = {key(path): path for path in scanned if path.suffix.lower() in BIB_EXTENSIONS}
-    images = {
-        key(path): path for path in scanned if path.suffix.lower() in IMAGE_EXTENSIONS
-    }
-    all_files = {**tex, **bib, **images}
-
-    collision_groups: dict[str, list[Path]] = {}
-    for path in scanned:
-        collision_groups.setdefault(key(path), []).append(path)
     collisions = tuple(
-        f"{name}: " + ", ".join(str(path) for path in paths)
-        for name, paths in collision_groups.items()
-        if len(paths) > 1
+        f"{name}: " + ", ".join(paths)
+        for name, paths in index.collisions.items()
     )
 
-    def resolve_input(argument: str) -> Path:
-        normalized = argument.replace("\\", "/")
-        candidate = Path(os.path.normpath(os.path.join(root, normalized)))
-        if candidate.is_file():
-            return candidate.resolve()
-        for extension in TEX_EXTENSIONS:
-            extended = Path(str(candidate) + extension)
-            if extended.is_file():
-                return extended.resolve()
-        bare = Path(normalized).name
-        suffix = Path(bare).suffix.lower()
-        if suffix in known_extensions:
-            bare = Path(bare).stem
-        if bare in all_files:
-            return all_files[bare]
-        raise FileNotFoundError(argument)
-
-    pending = [entry]
-    seen_arguments: set[str] = set()
     external_input_directories: set[Path] = set()
     missing_inputs: list[str] = []
-    while pending:
-        source = pending.pop(0)
+    for source, edges in index.include_graph(str(entry)).items():
         try:
-            content = source.read_text(encoding="utf-8")
+            index.read(source)
         except (OSError, UnicodeError) as exc:
             warnings.append(f"Could not read input candidate {source}: {exc}")
             continue
-        for argument in re.findall(INPUT_PATTERN, content):
-            if argument in seen_arguments:
-                continue
-            seen_arguments.add(argument)
-            try:
-                resolved = resolve_input(argument)
-            except FileNotFoundError:
+        for argument, resolved in edges:
+            if resolved is None:
                 missing_inputs.append(argument)
                 continue
+            resolved_path = Path(resolved)
             mechanism = f"resolved from \\input{{{argument}}}"
-            mechanisms.setdefault(resolved, []).append(mechanism)
-            file_categories.setdefault(resolved, "Expanded input")
-            pending.append(resolved)
-            try:
-                resolved.parent.relative_to(root)
-            except ValueError:
-                external_input_directories.add(resolved.parent)
-
-    for external_directory in external_input_directories:
-        for directory, directories, filenames in os.walk(
-            external_directory, onerror=record_walk_error
-        ):
-            directories.sort(key=str.casefold)
-            filenames.sort(key=str.casefold)
-            for filename in filenames:
-                path = Path(directory, filename).resolve()
-                if path.suffix.lower() not in BIB_EXTENSIONS:
-                    continue
-                file_categories[path] = "Bibliography"
-                mechanisms.setdefault(path, []).append(
-                    "bibliography scan beside external input"
-                )
+            mechanisms.setdefault(resolved_path, []).append(mechanism)
+            file_categories.setdefault(resolved_path, "Expanded input")
+            if not index.is_inside(str(resolved_path.parent)):
+                external_input_directories.add(resolved_path.parent)
+
+    for external_directory in sorted(external_input_directories):
+        for bib_file in index.external_bib_files(str(external_directory)):
+            path = Path(bib_file)
+            file_categories[path] = "Bibliography"
+            mechanisms.setdefault(path, []).append(
+                "bibliography scan beside external input"
+            )
 
     files = tuple(
         DetectedFile(path, file_categories[path], tuple(dict.fromkeys(reasons)))
@@ -18,6 +18,7 @@ except ImportError:
 
 from .cli import generate_html
 from .file_detection import DetectionReport, detect_project_files
+from pytexmd.log import configure_logging
 from pytexmd.sphinx_doc import DEFAULT_MATHJAX_MACROS
 
 
@@ -591,6 +592,7 @@ def main() -> None:
             "Tkinter is required for pytexmd-gui. On Debian/Ubuntu install "
             "it with: sudo apt install python3-tk"
         )
+    configure_logging()
     try:
         root = tk.Tk()
     except tk.TclError as exc:
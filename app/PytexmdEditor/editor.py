@@ -19,7 +19,8 @@ from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path, PurePosixPath
 from urllib.parse import parse_qs, unquote, urlparse
 
-from pytexmd.sphinx_doc import make_html
+from pytexmd.log import configure_logging
+from pytexmd.sphinx_doc import SphinxBuilder
 
 _DIRECTIVE_RE = re.compile(
     r"^(?P<indent>[ \t]*)(?P<fence>:{3,}|`{3,})"
@@ -652,6 +653,7 @@ class SphinxProject:
         self._lock = threading.RLock()
         if not (self.source / "conf.py").is_file():
             raise ValueError(f"Not a Sphinx project: {self.root}")
+        self._builder = SphinxBuilder(self.root)
 
     def _source_path(self, relative: str) -> Path:
         path = (self.source / unquote(relative)).resolve()
@@ -1020,7 +1022,7 @@ class SphinxProject:
         with self._lock:
             output = io.StringIO()
             with redirect_stdout(output), redirect_stderr(output):
-                make_html(str(self.root), raise_on_error=True)
+                self._builder.build(raise_on_error=True)
             return output.getvalue()
 
     def delete_build(self) -> str:
@@ -1251,6 +1253,7 @@ def main() -> None:
         "--no-browser", action="store_true", help="Do not open a browser"
     )
     args = parser.parse_args()
+    configure_logging()
     project = args.project
     if project is None:
         try:
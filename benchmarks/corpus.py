@@ -0,0 +1,196 @@
+"""Deterministic synthetic LaTeX documents for the benchmarks.
+
+:func:`generate_document` writes a document from a :class:`CorpusSpec`.
+The spec sets the section tree, paragraphs, inline and displayed math,
+theorems and proofs, nested lists, labels and references, ``\\newcommand``
+definitions and the bibliography. ``scale`` multiplies the number of
+top-level sections and bibliography entries, so a document at scale 4 is
+four times as long as at scale 1 with the same structure. The macro
+definitions stay fixed, so the preprocessor's per-macro work grows
+linearly with the text. The same spec, scale and seed always give the same
+document.
+
+Usage:
+    python benchmarks/corpus.py out/corpus --scale 4
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+WORDS = (
+    "space map group ring field module vector norm operator sequence limit bound "
+    "measure integral function series compact open closed dense finite metric "
+    "kernel image basis dimension rank order prime graph edge vertex path cycle"
+).split()
+SECTION_COMMANDS = ("\\section", "\\subsection", "\\subsubsection")
+
+
+class CorpusSpec(NamedTuple):
+    """Shape of a synthetic document at scale 1."""
+
+    sections: int = 1
+    # Children per section at each deeper level: (subsections, subsubsections).
+    children: Tuple[int, ...] = (1, 1)
+    paragraphs: int = 2
+    sentences: int = 2
+    inline_math: int = 2
+    display_math: int = 1
+    theorems: int = 1
+    proofs: bool = True
+    list_depth: int = 2
+    list_items: int = 2
+    refs: int = 1
+    macros: int = 10
+    bib_entries: int = 10
+    cites: int = 1
+
+
+DEFAULT_SPEC = CorpusSpec()
+
+
+class _Writer:
+    def __init__(self, spec: CorpusSpec, scale: int, seed: int):
+        self.spec = spec
+        self.random = random.Random(seed)
+        self.bib_keys = [f"ref{number}" for number in range(spec.bib_entries * scale)]
+        self.labels: List[str] = []
+        self.counter = 0
+
+    def _next(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}:{self.counter}"
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.random.choice(WORDS) for _ in range(count))
+
+    def _macro(self) -> str:
+        number = self.random.randrange(self.spec.macros) if self.spec.macros else None
+        return f"\\mac{_letters(number)}{{x}}" if number is not None else "x"
+
+    def _sentence(self) -> str:
+        parts = [self._words(6).capitalize()]
+        for _ in range(self.spec.inline_math):
+            parts.append(f"with ${self._macro()}_{{{self.random.randrange(9)}}} + y^2$ {self._words(3)}")
+        return " ".join(parts) + "."
+
+    def paragraph(self) -> str:
+        sentences = [self._sentence() for _ in range(self.spec.sentences)]
+        for _ in range(self.spec.refs):
+            if self.labels:
+                sentences.append(f"See \\ref{{{self.random.choice(self.labels)}}}.")
+        for _ in range(self.spec.cites):
+            if self.bib_keys:
+                sentences.append(f"Compare \\cite{{{self.random.choice(self.bib_keys)}}}.")
+        return " ".join(sentences)
+
+    def display(self) -> str:
+        label = self._next("eq")
+        self.labels.append(label)
+        return (
+            "\\begin{equation}\\label{%s}\n  \\sum_{k=0}^{n} %s_k = \\int_0^1 f(t)\\,dt\n\\end{equation}"
+            % (label, self._macro())
+        )
+
+    def theorem(self) -> str:
+        label = self._next("thm")
+        block = (
+            f"\\begin{{theorem}}\\label{{{label}}}\n{self._sentence()}\n\\end{{theorem}}"
+        )
+        self.labels.append(label)
+        if self.spec.proofs:
+            block += f"\n\\begin{{proof}}\n{self._sentence()}\n\\end{{proof}}"
+        return block
+
+    def listing(self, depth: int) -> str:
+        environment = "itemize" if depth % 2 else "enumerate"
+        items = []
+        for _ in range(self.spec.list_items):
+            item = f"  \\item {self._sentence()}"
+            if depth < self.spec.list_depth:
+                item += "\n" + self.listing(depth + 1)
+            items.append(item)
+        return f"\\begin{{{environment}}}\n" + "\n".join(items) + f"\n\\end{{{environment}}}"
+
+    def section(self, level: int) -> str:
+        label = self._next("sec")
+        title = self._words(2).title()
+        parts = [f"{SECTION_COMMANDS[level]}{{{title} {self.counter}}}\\label{{{label}}}"]
+        self.labels.append(label)
+        for number in range(self.spec.paragraphs):
+            parts.append(self.paragraph())
+            if number < self.spec.display_math:
+                parts.append(self.display())
+            if number < self.spec.theorems:
+                parts.append(self.theorem())
+        if self.spec.list_depth:
+            parts.append(self.listing(1))
+        if level < len(self.spec.children) and level + 1 < len(SECTION_COMMANDS):
+            for _ in range(self.spec.children[level]):
+                parts.append(self.section(level + 1))
+        return "\n\n".join(parts)
+
+
+def _letters(number: int) -> str:
+    """Macro names may only contain letters: 0 -> a, 25 -> z, 26 -> ba."""
+    letters = ""
+    while True:
+        number, rest = divmod(number, 26)
+        letters = chr(ord("a") + rest) + letters
+        if not number:
+            return letters
+
+
+def generate_document(spec: CorpusSpec = DEFAULT_SPEC, scale: int = 1, seed: int = 0) -> Tuple[str, str]:
+    """Return ``(latex, bibtex)`` of a synthetic document.
+
+    Args:
+        spec: Shape of the document at scale 1.
+        scale: Multiplies the top-level sections and bibliography entries.
+        seed: Seed of the word and reference choices.
+    """
+    writer = _Writer(spec, scale, seed)
+    macros = "\n".join(
+        f"\\newcommand{{\\mac{_letters(number)}}}[1]{{\\mathbf{{#1}}_{{{number}}}}}" for number in range(spec.macros)
+    )
+    body = "\n\n".join(writer.section(0) for _ in range(spec.sections * scale))
+    latex = (
+        "\\documentclass{article}\n"
+        "\\newtheorem{theorem}{Theorem}\n"
+        f"{macros}\n"
+        "\\begin{document}\n\n"
+        f"{body}\n\n"
+        "\\bibliography{refs}\n"
+        "\\end{document}\n"
+    )
+    bibtex = "\n\n".join(
+        f"@article{{{key},\n  author = {{Author {number}}},\n  title = {{{writer._words(4).title()}}},\n"
+        f"  journal = {{Journal}},\n  year = {{{1990 + number % 30}}}\n}}"
+        for number, key in enumerate(writer.bib_keys)
+    )
+    return latex, bibtex + "\n"
+
+
+def write_corpus(folder: str | Path, spec: CorpusSpec = DEFAULT_SPEC, scale: int = 1, seed: int = 0) -> Path:
+    """Write ``main.tex`` and ``refs.bib`` to ``folder`` and return the main file."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    latex, bibtex = generate_document(spec, scale, seed)
+    (folder / "main.tex").write_text(latex, encoding="utf-8")
+    (folder / "refs.bib").write_text(bibtex, encoding="utf-8")
+    return folder / "main.tex"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", help="Folder for main.tex and refs.bib")
+    parser.add_argument("--scale", type=int, default=1, help="Size multiplier (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+    main_file = write_corpus(args.folder, scale=args.scale, seed=args.seed)
+    print(f"{main_file}: {main_file.stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Measure the memory a conversion takes at several document sizes.
+
+Converts the synthetic corpus (see ``corpus.py``) at each ``--scales``
+value with ``process_file`` under the profiler and reports, per stage, the
+peak of the memory traced by :mod:`tracemalloc` and the resident set size
+(RSS) of the process when the stage ends. Every scale runs in a fresh
+process, so the RSS figures do not carry over from a previous size.
+
+``--budget`` compares the traced peaks with a budget file such as
+``tests/memory_budget.json`` (which ``tests/test_memory_budget.py`` also
+checks); with ``--check`` the exit status is 1 when a stage is over budget.
+``--write-budget`` measures the budget's reference document and writes a new
+budget with ``--headroom`` times the measured peaks.
+
+Usage:
+    python benchmarks/memory.py --scales 1 4 --json memory.json
+    python benchmarks/memory.py --budget tests/memory_budget.json --check
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from corpus import write_corpus  # noqa: E402
+from pytexmd.core import process_file  # noqa: E402
+from pytexmd.log import configure_logging  # noqa: E402
+from pytexmd.profiling import profiled  # noqa: E402
+
+# Stages reported and budgeted; the expand phases are summed up by "finish up" and "total".
+STAGES = ("load", "bibliography", "preprocessor", "finish up", "render", "split", "write", "config")
+DEFAULT_BUDGET = Path(__file__).resolve().parents[1] / "tests" / "memory_budget.json"
+
+
+def measure(scale: int, seed: int = 0, depth: int = 2) -> Dict[str, Dict[str, int]]:
+    """Convert the corpus at ``scale`` and return the peak and RSS bytes of each stage and the total."""
+    configure_logging(level=logging.ERROR)
+    with tempfile.TemporaryDirectory() as directory:
+        main_file = write_corpus(Path(directory) / "corpus", scale=scale, seed=seed)
+        with profiled(memory=True) as profiler:
+            process_file(str(main_file), str(Path(directory) / "site"), depth=depth)
+    results = {}
+    for record in profiler.stages:
+        if record["stage"] in STAGES:
+            results[record["stage"]] = {"peak_bytes": record["peak_bytes"], "rss_bytes": record["rss_bytes"]}
+    results["total"] = {"peak_bytes": profiler.total["peak_bytes"], "rss_bytes": profiler.total["max_rss_bytes"]}
+    return results
+
+
+def measure_fresh(scale: int, seed: int = 0, depth: int = 2) -> Dict[str, Dict[str, int]]:
+    """:func:`measure` in a new interpreter process."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure, (scale, seed, depth))
+
+
+def over_budget(results: Dict[str, Dict[str, int]], budget: Dict) -> List[str]:
+    """Stages whose traced peak exceeds the budget's ``peak_bytes`` entry."""
+    return [
+        stage for stage, limit in budget["peak_bytes"].items()
+        if stage in results and results[stage]["peak_bytes"] > limit
+    ]
+
+
+def _mebibytes(value) -> str:
+    return f"{value / 1048576:.2f}" if value is not None else "-"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4], help="Corpus sizes (default: 1 4)")
+    parser.add_argument("--budget", help="Budget file to compare the peaks with")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when a stage is over budget")
+    parser.add_argument("--write-budget", nargs="?", const=str(DEFAULT_BUDGET), metavar="PATH",
+                        help=f"Write a budget for the reference document (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--headroom", type=float, default=2.0,
+                        help="Budget as a multiple of the measured peaks (default: 2.0)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    budget = None
+    if args.budget:
+        with open(args.budget, "r", encoding="utf-8") as file:
+            budget = json.load(file)
+    reference = budget["document"] if budget else {"scale": 1, "seed": 0, "depth": 2}
+    scales = sorted(set(args.scales) | ({reference["scale"]} if budget or args.write_budget else set()))
+    runs = {scale: measure_fresh(scale, reference["seed"], reference["depth"]) for scale in scales}
+
+    print(f"{'stage':<14}" + "".join(f"{f'{scale}x peak':>12}{f'{scale}x RSS':>12}" for scale in scales) + "  (MiB)")
+    for stage in STAGES + ("total",):
+        if not any(stage in runs[scale] for scale in scales):
+            continue
+        cells = []
+        for scale in scales:
+            result = runs[scale].get(stage, {})
+            cells.append(f"{_mebibytes(result.get('peak_bytes')):>12}{_mebibytes(result.get('rss_bytes')):>12}")
+        print(f"{stage:<14}" + "".join(cells))
+
+    failed = []
+    if budget:
+        failed = over_budget(runs[reference["scale"]], budget)
+        for stage in failed:
+            print(
+                f"{stage}: peak {_mebibytes(runs[reference['scale']][stage]['peak_bytes'])} MiB is over "
+                f"the budget of {_mebibytes(budget['peak_bytes'][stage])} MiB"
+            )
+        if not failed:
+            print(f"All stages are within {args.budget}")
+    if args.write_budget:
+        measured = runs[reference["scale"]]
+        new_budget = {
+            "document": reference,
+            "headroom": args.headroom,
+            "peak_bytes": {stage: int(result["peak_bytes"] * args.headroom) for stage, result in measured.items()},
+        }
+        with open(args.write_budget, "w", encoding="utf-8") as file:
+            json.dump(new_budget, file, indent=2)
+            file.write("\n")
+        print(f"Budget written to {args.write_budget}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"scales": scales, "runs": runs}, file, indent=2)
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Compare serial and parallel Sphinx HTML builds of a synthetic project.
+
+Writes a Sphinx project with ``--pages`` generated MyST pages (headings,
+inline and displayed math, admonitions and cross-references, like the pages
+pytexmd produces), then builds it from scratch once per ``--jobs`` value.
+
+Usage:
+    python benchmarks/parallel_build.py --pages 500 --jobs 1 auto
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pytexmd.sphinx_doc import create_sphinx_documentation, make_html, resolve_jobs  # noqa: E402
+
+PAGE = """# Section {number}
+
+({label})=
+## Statement {number}
+
+:::{{admonition}} Theorem {number}
+:class: pytexmd-admonition theorem
+:name: thm-{number}
+
+For every $x_{{{number}}} \\in \\mathbb{{R}}$ the identity
+$$
+\\sum_{{k=0}}^{{{number}}} \\binom{{{number}}}{{k}} x^k = (1 + x)^{{{number}}}
+$$
+holds, as used in {{ref}}`thm-{previous}`.
+:::
+
+{paragraphs}
+"""
+
+
+def write_project(root: Path, pages: int) -> None:
+    """Write a Sphinx project with ``pages`` synthetic section pages."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_sphinx_documentation(str(root), "Benchmark", "pytexmd", "1.0")
+    source = root / "source"
+    (source / "references.bib").write_text("", encoding="utf-8")
+    names = [f"section_{number:04d}" for number in range(pages)]
+    toctree = "\n".join(names)
+    (source / "index.md").write_text(
+        f"# Benchmark\n\n```{{toctree}}\n:maxdepth: 1\n\n{toctree}\n```\n",
+        encoding="utf-8",
+    )
+    paragraphs = "\n\n".join(
+        f"Paragraph {index} with inline math $a_{index} + b_{index}$ and more text." for index in range(20)
+    )
+    for number, name in enumerate(names):
+        (source / f"{name}.md").write_text(
+            PAGE.format(
+                number=number,
+                previous=max(number - 1, 0),
+                label=f"label-{number}",
+                paragraphs=paragraphs,
+            ),
+            encoding="utf-8",
+        )
+
+
+def time_build(root: Path, jobs: int | str) -> float:
+    """Build ``root`` from scratch and return the wall time in seconds."""
+    shutil.rmtree(root / "build", ignore_errors=True)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        make_html(str(root), raise_on_error=True, jobs=jobs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500, help="Number of generated pages")
+    parser.add_argument("--jobs", nargs="+", default=["1", "auto"], help='Worker counts, e.g. 1 4 auto')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory) / "site"
+        write_project(root, args.pages)
+        results = [(jobs, resolve_jobs(jobs), time_build(root, jobs)) for jobs in args.jobs]
+
+    baseline = results[0][2]
+    print(f"{args.pages} pages")
+    print(f"{'jobs':>6} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+    for jobs, workers, seconds in results:
+        print(f"{jobs:>6} {workers:>8} {seconds:>9.2f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Measure how the conversion stages scale with the document size.
+
+Generates the synthetic corpus (see ``corpus.py``) at each ``--scales``
+value and times ``load_tex_file``, ``run_preprocessor``, ``string_to_tree``,
+``split_document_to_files`` and ``process_file`` on it, keeping the fastest
+of ``--repeat`` runs. The empirical complexity exponent of each stage is the
+slope of log(time) over log(document size): about 1 for linear stages, 2
+for quadratic ones. Stages above ``--max-exponent``, or more than
+``--tolerance`` above their exponent in a ``--baseline`` report from an
+earlier run, are flagged; with ``--check`` the exit status is 1 when any
+stage is flagged.
+
+Usage:
+    python benchmarks/scaling.py --scales 1 4 16 --json scaling.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from corpus import write_corpus  # noqa: E402
+from pytexmd.core import process_file  # noqa: E402
+from pytexmd import file_loader  # noqa: E402
+from pytexmd.file_loader import load_tex_file  # noqa: E402
+from pytexmd.filter import split_document_to_files, string_to_tree  # noqa: E402
+from pytexmd.filter.preprocessor import run_preprocessor  # noqa: E402
+from pytexmd.log import configure_logging  # noqa: E402
+
+STAGES = ("load_tex_file", "run_preprocessor", "string_to_tree", "split_document_to_files", "process_file")
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    """Fastest wall time of ``repeat`` calls, in seconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def _load_cold(main_file: str):
+    """Load without the cached project index, as a fresh process would."""
+    file_loader._PROJECT_INDEXES.clear()
+    return load_tex_file(main_file)
+
+
+def time_stages(folder: Path, scale: int, repeat: int) -> Dict[str, float]:
+    """Time every stage on the corpus at ``scale``, written under ``folder``."""
+    main_file = str(write_corpus(folder / f"scale-{scale}", scale=scale))
+    content = load_tex_file(main_file).content
+    document = string_to_tree(content)
+    return {
+        "chars": len(content),
+        "load_tex_file": best_time(lambda: _load_cold(main_file), repeat),
+        "run_preprocessor": best_time(lambda: run_preprocessor(content), repeat),
+        "string_to_tree": best_time(lambda: string_to_tree(content), repeat),
+        "split_document_to_files": best_time(
+            lambda: split_document_to_files(document, str(folder / f"split-{scale}"), depth=2), repeat
+        ),
+        "process_file": best_time(
+            lambda: process_file(main_file, str(folder / f"site-{scale}"), depth=2), repeat
+        ),
+    }
+
+
+def exponent(sizes: List[float], times: List[float]) -> float:
+    """Least-squares slope of log(time) over log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(seconds, 1e-9)) for seconds in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16], help="Corpus sizes (default: 1 4 16)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest counts (default: 1)")
+    parser.add_argument("--max-exponent", type=float, default=1.2,
+                        help="Flag stages scaling worse than size**N (default: 1.2)")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when a stage is flagged")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare the exponents with")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed exponent increase over --baseline (default: 0.15)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    if len(set(args.scales)) < 2:
+        parser.error("give at least two different scales")
+
+    # References to theorem labels are reported as undefined warnings; keep the output to the table.
+    configure_logging(level=logging.ERROR)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = {stage: result["exponent"] for stage, result in json.load(file)["stages"].items()}
+    with tempfile.TemporaryDirectory() as directory:
+        runs = {scale: time_stages(Path(directory), scale, args.repeat) for scale in sorted(set(args.scales))}
+
+    scales = list(runs)
+    sizes = [runs[scale]["chars"] for scale in scales]
+    results = {}
+    for stage in STAGES:
+        times = [runs[scale][stage] for scale in scales]
+        slope = exponent(sizes, times)
+        regressed = stage in baseline and slope > baseline[stage] + args.tolerance
+        results[stage] = {"seconds": times, "exponent": slope, "flagged": slope > args.max_exponent or regressed}
+
+    print(f"{'stage':<24}" + "".join(f"{f'{scale}x s':>10}" for scale in scales) + f"{'exponent':>10}")
+    print(f"{'(chars)':<24}" + "".join(f"{size:>10,}" for size in sizes))
+    for stage, result in results.items():
+        flag = ""
+        if stage in baseline:
+            flag += f"  (baseline {baseline[stage]:.2f})"
+        if result["flagged"]:
+            flag += "  superlinear"
+        print(
+            f"{stage:<24}" + "".join(f"{seconds:>10.3f}" for seconds in result["seconds"])
+            + f"{result['exponent']:>10.2f}{flag}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"scales": scales, "chars": sizes, "stages": results}, file, indent=2)
+    flagged = [stage for stage, result in results.items() if result["flagged"]]
+    return 1 if args.check and flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Run the conversion on pathological inputs under a time budget.
+
+Each case of :data:`CASES` builds a document of a given size that stresses
+one weak spot: deeply nested environments and braces, one huge paragraph,
+thousands of labels and references, a ``\\begin`` without ``\\end``,
+unbalanced braces, an odd number of ``$`` and a command defined in terms of
+itself. ``string_to_tree`` runs on every case at every ``--sizes`` value
+under ``--seconds`` of :mod:`pytexmd.filter.budget`, and the complexity
+exponents of its steps and of its time over the size are reported. Cases
+listed in :data:`STOPPED` must be aborted by the budget; any other case
+that is aborted, that exceeds Python's recursion limit, or whose steps grow
+faster than ``size**--max-exponent``, is flagged, and with ``--check`` the
+exit status is 1.
+
+Usage:
+    python benchmarks/stress.py --sizes 1000 10000 --seconds 600
+"""
+
+import argparse
+import logging
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pytexmd.filter import budget, string_to_tree  # noqa: E402
+from pytexmd.log import configure_logging  # noqa: E402
+
+
+def _document(body: str, preamble: str = "") -> str:
+    return f"{preamble}\\begin{{document}}\n{body}\n\\end{{document}}"
+
+
+CASES: Dict[str, Callable[[int], str]] = {
+    "nested lists": lambda n: _document("\\begin{itemize}\\item a " * n + "\\end{itemize}" * n),
+    "nested braces": lambda n: _document("\\textbf{" * n + "x" + "}" * n),
+    "huge paragraph": lambda n: _document(" ".join(f"word {i} $x_{{{i}}}$ and" for i in range(n))),
+    "labels": lambda n: _document("\\section{A}\n" + "\n".join(
+        f"\\begin{{equation}}\\label{{eq:{i}}}x_{{{i}}}\\end{{equation}} see \\ref{{eq:{i}}}" for i in range(n)
+    )),
+    "missing end": lambda n: _document("\\begin{theorem}" * n + "text"),
+    "unbalanced braces": lambda n: _document("\\section{A " + "{x " * n),
+    "odd dollars": lambda n: _document("a $x$ b " * n + "$ c"),
+    "recursive macro": lambda n: _document("\\foo " * n, "\\newcommand{\\foo}{\\foo x}\n"),
+}
+# Cases the budget must abort, with the limit that stops them.
+STOPPED = {"recursive macro": "depth"}
+
+
+def run_case(name: str, size: int, seconds: Optional[float]) -> Dict:
+    """Convert case ``name`` at ``size``; return its characters, steps, time and the limit that stopped it.
+
+    A conversion that exceeds Python's recursion limit is reported as stopped by ``"recursion"``.
+    """
+    latex = CASES[name](size)
+    started = time.perf_counter()
+    stopped = None
+    with budget.conversion_budget(seconds=seconds) as limits:
+        try:
+            string_to_tree(latex)
+        except budget.ConversionBudgetExceeded as exc:
+            stopped = exc.kind
+        except RecursionError:
+            stopped = "recursion"
+    return {"chars": len(latex), "steps": limits.taken, "seconds": time.perf_counter() - started, "stopped": stopped}
+
+
+def exponent(sizes: List[float], values: List[float]) -> float:
+    """Least-squares slope of log(value) over log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in values]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Case sizes (default: 1000 10000)")
+    parser.add_argument("--seconds", type=float, default=600, help="Time budget per run (default: 600)")
+    parser.add_argument("--max-exponent", type=float, default=1.2,
+                        help="Flag cases whose steps grow faster than size**N (default: 1.2)")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="Only run these cases")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when a case is flagged")
+    args = parser.parse_args()
+    if len(set(args.sizes)) < 2:
+        parser.error("give at least two different sizes")
+
+    configure_logging(level=logging.CRITICAL)
+    sizes = sorted(set(args.sizes))
+    print(f"{'case':<18}{'size':>8}{'chars':>10}{'steps':>10}{'seconds':>10}  stopped by")
+    flagged = []
+    for name in args.cases or CASES:
+        runs = [run_case(name, size, args.seconds) for size in sizes]
+        for size, run in zip(sizes, runs):
+            print(
+                f"{name:<18}{size:>8}{run['chars']:>10,}{run['steps']:>10,}{run['seconds']:>10.3f}"
+                f"  {run['stopped'] or '-'}"
+            )
+        step_exponent = exponent(sizes, [run["steps"] for run in runs])
+        time_exponent = exponent(sizes, [run["seconds"] for run in runs])
+        problems = []
+        if any(run["stopped"] != STOPPED.get(name) for run in runs):
+            problems.append("unexpected budget outcome")
+        if name not in STOPPED and step_exponent > args.max_exponent:
+            problems.append("superlinear steps")
+        print(f"{'':<18}exponent: steps {step_exponent:.2f}, time {time_exponent:.2f}  {', '.join(problems)}")
+        if problems:
+            flagged.append(name)
+    return 1 if args.check and flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-__all__ = ['filter','file_loader','sphinx_doc','process_file',"config"]
+__all__ = ['filter','file_loader','sphinx_doc','sinks','process_file','convert_to_files','write_myst',"config"]
 
-from . import filter,file_loader,sphinx_doc,config
-from .core import process_file
\ No newline at end of file
+from . import log
+from . import filter,file_loader,sphinx_doc,sinks,config
+from .core import process_file, convert_to_files, write_myst
\ No newline at end of file
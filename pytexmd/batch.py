@@ -0,0 +1,272 @@
+"""Convert many LaTeX projects in one process pool (``pytexmd batch``).
+
+Jobs come from a manifest or a glob. A JSON manifest holds a list of job
+objects (see :func:`pytexmd.jobs.parse_job`), or ``{"defaults": {...}, "jobs":
+[...]}``. A CSV manifest has ``input_file`` and ``output_folder`` columns and
+optional ``html`` and option columns. A glob turns every matching main file
+into a job writing to its own folder under an output root.
+
+Each job runs in a worker process of a :class:`~concurrent.futures.ProcessPoolExecutor`,
+so interpreter start-up and imports are paid once per worker instead of once
+per project. A failing or crashing job is reported and does not stop the
+others. On POSIX systems a per-job timeout interrupts jobs that run too long.
+"""
+
+__all__ = ["load_manifest", "jobs_from_glob", "run_batch", "write_report", "batch_main"]
+
+import argparse
+import csv
+import glob as globbing
+import json
+import logging
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .jobs import JOB_OPTIONS, ConversionJob, parse_job, run_job
+from .log import LOGGER_NAME, add_logging_arguments, configure_logging
+
+logger = logging.getLogger(__name__)
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("", "0", "false", "no", "off")
+
+
+class JobTimeout(Exception):
+    """Raised inside a worker when a job exceeds its time limit."""
+
+
+def _csv_value(name: str, value: str) -> Any:
+    """Convert a CSV cell to the type the job option expects."""
+    expected = JOB_OPTIONS.get(name, bool if name == "html" else str)
+    if expected is bool:
+        if value.strip().lower() not in _TRUE + _FALSE:
+            raise ValueError(f"{name} must be true or false, not {value!r}")
+        return value.strip().lower() in _TRUE
+    if expected is int:
+        return int(value)
+    if expected is dict:
+        return json.loads(value)
+    if expected == (int, float):
+        return float(value)
+    if expected == (int, str):
+        return int(value) if value.strip().isdigit() else value.strip()
+    return value
+
+
+def load_manifest(path: str | Path) -> List[ConversionJob]:
+    """Read the jobs of a JSON or CSV manifest.
+
+    Relative input and output paths are resolved against the manifest's folder.
+
+    Raises:
+        ValueError: If the manifest or one of its jobs is invalid.
+    """
+    path = Path(path)
+    base = path.resolve().parent
+    if path.suffix.lower() == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            entries = [
+                {name: _csv_value(name, value) for name, value in row.items() if name and value not in (None, "")}
+                for row in csv.DictReader(file)
+            ]
+        defaults: Dict[str, Any] = {}
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            defaults, entries = data.get("defaults") or {}, data.get("jobs")
+        else:
+            defaults, entries = {}, data
+        if not isinstance(entries, list) or not isinstance(defaults, dict):
+            raise ValueError("a JSON manifest must be a list of jobs or an object with a 'jobs' list")
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"job {number}: a job must be an object")
+        try:
+            job = parse_job({**defaults, **entry})
+        except ValueError as exc:
+            raise ValueError(f"job {number}: {exc}") from None
+        jobs.append(job._replace(
+            input_file=str(base / os.path.expanduser(job.input_file)),
+            output_folder=str(base / os.path.expanduser(job.output_folder)),
+        ))
+    return jobs
+
+
+def jobs_from_glob(
+    pattern: str,
+    output_root: str | Path,
+    html: bool = False,
+    options: Optional[Dict[str, Any]] = None,
+) -> List[ConversionJob]:
+    """Create one job per file matching ``pattern``.
+
+    Each project is written to ``output_root`` under the path of its folder
+    relative to the deepest folder shared by all matches (just the folder
+    name when there is a single match).
+    """
+    inputs = sorted(os.path.abspath(path) for path in globbing.glob(os.path.expanduser(pattern), recursive=True))
+    inputs = [path for path in inputs if os.path.isfile(path)]
+    if not inputs:
+        return []
+    folders = [os.path.dirname(path) for path in inputs]
+    common = os.path.commonpath(folders) if len(inputs) > 1 else os.path.dirname(folders[0])
+    jobs = []
+    seen: Dict[str, str] = {}
+    for path, folder in zip(inputs, folders):
+        relative = os.path.relpath(folder, common)
+        if relative in seen:
+            raise ValueError(f"{path} and {seen[relative]} would be written to the same output folder")
+        seen[relative] = path
+        jobs.append(ConversionJob(path, str(Path(output_root, relative).resolve()), html, dict(options or {})))
+    return jobs
+
+
+def _run_with_timeout(job: ConversionJob, timeout: Optional[float]) -> Dict[str, Any]:
+    """Run ``job`` in this process, interrupting it after ``timeout`` seconds.
+
+    Module-level so it can run in a worker process. The limit uses
+    ``SIGALRM``, which pool workers can set because they run jobs in their main
+    thread. The alarm fires once, so the cleanup of the interrupted job is not
+    interrupted in turn. Without ``SIGALRM`` (Windows) jobs run unlimited.
+    """
+    if not timeout or not hasattr(signal, "setitimer"):
+        return run_job(job)
+    expired = False
+
+    def expire(signum, frame):
+        nonlocal expired
+        expired = True
+        raise JobTimeout(f"the job exceeded its time limit of {timeout:g} s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = run_job(job)
+    except JobTimeout as exc:
+        result = {"input_file": job.input_file, "output_folder": job.output_folder,
+                  "error": str(exc), "timings": {"total": timeout}, "log": ""}
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    if expired:
+        result["status"] = "timeout"
+    return result
+
+
+def run_batch(
+    jobs: List[ConversionJob],
+    workers: int | str = "auto",
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Run ``jobs`` on a process pool and return their results in job order.
+
+    Args:
+        jobs: Jobs from :func:`load_manifest` or :func:`jobs_from_glob`.
+        workers (int | str, optional): Worker processes, ``"auto"`` or N. Defaults to ``"auto"``.
+        timeout (float, optional): Time limit per job in seconds.
+
+    Returns:
+        List[dict]: One :func:`pytexmd.jobs.run_job` result per job, with ``status``
+        ``"ok"``, ``"error"`` or ``"timeout"``.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from .sphinx_doc import resolve_jobs
+
+    if not jobs:
+        return []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    # Workers write the messages of each job to its captured log, at the level set for this process.
+    with ProcessPoolExecutor(
+        max_workers=min(resolve_jobs(workers), len(jobs)),
+        initializer=configure_logging,
+        initargs=(logging.getLogger(LOGGER_NAME).level or logging.INFO,),
+    ) as pool:
+        futures = {pool.submit(_run_with_timeout, job, timeout): number for number, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            number = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                # The worker process died; the pool reports it for this job.
+                result = {"input_file": jobs[number].input_file, "output_folder": jobs[number].output_folder,
+                          "status": "error", "error": f"{type(exc).__name__}: {exc}", "timings": {}, "log": ""}
+            results[number] = result
+            total = result["timings"].get("total")
+            duration = f" {total:.1f} s" if total is not None else ""
+            logger.info("[%d/%d] %s%s %s", done, len(jobs), result["status"], duration, jobs[number].input_file)
+    return results
+
+
+def write_report(results: List[Dict[str, Any]], path: str | Path, duration: Optional[float] = None) -> Dict[str, Any]:
+    """Write a JSON summary of a batch; logs are kept for failed jobs only.
+
+    Returns:
+        dict: The report that was written.
+    """
+    counts = {status: sum(1 for result in results if result["status"] == status) for status in ("ok", "error", "timeout")}
+    report = {
+        "summary": {"jobs": len(results), **counts, "seconds": duration},
+        "jobs": [
+            {name: value for name, value in result.items() if name != "log" or result["status"] != "ok"}
+            for result in results
+        ],
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    return report
+
+
+def batch_main(argv=None) -> int:
+    """Entry point of ``pytexmd batch``; returns 1 when a job did not succeed."""
+    from .sphinx_doc import resolve_jobs
+
+    def workers_argument(value: str) -> int | str:
+        try:
+            resolve_jobs(value)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+        return value if value == "auto" else int(value)
+
+    parser = argparse.ArgumentParser(prog="pytexmd batch", description="Convert many LaTeX projects in parallel.")
+    parser.add_argument("manifest", nargs="?", help="JSON or CSV manifest of jobs")
+    parser.add_argument("--glob", help="Convert every main file matching this pattern instead of a manifest")
+    parser.add_argument("--output-root", default="site", help="Output root for --glob jobs (default: site)")
+    parser.add_argument("--html", action="store_true", help="Also build the HTML site of --glob jobs")
+    parser.add_argument("--depth", type=int, help="Section split depth of --glob jobs")
+    parser.add_argument("--workers", default="auto", type=workers_argument,
+                        help='Worker processes: a number or "auto" (default: auto)')
+    parser.add_argument("--timeout", type=float, help="Time limit per job in seconds (POSIX only)")
+    parser.add_argument("--report", default="batch-report.json", help="Summary report path (default: batch-report.json)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
+    if (args.manifest is None) == (args.glob is None):
+        parser.error("give either a manifest or --glob")
+    try:
+        if args.glob is not None:
+            options = {"depth": args.depth} if args.depth is not None else {}
+            jobs = jobs_from_glob(args.glob, args.output_root, args.html, options)
+        else:
+            jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as exc:
+        parser.exit(2, f"pytexmd batch: error: {exc}\n")
+    logger.info("Running %d jobs", len(jobs))
+    started = time.perf_counter()
+    results = run_batch(jobs, args.workers, args.timeout)
+    report = write_report(results, args.report, time.perf_counter() - started)
+    summary = report["summary"]
+    logger.info(
+        "Batch finished in %.1f s: %d ok, %d failed, %d timed out. Report: %s",
+        summary["seconds"], summary["ok"], summary["error"], summary["timeout"], args.report,
+    )
+    for result in results:
+        if result["status"] != "ok":
+            logger.error("%s: %s: %s", result["status"], result["input_file"], result["error"])
+    return 0 if summary["ok"] == len(results) else 1
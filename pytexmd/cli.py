@@ -5,22 +5,41 @@ This module provides a CLI for processing LaTeX files and generating documentati
 
 __all__ = ['process_file']
 
-from .core import process_file
+from .core import process_file, write_myst
+from .filter.budget import ConversionBudgetExceeded
+from .log import add_logging_arguments, configure_logging, stderr_handler
 import argparse
+import logging
+import sys
 
-def main() -> None:
+logger = logging.getLogger(__name__)
+
+def main(argv=None) -> None:
     """Main entry point for the CLI.
 
     Parses command-line arguments and processes the specified LaTeX file.
+    ``pytexmd -`` reads LaTeX from standard input instead and writes a single
+    MyST page to standard output, without a Sphinx project; messages go to
+    standard error, and only warnings and errors unless ``--verbose`` is given.
+    Input without ``\\begin{document}`` is converted as the body of a document.
+    ``pytexmd serve ...`` starts the conversion daemon instead (see :mod:`pytexmd.server`),
+    and ``pytexmd batch ...`` converts many projects at once (see :mod:`pytexmd.batch`).
 
     Args:
-        input_file (str): File to process.
-        output_folder (str): Output folder.
+        input_file (str): File to process, or ``-`` for standard input.
+        output_folder (str): Output folder; not used with ``-``.
         depth (int): How many sub files should be created according to sections and paragraphs etc.
         output_suffix (str): Suffix for output files.
         project_name (str): Project name.
         author (str): Author name.
         version (str): Version string.
+        prune_bibliography (bool): Keep only cited bibliography entries.
+        prerender_tikz (bool): Render TikZ pictures in parallel after the conversion.
+        profile (bool | str): Print the stage profile, and write the JSON report to the given path.
+        time_budget (float): Abort a conversion that takes longer than this many seconds.
+        step_budget (int): Abort a conversion that takes more than this many steps.
+        quiet (bool): Only report warnings and errors.
+        verbose (bool): Also report per-file details and debug messages.
 
     Returns:
         None
@@ -28,25 +47,72 @@ def main() -> None:
     Example:
         python -m pytexmd.cli main.tex output_folder --depth 3 --output_suffix .md --project_name "My Project" --author "Author" --version "1.0"
     """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        from .server import serve_main
+
+        serve_main(argv[1:])
+        return
+    if argv[:1] == ["batch"]:
+        from .batch import batch_main
+
+        sys.exit(batch_main(argv[1:]))
     parser = argparse.ArgumentParser(description="My Library CLI")
-    parser.add_argument("input_file", help="File to process", type=str)
-    parser.add_argument("output_folder", help="Output folder", type=str)
+    parser.add_argument("input_file", help="File to process, or - to convert standard input to MyST on standard output", type=str)
+    parser.add_argument("output_folder", help="Output folder (not used with -)", type=str, nargs="?")
     parser.add_argument("--depth", help="(not supported yet)How many sub files should be created according to sections and paragraphs etc.", default=0, type=int)
     parser.add_argument("--output_suffix", help="Suffix for output files", default=".md", type=str)
     parser.add_argument("--project_name", help="Project name", default="My Project", type=str)
     parser.add_argument("--author", help="Author name", default="Author", type=str)
     parser.add_argument("--version", help="Version string", default="1.0", type=str)
-    args = parser.parse_args()
-    print(f"Processing {args.input_file}")
-    process_file(
-        args.input_file,
-        args.output_folder,
-        args.depth,
-        args.output_suffix,
-        args.project_name,
-        args.author,
-        args.version
-    )
+    parser.add_argument("--prune_bibliography", help="Write a references.bib holding only the cited entries", action="store_true")
+    parser.add_argument("--prerender_tikz", help="Render TikZ pictures in parallel into the render cache", action="store_true")
+    parser.add_argument("--profile", help="Print the time and memory of each stage; REPORT also receives the JSON report", nargs="?", const=True, default=False, metavar="REPORT")
+    parser.add_argument("--time_budget", help="Abort a conversion that takes longer than SECONDS", type=float, metavar="SECONDS")
+    parser.add_argument("--step_budget", help="Abort a conversion that takes more than STEPS expansion steps", type=int, metavar="STEPS")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input_file == "-":
+        _stream(args)
+        return
+    if args.output_folder is None:
+        parser.error("the following arguments are required: output_folder")
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
+    logger.info("Processing %s", args.input_file)
+    try:
+        process_file(
+            args.input_file,
+            args.output_folder,
+            args.depth,
+            args.output_suffix,
+            args.project_name,
+            args.author,
+            args.version,
+            prune_bibliography=args.prune_bibliography,
+            prerender_tikz=args.prerender_tikz,
+            profile=args.profile,
+            time_budget=args.time_budget,
+            step_budget=args.step_budget,
+        )
+    except ConversionBudgetExceeded as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+def _stream(args) -> None:
+    """Convert standard input to a MyST page on standard output."""
+    configure_logging(level=logging.DEBUG if args.verbose else logging.WARNING, handler=stderr_handler())
+    for stream in (sys.stdin, sys.stdout):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding="utf-8")
+    latex = sys.stdin.read()
+    if "\\begin{document}" not in latex:
+        latex = "\\begin{document}" + latex + "\\end{document}"
+    try:
+        write_myst(latex, sys.stdout, time_budget=args.time_budget, step_budget=args.step_budget)
+    except ConversionBudgetExceeded as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,14 +3,69 @@
 This module provides the main entry point for converting LaTeX files to Markdown and generating Sphinx documentation.
 """
 
-__all__ = ["process_file"]
+__all__ = ["process_file", "convert_to_files", "write_myst"]
 
+import logging
 import os
-from .filter import process_string
-from .file_loader import load_tex_file, convert_bbl_to_bib
+import tempfile
+from typing import Dict, List, Optional, TextIO, Tuple
+from .filter import process_string, string_to_tree, text
+from .filter.budget import conversion_budget
+from .filter.bibtex import iter_bbl_entries
+from .file_loader import get_project_index, load_tex_file, write_pruned_bib
+from .file_writer import open_if_changed
+from .image_assets import prepare_image_assets
+from .profiling import profiled, stage
+from .sinks import MemorySink
 from .sphinx_doc import create_sphinx_documentation, make_html, create_config_file
 from .filter.splitting import split_rename
 
+logger = logging.getLogger(__name__)
+
+def _is_inside(path: str, folder: str) -> bool:
+    """Whether ``path`` lies in ``folder`` (both resolved); False across Windows drives."""
+    try:
+        return os.path.commonpath([folder, os.path.realpath(path)]) == folder
+    except ValueError:
+        return False
+
+
+def _convert_bbl_file(source: str, destination: str) -> Optional[str]:
+    """Convert one .bbl file to a .bib file, streaming its entries to disk.
+
+    Module-level so it can run in a worker process.
+
+    Returns:
+        Optional[str]: The error message if the file could not be converted, else None.
+    """
+    try:
+        with open(source, 'r', encoding='utf-8', errors='replace') as f:
+            bbl_content = f.read()
+        with open_if_changed(destination) as f:
+            for number, entry in enumerate(iter_bbl_entries(bbl_content)):
+                if number:
+                    f.write(b'\n\n')
+                f.write(entry.encode('utf-8'))
+    except OSError as exc:
+        return str(exc)
+    return None
+
+
+def _convert_bbl_files(jobs: List[Tuple[str, str]]) -> List[Optional[str]]:
+    """Convert (source, destination) .bbl pairs, in parallel when there are several.
+
+    Returns:
+        List[Optional[str]]: One error message (or None) per job, in job order.
+    """
+    if len(jobs) < 2:
+        return [_convert_bbl_file(source, dest) for source, dest in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    sources, destinations = zip(*jobs)
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+        return list(pool.map(_convert_bbl_file, sources, destinations))
+
+
 def process_file(
     input_file: str,
     output_folder: str,
@@ -20,6 +75,11 @@ def process_file(
     author: str = "Author",
     version: str = "1.0",
     mathjax_macros: dict = None,
+    prune_bibliography: bool = False,
+    prerender_tikz: bool = False,
+    profile: bool | str = False,
+    time_budget: Optional[float] = None,
+    step_budget: Optional[int] = None,
 ) -> None:
     """Process a LaTeX file and generate documentation.
 
@@ -31,6 +91,21 @@ def process_file(
         depth (int, optional): Depth for processing sections. Defaults to 3.
         output_suffix (str, optional): Suffix for output files. Defaults to ".md".
         mathjax_macros (dict, optional): MathJax macro definitions for conf.py.
+        prune_bibliography (bool, optional): Write a single ``references.bib`` holding only the
+            cited entries (plus their ``crossref`` parents) instead of copying every bibliography
+            file into the Sphinx source folder. Defaults to False.
+        prerender_tikz (bool, optional): Render every TikZ picture in a process pool after the
+            conversion, so the Sphinx build finds them in the render cache; failures are
+            reported with their source location. Defaults to False.
+        profile (bool | str, optional): Print the wall time, CPU time and peak memory of
+            every conversion stage; a path also receives the JSON report (see
+            :mod:`pytexmd.profiling`). Defaults to False.
+        time_budget (float, optional): Abort the conversion with
+            :class:`~pytexmd.filter.budget.ConversionBudgetExceeded` after this many seconds.
+            Defaults to ``budget.DEFAULT_SECONDS``.
+        step_budget (int, optional): Abort the conversion after this many steps of the
+            expand engine and preprocessor (see :mod:`pytexmd.filter.budget`). Defaults to
+            ``budget.DEFAULT_STEPS``.
 
     Returns:
         None
@@ -38,44 +113,169 @@ def process_file(
     Example:
         process_file("main.tex", "docs")
     """
-    latex_content = load_tex_file(input_file)
-    file_string = latex_content.content
-    create_sphinx_documentation(output_folder,project_name,author,version)
-    source_folder = os.path.join(output_folder, "source")
-
-    # Copy every .bib file found in the project directly to the Sphinx
-    # source folder. For .bbl files (compiled bibliography output), convert
-    # them to .bib format first so sphinxcontrib.bibtex can parse them.
-    import shutil
-    copied_bib_names: list[str] = []
-    for abs_path in latex_content.bib_files.values():
-        ext = os.path.splitext(abs_path)[1].lower()
-        if ext == '.bbl':
-            # Convert \begin{thebibliography} format → BibTeX database format
-            dest_name = os.path.splitext(os.path.basename(abs_path))[0] + '.bib'
-            dest = os.path.join(source_folder, dest_name)
-            try:
-                with open(abs_path, 'r', encoding='utf-8', errors='replace') as f:
-                    bbl_content = f.read()
-                bib_content = convert_bbl_to_bib(bbl_content)
-                with open(dest, 'w', encoding='utf-8') as f:
-                    f.write(bib_content)
-                copied_bib_names.append(dest_name)
-                print(f"Bibliography converted .bbl -> .bib: {dest}")
-            except OSError as exc:
-                print(f"Warning: could not convert {abs_path}: {exc}")
+    limits = {name: value for name, value in (("seconds", time_budget), ("steps", step_budget)) if value is not None}
+    with conversion_budget(**limits):
+        if profile:
+            with profiled(None if profile is True else profile):
+                _process_file(input_file, output_folder, depth, output_suffix, project_name, author,
+                              version, mathjax_macros, prune_bibliography, prerender_tikz)
         else:
-            dest = os.path.join(source_folder, os.path.basename(abs_path))
-            try:
-                shutil.copy2(abs_path, dest)
-                copied_bib_names.append(os.path.basename(abs_path))
-                print(f"Bibliography file copied: {dest}")
-            except OSError as exc:
-                print(f"Warning: could not copy {abs_path}: {exc}")
-
-    process_string(source_folder, file_string, depth, output_suffix)
-    # Re-write conf.py with discovered bibliography files and user macros.
-    create_config_file(output_folder, project_name, author, version,
-                       bib_filenames=copied_bib_names,
-                       mathjax_macros=mathjax_macros)
+            _process_file(input_file, output_folder, depth, output_suffix, project_name, author,
+                          version, mathjax_macros, prune_bibliography, prerender_tikz)
+
+
+def convert_to_files(
+    latex: str,
+    depth: int = 2,
+    output_suffix: str = ".md",
+    time_budget: Optional[float] = None,
+    step_budget: Optional[int] = None,
+) -> Dict[str, str]:
+    """Convert a LaTeX string to MyST pages in memory.
+
+    Produces the same pages as :func:`process_file` writes to ``source``
+    (section files with their toctrees and the references page), without
+    the Sphinx scaffold and without touching the disk. To write them
+    elsewhere, pass a sink from :mod:`pytexmd.sinks` to
+    :func:`~pytexmd.filter.process_string` instead.
+
+    Args:
+        latex (str): The LaTeX document.
+        depth (int, optional): Section splitting depth. Defaults to 2.
+        output_suffix (str, optional): Suffix of the page paths. Defaults to ".md".
+        time_budget (float, optional): Time limit in seconds (see :func:`process_file`).
+        step_budget (int, optional): Step limit (see :func:`process_file`).
+
+    Returns:
+        Dict[str, str]: Page contents by relative path, such as ``"index.md"``.
+
+    Example:
+        pages = convert_to_files(r"\\begin{document}\\section{Intro}Text\\end{document}", depth=0)
+    """
+    sink = MemorySink()
+    limits = {name: value for name, value in (("seconds", time_budget), ("steps", step_budget)) if value is not None}
+    with conversion_budget(**limits):
+        process_string(sink, latex, depth, output_suffix)
+    return sink.files
+
+
+def write_myst(
+    latex: str,
+    output: TextIO,
+    time_budget: Optional[float] = None,
+    step_budget: Optional[int] = None,
+) -> None:
+    """Convert a LaTeX string to a single MyST page and write it to ``output`` as it is rendered.
+
+    Nothing is split into files and no Sphinx project is created; the page is
+    what :func:`process_file` would split at depth 0, including the section
+    marker comments. The output is written section by section, so the whole
+    page is never held as one string.
+
+    Args:
+        latex (str): The LaTeX document.
+        output (TextIO): Text stream receiving the MyST page, such as ``sys.stdout``.
+        time_budget (float, optional): Time limit in seconds (see :func:`process_file`).
+        step_budget (int, optional): Step limit (see :func:`process_file`).
+
+    Example:
+        write_myst(open("main.tex").read(), sys.stdout)
+    """
+    limits = {name: value for name, value in (("seconds", time_budget), ("steps", step_budget)) if value is not None}
+    with conversion_budget(**limits):
+        document = string_to_tree(latex)
+    with stage("render"):
+        document.write_to(output.write)
+
+
+def _process_file(input_file, output_folder, depth, output_suffix, project_name, author,
+                  version, mathjax_macros, prune_bibliography, prerender_tikz) -> None:
+    with stage("load"):
+        latex_content = load_tex_file(input_file)
+        file_string = latex_content.content
+        create_sphinx_documentation(output_folder,project_name,author,version)
+        source_folder = os.path.join(output_folder, "source")
+
+    with stage("bibliography"):
+        # Copy every .bib file found in the project directly to the Sphinx
+        # source folder. For .bbl files (compiled bibliography output), convert
+        # them to .bib format first so sphinxcontrib.bibtex can parse them.
+        # When pruning, nothing is copied: the files are only read after the
+        # conversion has collected the cited keys, and converted .bbl files go
+        # to a scratch folder.
+        import shutil
+        scratch = tempfile.TemporaryDirectory() if prune_bibliography else None
+        bib_folder = scratch.name if scratch is not None else source_folder
+        # Files under the output folder are earlier results of this conversion
+        # when it lives inside the project; they must not shadow the sources.
+        output_root = os.path.realpath(output_folder)
+        project_bibs = {}
+        for abs_path in latex_content.bib_paths:
+            if not _is_inside(abs_path, output_root):
+                project_bibs[os.path.splitext(os.path.basename(abs_path))[0]] = abs_path
+        bib_paths = list(project_bibs.values())
+        bbl_jobs = [
+            (abs_path, os.path.join(bib_folder, os.path.splitext(os.path.basename(abs_path))[0] + '.bib'))
+            for abs_path in bib_paths
+            if os.path.splitext(abs_path)[1].lower() == '.bbl'
+        ]
+        # Convert \begin{thebibliography} format → BibTeX database format
+        bbl_results = dict(zip(bbl_jobs, _convert_bbl_files(bbl_jobs)))
+        copied_bib_names: list[str] = []
+        prune_sources: list[str] = []
+        for abs_path in bib_paths:
+            ext = os.path.splitext(abs_path)[1].lower()
+            if ext == '.bbl':
+                dest_name = os.path.splitext(os.path.basename(abs_path))[0] + '.bib'
+                dest = os.path.join(bib_folder, dest_name)
+                error = bbl_results[(abs_path, dest)]
+                if error is None:
+                    copied_bib_names.append(dest_name)
+                    prune_sources.append(dest)
+                    logger.info("Bibliography converted .bbl -> .bib: %s", dest)
+                else:
+                    logger.warning("could not convert %s: %s", abs_path, error)
+            elif prune_bibliography:
+                prune_sources.append(abs_path)
+            else:
+                dest = os.path.join(source_folder, os.path.basename(abs_path))
+                try:
+                    shutil.copy2(abs_path, dest)
+                    copied_bib_names.append(os.path.basename(abs_path))
+                    logger.info("Bibliography file copied: %s", dest)
+                except OSError as exc:
+                    logger.warning("could not copy %s: %s", abs_path, exc)
+
+    # The rendered pages record their TikZ pictures only when they are pre-rendered.
+    text.TIKZ_PICTURES = [] if prerender_tikz else None
+    try:
+        process_string(source_folder, file_string, depth, output_suffix)
+        pictures = text.TIKZ_PICTURES
+    finally:
+        text.TIKZ_PICTURES = None
+    with stage("images"):
+        # Copy or convert the graphics of \includegraphics into source/images.
+        main_file = os.path.realpath(input_file)
+        index = get_project_index(os.path.dirname(main_file))
+        prepare_image_assets(text.IMAGE_REFERENCES, index, source_folder)
+    if scratch is not None:
+        with stage("bibliography pruning"), scratch:
+            dest = os.path.join(source_folder, "references.bib")
+            missing = write_pruned_bib(prune_sources, text.CITED_KEYS, dest)
+        copied_bib_names = ["references.bib"]
+        logger.info("Pruned bibliography with %d cited keys written: %s", len(text.CITED_KEYS), dest)
+        if missing:
+            logger.warning("cited keys not found in any bibliography: %s", ", ".join(missing))
+    with stage("config"):
+        # Re-write conf.py with discovered bibliography files and user macros.
+        create_config_file(output_folder, project_name, author, version,
+                           bib_filenames=copied_bib_names,
+                           mathjax_macros=mathjax_macros)
+    if prerender_tikz:
+        from .tikz_prerender import collect_tikz_pictures, prerender_tikz as render_pictures
+
+        with stage("tikz prerender"):
+            sources = [main_file] + [path for path in index.tex_files if path != main_file]
+            pictures = collect_tikz_pictures(pictures, sources, index.read)
+            render_pictures(pictures, os.path.join(source_folder, "conf.py"))
     #make_html(output_folder)
@@ -12,18 +12,31 @@ __all__ = [
     "load_tex_file",
     "LatexFile",
     "merge_bib_files",
+    "index_bib_files",
+    "write_merged_bib",
+    "write_pruned_bib",
+    "BibEntryLocation",
     "convert_bbl_to_bib",
     "TEX_EXTENSIONS",
     "BIB_EXTENSIONS",
     "IMAGE_EXTENSIONS",
     "INPUT_PATTERN",
+    "ProjectIndex",
+    "get_project_index",
 ]
 
+import io
+import logging
+import mmap
 import os
 import re
-import regex
-from typing import List, Dict, Tuple, Optional, Any, NamedTuple
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Dict, Tuple, Optional, Any, NamedTuple, Union
 from pytexmd.filter.bibtex.core import convert_bbl_to_bib
+from .file_writer import open_if_changed
+
+logger = logging.getLogger(__name__)
 
 TEX_EXTENSIONS = (".tex", ".sty", ".cls")
 BIB_EXTENSIONS = (".bib", ".bbl", ".bibtex", ".biblatex")
@@ -38,8 +51,29 @@ IMAGE_EXTENSIONS = (
     ".pdf",
     ".eps",
 )
+# Extensions pdflatex tries, in order, for \includegraphics without one.
+GRAPHICS_SEARCH_ORDER = (".pdf", ".png", ".jpg", ".jpeg", ".eps", ".svg", ".gif")
 INPUT_PATTERN = r"\\input\{([^}]+)\}"
 
+class BibEntryLocation(NamedTuple):
+    """Position of one top-level @-entry inside a bibliography file.
+
+    Attributes:
+        path (str): Absolute path of the bibliography file.
+        offset (int): Byte offset of the entry's ``@``.
+        length (int): Length of the entry in bytes, up to its closing brace.
+    """
+    path: str
+    offset: int
+    length: int
+
+    def read(self) -> bytes:
+        """Read the raw bytes of the entry from disk."""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+
 class LatexFile(NamedTuple):
     r"""Container for loaded LaTeX project files.
 
@@ -49,78 +83,211 @@ class LatexFile(NamedTuple):
         bib_files (Dict[str, str]): Mapping from base filename (without extension) to absolute path for .bib/.bbl/.bibtex/.biblatex files.
         image_files (Dict[str, str]): Mapping from base filename (without extension) to absolute path for image files.
         all_files (Dict[str, str]): Combined mapping of all supported files.
-        merged_bib_content (str): Merged and deduplicated content of all found .bib files.
+        bib_paths (Tuple[str, ...]): Every collected bibliography file in merge order, including
+            files whose basename is shadowed in ``bib_files``.
     """
     content: str
     tex_files: Dict[str, str]
     bib_files: Dict[str, str]
     image_files: Dict[str, str]
     all_files: Dict[str, str]
-    merged_bib_content: str = ""
+    bib_paths: Tuple[str, ...] = ()
 
+    def merge_bib_content(self) -> str:
+        """Return the merged and deduplicated content of all found .bib files.
 
-def _split_bib_entries(content: str) -> List[str]:
-    """Split .bib file content into individual top-level @-entries."""
-    entries = []
-    i = 0
-    n = len(content)
-    while i < n:
-        if content[i] != '@':
-            i += 1
-            continue
-        start = i
-        while i < n and content[i] != '{':
-            i += 1
-        if i >= n:
-            break
+        The files are read again on every call; keep the result, or prefer
+        :meth:`write_merged_bib` for large bibliographies.
+        """
+        return merge_bib_files(list(self.bib_paths))
+
+    def write_merged_bib(self, destination: Union[str, BinaryIO]) -> Dict[str, BibEntryLocation]:
+        """Stream the merged bibliography to *destination*, see :func:`write_merged_bib`."""
+        return write_merged_bib(list(self.bib_paths), destination)
+
+
+# Citation key of an @type{key, ...} header; @string/@preamble/@comment carry none.
+_BIB_HEADER_PATTERN = re.compile(rb'@(\w+)\s*\{\s*([^,\s}]+)')
+_BIB_KEYLESS_TYPES = (b'string', b'preamble', b'comment')
+
+
+@contextmanager
+def _map_bib_file(bib_path: str):
+    """Memory-map a bibliography file read-only (empty files yield ``b""``)."""
+    with open(bib_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            yield b""
+            return
+        with mapped:
+            yield mapped
+
+
+def _iter_bib_entries(data) -> Iterator[Tuple[Optional[str], int, int]]:
+    """Yield ``(key, start, end)`` for each top-level @-entry in *data*.
+
+    Entries run from ``@`` over the first ``{`` to its matching ``}``; an
+    unterminated entry runs to the end of the data. The key is None for
+    @string/@preamble/@comment entries.
+    """
+    size = len(data)
+    position = 0
+    while True:
+        start = data.find(b'@', position)
+        if start == -1:
+            return
+        brace = data.find(b'{', start)
+        if brace == -1:
+            return
+        # Jump from one closing brace to the next, counting the opening
+        # braces in between, so the scan stays in C for each brace group.
         depth = 1
-        i += 1
-        while i < n and depth > 0:
-            if content[i] == '{':
-                depth += 1
-            elif content[i] == '}':
-                depth -= 1
-            i += 1
-        entries.append(content[start:i])
-    return entries
-
-
-def _extract_bib_key(entry: str) -> Optional[str]:
-    """Return the citation key from a bib entry, or None for @string/@preamble/@comment."""
-    m = re.match(r'@(\w+)\s*\{\s*([^,\s}]+)', entry, re.IGNORECASE)
-    if not m:
-        return None
-    if m.group(1).lower() in ('string', 'preamble', 'comment'):
-        return None
-    return m.group(2)
+        end = size
+        cursor = brace + 1
+        while True:
+            close = data.find(b'}', cursor)
+            if close == -1:
+                break
+            depth += data[cursor:close].count(b'{') - 1
+            cursor = close + 1
+            if depth == 0:
+                end = cursor
+                break
+        key = None
+        header = _BIB_HEADER_PATTERN.match(data, start)
+        if header and header.group(1).lower() not in _BIB_KEYLESS_TYPES:
+            key = header.group(2).decode('utf-8', errors='replace')
+        yield key, start, end
+        position = end
+
+
+def _iter_merged_bib_entries(bib_paths: List[str]) -> Iterator[Tuple[Optional[str], BibEntryLocation, bytes]]:
+    """Yield deduplicated entries of several files as ``(key, location, stripped bytes)``."""
+    seen_keys: set = set()
+    for bib_path in bib_paths:
+        try:
+            with _map_bib_file(bib_path) as data:
+                for key, start, end in _iter_bib_entries(data):
+                    if key is not None:
+                        if key in seen_keys:
+                            continue
+                        seen_keys.add(key)
+                    yield key, BibEntryLocation(bib_path, start, end - start), data[start:end].strip()
+        except OSError as exc:
+            logger.warning("could not read %s: %s", bib_path, exc)
 
 
-def merge_bib_files(bib_paths: List[str]) -> str:
-    """Read and merge multiple .bib files, deduplicating entries by citation key.
+def index_bib_files(bib_paths: List[str]) -> Dict[str, BibEntryLocation]:
+    """Build a citation key index over several bibliography files.
 
     Args:
         bib_paths: List of absolute paths to .bib/.bbl files.
 
     Returns:
-        str: Merged .bib content with duplicate entries removed (first occurrence wins).
+        Dict[str, BibEntryLocation]: Location of each key's first occurrence.
     """
-    seen_keys: set = set()
-    merged: List[str] = []
+    index: Dict[str, BibEntryLocation] = {}
     for bib_path in bib_paths:
         try:
-            with open(bib_path, 'r', encoding='utf-8', errors='replace') as f:
-                raw = f.read()
+            with _map_bib_file(bib_path) as data:
+                for key, start, end in _iter_bib_entries(data):
+                    if key is not None and key not in index:
+                        index[key] = BibEntryLocation(bib_path, start, end - start)
         except OSError as exc:
-            print(f"Warning: could not read {bib_path}: {exc}")
+            logger.warning("could not read %s: %s", bib_path, exc)
+    return index
+
+
+def write_merged_bib(bib_paths: List[str], destination: Union[str, BinaryIO]) -> Dict[str, BibEntryLocation]:
+    """Stream merged .bib content to a file, deduplicating entries by citation key.
+
+    Each file is memory-mapped and copied entry by entry, so the merged
+    bibliography is never held in memory as a whole.
+
+    Args:
+        bib_paths: List of absolute paths to .bib/.bbl files.
+        destination: Output path, or a binary file object to write to.
+
+    Returns:
+        Dict[str, BibEntryLocation]: Source location of every written key (first occurrence wins).
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'wb') as f:
+            return write_merged_bib(bib_paths, f)
+    index: Dict[str, BibEntryLocation] = {}
+    separator = b""
+    for key, location, entry in _iter_merged_bib_entries(bib_paths):
+        destination.write(separator)
+        destination.write(entry)
+        separator = b"\n\n"
+        if key is not None:
+            index[key] = location
+    return index
+
+
+_BIB_CROSSREF_PATTERN = re.compile(rb'\bcrossref\s*=\s*[{"]\s*([^}",\s]+)', re.IGNORECASE)
+
+
+def write_pruned_bib(bib_paths: List[str], cited_keys: List[str], destination: Union[str, BinaryIO]) -> List[str]:
+    """Stream only the cited entries of several bibliographies to a file.
+
+    Entries named by ``crossref`` fields of written entries are included as
+    well, transitively, and the key ``*`` (from ``\\nocite{*}``) selects every
+    entry. @string, @preamble and @comment entries are always kept because
+    cited entries may use the macros they define. Entries keep their original
+    order, so crossref parents still follow their children.
+
+    Args:
+        bib_paths: List of absolute paths to .bib files.
+        cited_keys: Citation keys used by the document.
+        destination: Output path, or a binary file object to write to. An
+            existing file that already holds the result is left untouched.
+
+    Returns:
+        List[str]: Cited keys that no bibliography defines.
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open_if_changed(destination) as f:
+            return write_pruned_bib(bib_paths, cited_keys, f)
+    index = index_bib_files(bib_paths)
+    if "*" in cited_keys:
+        cited_keys = [key for key in cited_keys if key != "*"] + list(index)
+    missing = [key for key in dict.fromkeys(cited_keys) if key not in index]
+    selected: set = set()
+    pending = [key for key in cited_keys if key in index]
+    while pending:
+        key = pending.pop()
+        if key in selected:
             continue
-        for entry in _split_bib_entries(raw):
-            key = _extract_bib_key(entry)
-            if key is None:
-                merged.append(entry.strip())
-            elif key not in seen_keys:
-                seen_keys.add(key)
-                merged.append(entry.strip())
-    return "\n\n".join(e for e in merged if e)
+        selected.add(key)
+        for parent in _BIB_CROSSREF_PATTERN.findall(index[key].read()):
+            parent = parent.decode('utf-8', errors='replace')
+            if parent in index:
+                pending.append(parent)
+            elif parent not in missing:
+                missing.append(parent)
+    separator = b""
+    for key, _, entry in _iter_merged_bib_entries(bib_paths):
+        if key is None or key in selected:
+            destination.write(separator)
+            destination.write(entry)
+            separator = b"\n\n"
+    return missing
+
+
+def merge_bib_files(bib_paths: List[str]) -> str:
+    """Read and merge multiple .bib files, deduplicating entries by citation key.
+
+    Args:
+        bib_paths: List of absolute paths to .bib/.bbl files.
+
+    Returns:
+        str: Merged .bib content with duplicate entries removed (first occurrence wins).
+    """
+    merged = io.BytesIO()
+    write_merged_bib(bib_paths, merged)
+    return merged.getvalue().decode('utf-8', errors='replace')
 
 
 def _clean_latex(text: str) -> str:
@@ -135,108 +302,155 @@ def _clean_latex(text: str) -> str:
     return re.sub(r'\s+', ' ', text).strip()
 
 
-def load_tex_file(file_name: str) -> LatexFile:
-    r"""Load a LaTeX file and its associated resources recursively.
+def _basename_key(path: str) -> str:
+    """Return the bare basename used as lookup key (known extension stripped)."""
+    name = os.path.basename(path)
+    root, ext = os.path.splitext(name)
+    if ext.lower() in TEX_EXTENSIONS + IMAGE_EXTENSIONS + BIB_EXTENSIONS:
+        return root
+    return name
 
-    Expands all \input{} commands in the main file, and collects all .tex, .bib, and image files
-    in the same directory tree.
 
-    Args:
-        file_name (str): Path to the main LaTeX file.
+def _mtime_ns(path: str) -> Optional[int]:
+    """Return the modification time of *path* in nanoseconds, or None if it is gone."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-    Returns:
-        LatexFile: A named tuple containing the expanded content and dictionaries of found files.
 
-    Raises:
-        FileNotFoundError: If the main file does not exist.
-        OSError: If there is an error reading files from disk.
+class ProjectIndex:
+    r"""Cached inventory of a LaTeX project folder.
 
-    Example:
-        latex_file = load_tex_file("main.tex")
-        print(latex_file.content)
-    """
-    def load_file(file_name: str) -> str:
-        r"""Read the contents of a file.
+    The index walks the project folder once and keeps the file inventory, the
+    contents of every file read through it, the \input{} arguments of each
+    source and the bare-basename collisions. It is shared by
+    :func:`load_tex_file` and the converter's file detection so that a scan
+    shown to the user is reused by the conversion started afterwards.
 
-        Args:
-            file_name (str): Path to the file.
+    Directory modification times are recorded during the walk, so adding,
+    removing or renaming a file makes :meth:`is_stale` return True. File
+    contents are revalidated against their own modification time on every
+    :meth:`read`.
 
-        Returns:
-            str: Contents of the file.
-        """
-        data = None
-        with open(file_name, 'r', encoding='utf-8') as f:
-            data = f.read()
-        return data
-    
-    # Get the folder where file_name resides
-    #folder_path = os.path.dirname(file_name)
-    file_name = os.path.realpath(os.path.abspath(os.path.expanduser(file_name)))
-    absolute_folder = os.path.dirname(file_name)
+    Attributes:
+        root (str): Canonical absolute path of the project folder.
+        tex_files (List[str]): Canonical paths of .tex/.sty/.cls files in walk order.
+        bib_files (List[str]): Canonical paths of bibliography files in walk order.
+        image_files (List[str]): Canonical paths of image files in walk order.
+        files (List[str]): All inventoried files in walk order.
+        all_files (Dict[str, str]): Mapping from bare basename to path, as used by the loader.
+        warnings (List[str]): Folders that could not be scanned.
 
-    # Get all image files, .bib files, and .tex files in the folder (recursively)
-    image_extensions = IMAGE_EXTENSIONS
-    tex_extensions = TEX_EXTENSIONS
-    bib_extensions = BIB_EXTENSIONS
-    target_extensions = tex_extensions + image_extensions + bib_extensions
-
-    all_files = []
-    tex_files = []
-    bib_files = []
-    image_files = []
-
-    if os.path.exists(absolute_folder):
-        # Walk through all subdirectories recursively
-        for root, dirs, files in os.walk(absolute_folder):
-            dirs.sort(key=str.casefold)
+    Example:
+        index = get_project_index("/path/to/project")
+        text = index.read(index.resolve_input("chapter"))
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(os.path.abspath(os.path.expanduser(root)))
+        self.tex_files: List[str] = []
+        self.bib_files: List[str] = []
+        self.image_files: List[str] = []
+        self.files: List[str] = []
+        self.tex_map: Dict[str, str] = {}
+        self.bib_map: Dict[str, str] = {}
+        self.image_map: Dict[str, str] = {}
+        self.all_files: Dict[str, str] = {}
+        self.warnings: List[str] = []
+        self._directory_mtimes: Dict[str, Optional[int]] = {}
+        self._contents: Dict[str, Tuple[int, str]] = {}
+        self._inputs: Dict[str, Tuple[int, List[str]]] = {}
+        self._external_bib_files: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self._scan()
+
+    def _walk(self, folder: str):
+        """Walk *folder* in case-insensitive order, recording directory mtimes."""
+        def record_walk_error(error: OSError) -> None:
+            self.warnings.append(f"Could not scan {error.filename}: {error}")
+
+        for directory, directories, files in os.walk(folder, onerror=record_walk_error):
+            self._directory_mtimes[directory] = _mtime_ns(directory)
+            directories.sort(key=str.casefold)
             files.sort(key=str.casefold)
             for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.realpath(os.path.abspath(file_path))
-                file_ext = os.path.splitext(file)[1].lower()
-                
-                if file_ext in tex_extensions:
-                    tex_files.append(relative_path)
-                elif file_ext in bib_extensions:
-                    bib_files.append(relative_path)
-                elif file_ext in image_extensions:
-                    image_files.append(relative_path)
-
-    print(f"Folder (recursive): {absolute_folder}")
-    print(f"TEX files: {tex_files}")
-    print(f"BIB files: {bib_files}")
-    print(f"Image files: {image_files}")
-
-    content = load_file(file_name)
-
-    def remove_extensions(file_name: str) -> str:
-        """Strip a single trailing known extension from a basename."""
-        root, ext = os.path.splitext(file_name)
-        if ext.lower() in target_extensions:
-            return root
-        return file_name
-
-    def _basename_key(abs_path: str) -> str:
-        """Return the bare basename (no extension) used as dict key."""
-        return remove_extensions(os.path.basename(abs_path))
-
-    _tex_files = {_basename_key(f): f for f in tex_files}
-    _bib_files = {_basename_key(f): f for f in bib_files}
-    _image_files = {_basename_key(f): f for f in image_files}
-    all_files = {**_tex_files, **_bib_files, **_image_files}
-
-    def input_to_filename(input_name: str) -> str:
-        r"""Convert LaTeX input name to absolute filename.
+                yield os.path.realpath(os.path.join(directory, file))
+
+    def _scan(self) -> None:
+        if not os.path.isdir(self.root):
+            self._directory_mtimes[self.root] = None
+            return
+        for path in self._walk(self.root):
+            file_ext = os.path.splitext(path)[1].lower()
+            if file_ext in TEX_EXTENSIONS:
+                self.tex_files.append(path)
+            elif file_ext in BIB_EXTENSIONS:
+                self.bib_files.append(path)
+            elif file_ext in IMAGE_EXTENSIONS:
+                self.image_files.append(path)
+            else:
+                continue
+            self.files.append(path)
+        self.tex_map = {_basename_key(f): f for f in self.tex_files}
+        self.bib_map = {_basename_key(f): f for f in self.bib_files}
+        self.image_map = {_basename_key(f): f for f in self.image_files}
+        self.all_files = {**self.tex_map, **self.bib_map, **self.image_map}
+
+    @property
+    def collisions(self) -> Dict[str, List[str]]:
+        """Lookup keys shared by more than one inventoried file."""
+        groups: Dict[str, List[str]] = {}
+        for path in self.files:
+            groups.setdefault(_basename_key(path), []).append(path)
+        return {key: paths for key, paths in groups.items() if len(paths) > 1}
+
+    def is_stale(self) -> bool:
+        """Return True if a scanned folder was modified since the walk."""
+        return any(
+            _mtime_ns(directory) != mtime
+            for directory, mtime in list(self._directory_mtimes.items())
+        )
 
-        Tries direct relative-path resolution first (handles paths like
-        ``../sibling/file`` or ``sections/foo``), then falls back to a
-        basename-only dict lookup for plain names like ``foo``.
+    def read(self, file_name: str) -> str:
+        """Read a UTF-8 file, reusing the cached content while its mtime is unchanged.
 
-        Args:
-            input_name (str): Name from \input{} command.
+        Raises:
+            OSError: If the file cannot be read.
+            UnicodeDecodeError: If the file is not valid UTF-8.
+        """
+        path = os.path.realpath(file_name)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._contents.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            data = f.read()
+        with self._lock:
+            self._contents[path] = (mtime, data)
+        return data
 
-        Returns:
-            str: Absolute path to the file.
+    def inputs_of(self, file_name: str) -> List[str]:
+        r"""Return the \input{} arguments of a source file in order of appearance."""
+        path = os.path.realpath(file_name)
+        self.read(path)
+        with self._lock:
+            # Take the content and its mtime together; another thread may have refreshed them.
+            mtime, content = self._contents[path]
+            cached = self._inputs.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            arguments = re.findall(INPUT_PATTERN, content)
+            self._inputs[path] = (mtime, arguments)
+            return arguments
+
+    def resolve_input(self, input_name: str) -> str:
+        r"""Convert an \input{} argument to the canonical path of the file.
+
+        Tries direct relative-path resolution from the project root first
+        (handles paths like ``../sibling/file`` or ``sections/foo``), then
+        falls back to a basename-only lookup for plain names like ``foo``.
 
         Raises:
             FileNotFoundError: If no matching file can be located.
@@ -245,24 +459,177 @@ def load_tex_file(file_name: str) -> LatexFile:
         norm = input_name.replace("\\", "/")
 
         # Strategy 1: resolve as a path relative to the project root
-        candidate = os.path.normpath(os.path.join(absolute_folder, norm))
+        candidate = os.path.normpath(os.path.join(self.root, norm))
         if os.path.isfile(candidate):
-            return candidate
+            return os.path.realpath(candidate)
         # Try appending each tex extension (LaTeX omits .tex in \input)
-        for ext in tex_extensions:
+        for ext in TEX_EXTENSIONS:
             if os.path.isfile(candidate + ext):
-                return candidate + ext
+                return os.path.realpath(candidate + ext)
 
-        # Strategy 2: bare-basename dict lookup (legacy fallback)
-        bare = remove_extensions(norm.split("/")[-1])
-        if bare in all_files:
-            return all_files[bare]
+        # Strategy 2: bare-basename lookup (legacy fallback)
+        bare = _basename_key(norm.split("/")[-1])
+        if bare in self.all_files:
+            return self.all_files[bare]
 
         raise FileNotFoundError(
             f"Cannot resolve \\input{{{input_name}}}: tried '{candidate}' "
             f"and basename key '{bare}' in scanned files."
         )
 
+    def resolve_image(self, reference: str) -> str:
+        r"""Convert an \includegraphics{} argument to the canonical path of the image.
+
+        Resolves the path relative to the project root, trying the extensions
+        pdflatex tries when none is given, then falls back to a basename
+        lookup among the scanned image files.
+
+        Raises:
+            FileNotFoundError: If no matching image can be located.
+        """
+        norm = reference.strip().replace("\\", "/")
+        candidate = os.path.normpath(os.path.join(self.root, norm))
+        if os.path.isfile(candidate):
+            return os.path.realpath(candidate)
+        for ext in GRAPHICS_SEARCH_ORDER:
+            if os.path.isfile(candidate + ext):
+                return os.path.realpath(candidate + ext)
+
+        bare = _basename_key(norm.split("/")[-1])
+        if bare in self.image_map:
+            return self.image_map[bare]
+
+        raise FileNotFoundError(
+            f"Cannot resolve \\includegraphics{{{reference}}}: tried '{candidate}' "
+            f"and basename key '{bare}' in scanned images."
+        )
+
+    def include_graph(self, entry: str) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        r"""Follow \input{} commands breadth-first from *entry*.
+
+        Each argument is followed once. Unreadable sources map to an empty list.
+
+        Returns:
+            Dict[str, List[Tuple[str, Optional[str]]]]: For every reached source,
+            its arguments paired with the resolved path (None if unresolved).
+        """
+        graph: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        pending = [os.path.realpath(entry)]
+        seen_arguments: set = set()
+        while pending:
+            source = pending.pop(0)
+            if source in graph:
+                continue
+            edges: List[Tuple[str, Optional[str]]] = []
+            graph[source] = edges
+            try:
+                arguments = self.inputs_of(source)
+            except (OSError, UnicodeError):
+                continue
+            for argument in arguments:
+                if argument in seen_arguments:
+                    continue
+                seen_arguments.add(argument)
+                try:
+                    resolved = self.resolve_input(argument)
+                except FileNotFoundError:
+                    edges.append((argument, None))
+                    continue
+                edges.append((argument, resolved))
+                pending.append(resolved)
+        return graph
+
+    def is_inside(self, path: str) -> bool:
+        """Return True if *path* lies within the project root."""
+        try:
+            return os.path.commonpath((os.path.normpath(path), self.root)) == self.root
+        except ValueError:
+            return False  # different drive on Windows
+
+    def external_bib_files(self, folder: str) -> List[str]:
+        """Return the bibliography files below a folder outside the project root."""
+        folder = os.path.normpath(folder)
+        with self._lock:
+            cached = self._external_bib_files.get(folder)
+            if cached is not None:
+                return cached
+        found = []
+        if os.path.isdir(folder):
+            for path in self._walk(folder):
+                if os.path.splitext(path)[1].lower() in BIB_EXTENSIONS:
+                    found.append(path)
+        with self._lock:
+            self._external_bib_files[folder] = found
+        return found
+
+
+_PROJECT_INDEXES: Dict[str, ProjectIndex] = {}
+_PROJECT_INDEXES_LOCK = threading.Lock()
+_MAX_CACHED_INDEXES = 8
+
+
+def get_project_index(root: str) -> ProjectIndex:
+    """Return the cached :class:`ProjectIndex` for *root*, rescanning if it is stale.
+
+    Args:
+        root (str): Project folder, normally the folder of the main LaTeX file.
+
+    Returns:
+        ProjectIndex: An up-to-date index shared by all callers in this process.
+    """
+    root = os.path.realpath(os.path.abspath(os.path.expanduser(root)))
+    with _PROJECT_INDEXES_LOCK:
+        index = _PROJECT_INDEXES.get(root)
+    if index is not None and not index.is_stale():
+        return index
+    index = ProjectIndex(root)
+    with _PROJECT_INDEXES_LOCK:
+        _PROJECT_INDEXES.pop(root, None)
+        _PROJECT_INDEXES[root] = index
+        while len(_PROJECT_INDEXES) > _MAX_CACHED_INDEXES:
+            del _PROJECT_INDEXES[next(iter(_PROJECT_INDEXES))]
+    return index
+
+
+def load_tex_file(file_name: str) -> LatexFile:
+    r"""Load a LaTeX file and its associated resources recursively.
+
+    Expands all \input{} commands in the main file, and collects all .tex, .bib, and image files
+    in the same directory tree. The folder scan and file contents come from the shared
+    :class:`ProjectIndex`, so repeated loads of an unchanged project do not touch the disk again.
+
+    Args:
+        file_name (str): Path to the main LaTeX file.
+
+    Returns:
+        LatexFile: A named tuple containing the expanded content and dictionaries of found files.
+
+    Raises:
+        FileNotFoundError: If the main file does not exist.
+        OSError: If there is an error reading files from disk.
+
+    Example:
+        latex_file = load_tex_file("main.tex")
+        print(latex_file.content)
+    """
+    # Get the folder where file_name resides
+    file_name = os.path.realpath(os.path.abspath(os.path.expanduser(file_name)))
+    absolute_folder = os.path.dirname(file_name)
+
+    # Get all image files, .bib files, and .tex files in the folder (recursively)
+    index = get_project_index(absolute_folder)
+    bib_files = list(index.bib_files)
+
+    logger.info(
+        "Project folder %s: %d TeX, %d bibliography and %d image files",
+        absolute_folder, len(index.tex_files), len(bib_files), len(index.image_files),
+    )
+    logger.debug("TEX files: %s", index.tex_files)
+    logger.debug("BIB files: %s", bib_files)
+    logger.debug("Image files: %s", index.image_files)
+
+    content = index.read(file_name)
+
     def get_input_file(input_name: str) -> str:
         r"""Get the contents of an input file referenced in LaTeX.
 
@@ -273,11 +640,11 @@ def load_tex_file(file_name: str) -> LatexFile:
             str: Contents of the input file, or empty string if not found.
         """
         try:
-            filename = input_to_filename(input_name)
-            _resolved_input_dirs.add(os.path.dirname(os.path.realpath(filename)))
-            return load_file(filename)
+            filename = index.resolve_input(input_name)
+            _resolved_input_dirs.add(os.path.dirname(filename))
+            return index.read(filename)
         except (KeyError, FileNotFoundError) as exc:
-            print(f"File not found for input: {input_name} ({exc})")
+            logger.warning("File not found for input: %s (%s)", input_name, exc)
             return ""
     # Search for \input{filename} patterns in the content
     _resolved_input_dirs: set = set()
@@ -286,7 +653,7 @@ def load_tex_file(file_name: str) -> LatexFile:
     done_matches = []
 
     while True:
-        matches = regex.findall(input_pattern, content)
+        matches = re.findall(input_pattern, content)
         for match in matches:
             if match in done_matches:
                 continue
@@ -297,32 +664,20 @@ def load_tex_file(file_name: str) -> LatexFile:
         content_old = content
 
     # Collect .bib files from directories outside the project root that were
-    # touched by \input{} resolution (the initial os.walk already covers the
+    # touched by \input{} resolution (the initial scan already covers the
     # tree rooted at absolute_folder).
-    for _d in _resolved_input_dirs:
-        _d = os.path.normpath(_d)
-        try:
-            if os.path.commonpath((_d, absolute_folder)) == absolute_folder:
-                continue  # already covered by the initial recursive walk
-        except ValueError:
-            pass  # different drive on Windows — definitely outside project root
-        if os.path.isdir(_d):
-            for _root, _dirs, _fls in os.walk(_d):
-                _dirs.sort(key=str.casefold)
-                _fls.sort(key=str.casefold)
-                for _fl in _fls:
-                    if os.path.splitext(_fl)[1].lower() in bib_extensions:
-                        _abs = os.path.realpath(os.path.join(_root, _fl))
-                        if _abs not in bib_files:
-                            bib_files.append(_abs)
-
-    # Rebuild bib dict in case extra files were found
+    for _d in sorted(_resolved_input_dirs):
+        if index.is_inside(_d):
+            continue  # already covered by the initial recursive walk
+        for _abs in index.external_bib_files(_d):
+            if _abs not in bib_files:
+                bib_files.append(_abs)
+
+    _tex_files = dict(index.tex_map)
+    _image_files = dict(index.image_map)
     _bib_files = {_basename_key(f): f for f in bib_files}
     all_files = {**_tex_files, **_bib_files, **_image_files}
 
-    # Merge all collected .bib files, deduplicating by citation key
-    merged_bib_content = merge_bib_files(bib_files)
-
-    out = {"content": content, "tex_files": _tex_files, "bib_files": _bib_files, "image_files": _image_files, "all_files": all_files, "merged_bib_content": merged_bib_content}
+    # The merged, deduplicated bibliography is produced on demand from bib_paths.
+    out = {"content": content, "tex_files": _tex_files, "bib_files": _bib_files, "image_files": _image_files, "all_files": all_files, "bib_paths": tuple(bib_files)}
     return LatexFile(**out)
-
@@ -0,0 +1,96 @@
+"""Output file helpers shared by the converter and the Sphinx build steps.
+
+Sphinx decides what to re-read from file modification times, so an
+unchanged page, bibliography or image must keep its old file. Every helper
+here writes through a temporary file in the target folder and moves it over
+the target with :func:`os.replace` only if the bytes differ, so readers
+never see a partial file either.
+
+Example:
+    write_if_changed("site/source/index.md", markdown)
+"""
+
+__all__ = ["open_if_changed", "write_if_changed", "copy_if_changed"]
+
+import filecmp
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
+
+
+class _Output:
+    """Binary file handed out by :func:`open_if_changed`; ``changed`` is set on exit."""
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.changed = False
+
+    def write(self, data: bytes) -> int:
+        return self.file.write(data)
+
+
+@contextmanager
+def open_if_changed(path: Union[str, os.PathLike]) -> Iterator[_Output]:
+    """Write a file through a temporary sibling that replaces it only if the bytes differ.
+
+    The new content is streamed to the temporary file, compared with the
+    existing file, and then either discarded or moved over it.
+
+    Yields:
+        An object with ``write(bytes)``; its ``changed`` attribute tells, after
+        the block, whether ``path`` was (re)written.
+    """
+    path = os.fspath(path)
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            output = _Output(file)
+            yield output
+        if os.path.isfile(path) and filecmp.cmp(temp_path, path, shallow=False):
+            os.unlink(temp_path)
+            return
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        output.changed = True
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path: Union[str, os.PathLike], content: Union[str, bytes]) -> bool:
+    """Write ``content`` (UTF-8 for text) to ``path`` unless the file already holds it.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    with open_if_changed(path) as output:
+        output.write(data)
+    return output.changed
+
+
+def copy_if_changed(source: Union[str, os.PathLike], destination: Union[str, os.PathLike]) -> bool:
+    """Copy ``source`` to ``destination`` unless both already hold the same bytes.
+
+    Returns:
+        bool: True if the file was copied.
+    """
+    if os.path.isfile(destination) and filecmp.cmp(source, destination, shallow=False):
+        return False
+    with open(source, "rb") as origin, open_if_changed(destination) as output:
+        shutil.copyfileobj(origin, output)
+    return output.changed
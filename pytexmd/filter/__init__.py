@@ -12,9 +12,11 @@ __all__ = ["string_to_tree",
            "equations",
            "antibugs",
            "core",
+           "counters",
+           "budget",
            "splitting"
            ]
 
 
-from . import preprocessor,enumitem,equations,antibugs,core,splitting, text
+from . import preprocessor,enumitem,equations,antibugs,core,counters,budget,splitting, text
 from .file_maker import string_to_tree, process_string, element_to_file_whole, split_document_to_files, split_by_sections, verify_content_integrity, string_to_filename
\ No newline at end of file
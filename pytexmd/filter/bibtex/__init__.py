@@ -1,3 +1,3 @@
-from .core import TheBibliography, BibItem, NewBlock, EmphText, convert_bbl_to_bib
+from .core import TheBibliography, BibItem, NewBlock, EmphText, convert_bbl_to_bib, iter_bbl_entries
 
-__all__ = ["TheBibliography", "BibItem", "NewBlock", "EmphText", "convert_bbl_to_bib"]
+__all__ = ["TheBibliography", "BibItem", "NewBlock", "EmphText", "convert_bbl_to_bib", "iter_bbl_entries"]
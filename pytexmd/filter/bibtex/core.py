@@ -5,14 +5,17 @@ content and produce BibTeX .bib output via to_string().
 
 Hierarchy:
     TheBibliography  →  BibItem  →  NewBlock  →  EmphText
+
+:func:`iter_bbl_entries` produces the same records without building the tree;
+:func:`convert_bbl_to_bib` uses it.
 """
 
-__all__ = ["TheBibliography", "BibItem", "NewBlock", "EmphText", "convert_bbl_to_bib"]
+__all__ = ["TheBibliography", "BibItem", "NewBlock", "EmphText", "convert_bbl_to_bib", "iter_bbl_entries"]
 
 import re
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
-from ..core import Element, Undefined
+from ..core import Element
 from ..splitting import (
     split_on_first_brace,
     split_on_next,
@@ -21,6 +24,21 @@ from ..splitting import (
 )
 
 
+# A command only matches when followed by one of the delimiters accepted by
+# splitting.position_of, so e.g. \bibitemsep is not taken for \bibitem.
+_COMMAND_END = r'(?=[!"#$%&\'()*+,\-./:;<=>?@\[\\\]^_`{|}~\n ])'
+_BIBITEM_PATTERN = re.compile(r'\\bibitem' + _COMMAND_END)
+_NEWBLOCK_PATTERN = re.compile(r'\\newblock' + _COMMAND_END)
+_NEWBLOCK_SPLIT_PATTERN = re.compile(r'\\newblock\b')
+_BIBLIOGRAPHY_ENV_PATTERN = re.compile(r'\\(begin|end)\{thebibliography\}')
+_BIBLIOGRAPHY_BEGIN_PATTERN = re.compile(r'\\begin\{thebibliography\}' + _COMMAND_END)
+_BIBLIOGRAPHY_ARGUMENT_PATTERN = re.compile(r'^\s*\{[^}]*\}')
+_YEAR_PATTERN = re.compile(r'\((\d{4}[a-z]?)\)')
+_TRAILING_YEAR_PATTERN = re.compile(r'\s*\(\d{4}[a-z]?\)\.?\s*$')
+_EMPH_PATTERN = re.compile(r'\{\\(?:em|it) ')
+_EMPH_COMMAND_PATTERN = re.compile(r'^\\(?:em|it)\s*')
+
+
 def _clean(text: str) -> str:
     """Strip LaTeX markup, leaving plain text suitable for a .bib field value."""
     # Iteratively unwrap nested braces: {text} → text
@@ -35,6 +53,28 @@ def _clean(text: str) -> str:
     return re.sub(r'\s+', ' ', text).strip()
 
 
+def _author_and_year(body: str) -> Tuple[str, str]:
+    """Parse author and year from the preamble (text before the first \\newblock)."""
+    preamble = _NEWBLOCK_SPLIT_PATTERN.split(body, maxsplit=1)[0].strip()
+    year_m = _YEAR_PATTERN.search(preamble)
+    year = year_m.group(1) if year_m else ''
+    author_raw = _TRAILING_YEAR_PATTERN.sub('', preamble).strip().rstrip('.,')
+    return _clean(author_raw), year
+
+
+def _format_misc(key: str, author: str, title: str, year: str) -> str:
+    """Render one @misc BibTeX record."""
+    lines = [f'@misc{{{key},']
+    if author:
+        lines.append(f'  author = {{{author}}},')
+    if title:
+        lines.append(f'  title = {{{title}}},')
+    if year:
+        lines.append(f'  year = {{{year}}},')
+    lines.append('}')
+    return '\n'.join(lines)
+
+
 class EmphText(Element):
     r"""Leaf element for {\em ...} or {\it ...}.
 
@@ -144,12 +184,7 @@ class BibItem(Element):
     def __init__(self, key: str, body: str, parent: Optional[Element]):
         super().__init__(body, parent)
         self.key = key
-        # Parse author + year from the preamble (text before first \newblock)
-        preamble = re.split(r'\\newblock\b', body, maxsplit=1)[0].strip()
-        year_m = re.search(r'\((\d{4}[a-z]?)\)', preamble)
-        self._year = year_m.group(1) if year_m else ''
-        author_raw = re.sub(r'\s*\(\d{4}[a-z]?\)\.?\s*$', '', preamble).strip().rstrip('.,')
-        self._author = _clean(author_raw)
+        self._author, self._year = _author_and_year(body)
 
     @staticmethod
     def position(input: str) -> int:
@@ -187,15 +222,7 @@ class BibItem(Element):
             else:
                 title = first.plain_text().rstrip('.')
 
-        lines = [f'@misc{{{self.key},']
-        if self._author:
-            lines.append(f'  author = {{{self._author}}},')
-        if title:
-            lines.append(f'  title = {{{title}}},')
-        if self._year:
-            lines.append(f'  year = {{{self._year}}},')
-        lines.append('}')
-        return '\n'.join(lines)
+        return _format_misc(self.key, self._author, title, self._year)
 
     def _finish_up(self) -> None:
         pass  # expand() already set up children
@@ -237,8 +264,67 @@ class TheBibliography(Element):
         pass  # expand() already set up children
 
 
+def _bibliography_body(bbl_content: str) -> str:
+    """Return the content of the first thebibliography environment, without its {N} argument."""
+    begin = _BIBLIOGRAPHY_BEGIN_PATTERN.search(bbl_content)
+    if begin is None:
+        return ''
+    start = begin.end()
+    end = len(bbl_content)
+    depth = 1
+    for match in _BIBLIOGRAPHY_ENV_PATTERN.finditer(bbl_content, start):
+        depth += 1 if match.group(1) == 'begin' else -1
+        if depth == 0:
+            end = match.start()
+            break
+    return _BIBLIOGRAPHY_ARGUMENT_PATTERN.sub('', bbl_content[start:end]).strip()
+
+
+def _title(body: str) -> str:
+    r"""Title of a bibitem: the {\em ...} text of its first \newblock, else that block's plain text."""
+    first = _NEWBLOCK_PATTERN.search(body)
+    if first is None:
+        return ''
+    following = _NEWBLOCK_PATTERN.search(body, first.end())
+    block = body[first.end():following.start() if following else len(body)].strip()
+    emph = _EMPH_PATTERN.search(block)
+    if emph is not None:
+        inner, _ = split_on_first_brace(block[emph.start():])
+        return _clean(_EMPH_COMMAND_PATTERN.sub('', inner))
+    return _clean(block).rstrip('.')
+
+
+def iter_bbl_entries(bbl_content: str) -> Iterator[str]:
+    """Yield one ``@misc`` record per ``\\bibitem`` of a .bbl file.
+
+    Walks the ``\\bibitem`` boundaries once with compiled patterns and renders
+    the same author, title and year fields as the :class:`BibItem` tree.
+
+    Args:
+        bbl_content: Raw content of a .bbl file containing
+            ``\\begin{thebibliography}...\\end{thebibliography}``.
+
+    Yields:
+        str: A BibTeX ``@misc`` entry.
+    """
+    content = _bibliography_body(bbl_content)
+    items = _BIBITEM_PATTERN.finditer(content)
+    current = next(items, None)
+    while current is not None:
+        following = next(items, None)
+        rest = content[current.end():following.start() if following else len(content)].lstrip()
+        # Skip optional \bibitem[label]{key} cite-label
+        if rest.startswith('['):
+            _, rest = split_on_first_brace(rest, '[', ']')
+        key, body = split_on_first_brace(rest)
+        body = body.strip()
+        author, year = _author_and_year(body)
+        yield _format_misc(key.strip(), author, _title(body), year)
+        current = following
+
+
 def convert_bbl_to_bib(bbl_content: str) -> str:
-    """Convert .bbl content to .bib format using the filter element pipeline.
+    """Convert .bbl content to .bib format.
 
     Args:
         bbl_content: Raw content of a .bbl file containing
@@ -247,9 +333,4 @@ def convert_bbl_to_bib(bbl_content: str) -> str:
     Returns:
         BibTeX .bib database string with one ``@misc`` entry per bibitem.
     """
-    wrapper = Undefined(bbl_content, None)
-    wrapper.expand([TheBibliography])
-    for child in (wrapper.children or []):
-        if isinstance(child, TheBibliography):
-            return child.to_string()
-    return ''
+    return '\n\n'.join(iter_bbl_entries(bbl_content))
@@ -0,0 +1,137 @@
+"""Time and step budget of a conversion.
+
+Some inputs never finish: a ``\\newcommand`` whose body uses the command
+itself expands forever, and malformed documents can make the expand engine
+crawl. While a :class:`Budget` is active (see :func:`conversion_budget`),
+the loops of the preprocessor, the splitting helpers and the expand engine
+count their iterations here as steps. Iterations of the macro expansion,
+which rescan the rest of the text, cost one more step per KiB of it; a
+step then takes some tens of microseconds. The conversion is aborted with
+:class:`ConversionBudgetExceeded` once it has taken more steps or more
+seconds than allowed, or once ``\newcommand`` and ``\newenvironment``
+definitions expand into each other more levels deep than allowed. The
+exception names the loop it stopped in. When no
+budget is active the loops only pay one attribute lookup per iteration.
+
+``process_file`` runs every conversion under a budget: :data:`DEFAULT_STEPS`
+, :data:`DEFAULT_SECONDS` and :data:`DEFAULT_DEPTH` unless other limits are
+passed.
+
+Example:
+    with conversion_budget(seconds=60, steps=1_000_000):
+        string_to_tree(latex)
+"""
+
+__all__ = ["ConversionBudgetExceeded", "Budget", "conversion_budget", "DEFAULT_STEPS", "DEFAULT_SECONDS", "DEFAULT_DEPTH"]
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+ACTIVE: Optional["Budget"] = None
+
+# Default step limit of a conversion; None for no limit. A 100 KB document
+# takes about 80,000 steps, and like the conversion time the count grows
+# with the square of the size, so this allows for about 800 KB.
+DEFAULT_STEPS: Optional[int] = 5_000_000
+# Default time limit of a conversion in seconds; None for no limit.
+DEFAULT_SECONDS: Optional[float] = None
+# Default limit on how deep macro definitions may expand into each other;
+# a command defined in terms of itself reaches it at once.
+DEFAULT_DEPTH: Optional[int] = 50
+
+# The clock is read about once every this many steps.
+_CLOCK_INTERVAL = 256
+_UNSET = object()
+
+
+class ConversionBudgetExceeded(RuntimeError):
+    """Raised when a conversion takes more steps or more time than its budget allows.
+
+    Attributes:
+        kind (str): ``"steps"``, ``"time"`` or ``"depth"``, the limit that was reached.
+        limit (float): The limit that was reached.
+        steps (int): Steps taken so far.
+        seconds (float): Seconds spent so far.
+        where (str): The loop the conversion was in.
+    """
+
+    def __init__(self, kind: str, limit: float, steps: int, seconds: float, where: str):
+        self.kind = kind
+        self.limit = limit
+        self.steps = steps
+        self.seconds = seconds
+        self.where = where
+        reached = {"steps": f"{limit:,} steps", "time": f"{limit:g} s", "depth": f"{limit} expansion levels"}[kind]
+        super().__init__(
+            f"conversion stopped after {steps:,} steps and {seconds:.1f} s in {where}: the budget of {reached} "
+            "is used up. The document may define a command or environment in terms of itself, or contain "
+            "unbalanced braces or math delimiters."
+        )
+
+
+class Budget:
+    """Step and time limits of one conversion.
+
+    Args:
+        seconds (float, optional): Wall-clock limit; None for no limit.
+        steps (int, optional): Limit on loop iterations; None for no limit.
+        depth (int, optional): Limit on nested macro expansion; None for no limit.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, steps: Optional[int] = None, depth: Optional[int] = None):
+        self.seconds = seconds
+        self.steps = steps
+        self.depth = depth
+        self.taken = 0
+        self.started = time.monotonic()
+        self._deadline = self.started + seconds if seconds is not None else None
+
+    def step(self, where, cost: int = 1) -> None:
+        """Count ``cost`` steps of the loop ``where`` (a name or a searcher) and enforce the limits."""
+        before = self.taken
+        self.taken += cost
+        if self.steps is not None and self.taken > self.steps:
+            self._exceeded("steps", self.steps, where)
+        if (
+            self._deadline is not None
+            and before // _CLOCK_INTERVAL != self.taken // _CLOCK_INTERVAL
+            and time.monotonic() > self._deadline
+        ):
+            self._exceeded("time", self.seconds, where)
+
+    def expansion_level(self, where: str, level: int) -> None:
+        """Check the ``level``-th pass of the macro expansion ``where`` against the depth limit."""
+        if self.depth is not None and level > self.depth:
+            self._exceeded("depth", self.depth, where)
+
+    def _exceeded(self, kind: str, limit: float, where) -> None:
+        if not isinstance(where, str):
+            from .counters import searcher_label
+
+            where = searcher_label(where)
+        raise ConversionBudgetExceeded(kind, limit, self.taken, time.monotonic() - self.started, where)
+
+
+@contextmanager
+def conversion_budget(seconds=_UNSET, steps=_UNSET, depth=_UNSET) -> Iterator[Budget]:
+    """Enforce a budget on the block; nested use keeps the outer budget.
+
+    Args:
+        seconds (float, optional): Time limit; defaults to :data:`DEFAULT_SECONDS`.
+        steps (int, optional): Step limit; defaults to :data:`DEFAULT_STEPS`.
+        depth (int, optional): Macro expansion depth limit; defaults to :data:`DEFAULT_DEPTH`.
+    """
+    global ACTIVE
+    if ACTIVE is not None:
+        yield ACTIVE
+        return
+    ACTIVE = Budget(
+        DEFAULT_SECONDS if seconds is _UNSET else seconds,
+        DEFAULT_STEPS if steps is _UNSET else steps,
+        DEFAULT_DEPTH if depth is _UNSET else depth,
+    )
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = None
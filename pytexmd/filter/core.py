@@ -28,8 +28,11 @@ __all__ = [
 ]
 
 from enum import Enum
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 
 class LabelType(Enum):
@@ -139,14 +142,15 @@ def ref_call(org: str) -> str:
         if new_label not in USED_LABELS:
             out = raw_label_func(org,k-1)
             if out not in LABEL_TO_LABEL_TYPE:
-                print("WARNING: ref_call called on label that was not defined before: " + out)
+                logger.warning("ref_call called on label that was not defined before: %s", out)
                 return "ERROR_UNDEFINED_LABEL_" + out
             else:
                 return LABEL_TYPE_TO_STR_FUNCS[LABEL_TO_LABEL_TYPE[out]](out,LABEL_TO_RENAME[out])
         k = k + 1
         
 from typing import List, Optional, Tuple, Union, Callable,NamedTuple
-from . import splitting
+from . import budget, counters, splitting
+from ..log import progress
 
 call_num = 0
 
@@ -428,12 +432,13 @@ class Element():
         global call_num 
         while True:
             call_num = call_num + 1
+            if counters.ACTIVE is not None:
+                counters.ACTIVE.count_pass()
+            if budget.ACTIVE is not None:
+                budget.ACTIVE.step("expand")
 
             if call_num % 100==0:
-                print(".",end='')
-        
-            if call_num % 2000==0:
-                print("\nnumber of expand calls ",call_num," ")
+                progress("expand", "number of expand calls %d", call_num, logger=logger)
                 
             if self._process_children(all_classes) == False:
                 break
@@ -473,7 +478,12 @@ class Element():
                     self.children.append(element)
                     self._modifiable_content = ""
                 else:
-                    undefined_string,element,self._modifiable_content = selected_classes[0].split_and_create(self._modifiable_content,self)
+                    if budget.ACTIVE is not None:
+                        budget.ACTIVE.step(selected_classes[0])
+                    if counters.ACTIVE is None:
+                        undefined_string,element,self._modifiable_content = selected_classes[0].split_and_create(self._modifiable_content,self)
+                    else:
+                        undefined_string,element,self._modifiable_content = counters.ACTIVE.split_and_create(selected_classes[0],self._modifiable_content,self)
                     
                     self.children.append(Undefined(undefined_string,self))
                     self.children.append(element)
@@ -499,6 +509,22 @@ class Element():
             'dummy'
         """
         raise NotImplementedError("no function to_string found")
+
+    def write_to(self, write: Callable[[str], object]) -> None:
+        """Pass the Markdown/MyST output to ``write`` piece by piece.
+
+        The pieces add up to :meth:`to_string`. Containers such as the
+        document and its sections override this to hand on each child's
+        output as soon as it is rendered, so the whole document is never
+        held as one string.
+
+        Example:
+            >>> pieces = []
+            >>> RawText("abc", None).write_to(pieces.append)
+            >>> pieces
+            ['abc']
+        """
+        write(self.to_string())
     
 
 class StructureMaker(Element):
@@ -579,8 +605,9 @@ def find_nearest_classes(string: str, all_classes: List[Element]) -> List[Elemen
     """
     min_distance = 99999
     out = []
+    stats = counters.ACTIVE
     for elem in all_classes:
-        dist = elem.position(string)
+        dist = elem.position(string) if stats is None else stats.position(elem, string)
         if dist == -1:
             continue
         else:
@@ -719,6 +746,26 @@ class SectionLike(StructureMaker):
         out = comment +begin_comment+ pre + out.lstrip() + end_comment +"\n"
         
         return out
+
+    def write_to(self, write: Callable[[str], object]) -> None:
+        comment = make_myst_comment(f"{SEC_DEF_SPLITTER}{self.command_name}{SEC_DEF_SPLITTER}{self.name}{SEC_DEF_SPLITTER}")
+        heading = SECTION_LIKE_COMMANDS_TO_BEGIN[self.command_name] + self.name.strip() + SECTION_LIKE_COMMANDS_TO_END[self.command_name] + "\n"
+        if self.label is not None:
+            write(comment + self.get_begin_comment() + "\n(" + self.label + ")=\n" + heading)
+        else:
+            write(comment + self.get_begin_comment() + "\n" + heading)
+        # to_string strips the whitespace at the start of the section body.
+        started = False
+        def write_body(text: str) -> None:
+            nonlocal started
+            if not started:
+                text = text.lstrip()
+                started = text != ""
+            if text:
+                write(text)
+        for child in self.children:
+            child.write_to(write_body)
+        write(self.get_end_comment() + "\n")
     
     def get_content(self)->str:
         
@@ -843,6 +890,10 @@ class Document(StructureMaker):
             out += child.to_string()
         return out
 
+    def write_to(self, write: Callable[[str], object]) -> None:
+        for child in self.children:
+            child.write_to(write)
+
     def get_structures(self)->List[SectionStructure]:
         out = []
         child_structures = []
@@ -867,6 +918,10 @@ class Undefined(StructureMaker):
         for child in self.children:
             out += child.to_string()
         return out
+
+    def write_to(self, write: Callable[[str], object]) -> None:
+        for child in self.children:
+            child.write_to(write)
     
     def get_structures(self)->List[SectionStructure]:
         child_structures = []
@@ -905,11 +960,11 @@ class BackMatter(Searcher):
         self.save_split = save_split
 
     def position(self, string: str) -> int:
-        print("checking for backmatter")
+        logger.debug("checking for backmatter")
         return splitting.position_of(string,r"\backmatter",self.save_split)
 
     def split_and_create(self, string: str, parent: Element) -> Tuple[str, Undefined, str]:
-        print("splitting on backmatter")
+        logger.debug("splitting on backmatter")
         pre,post = splitting.split_on_next(string,r"\backmatter",self.save_split)
         return pre,Undefined(post,parent),""
 
@@ -0,0 +1,148 @@
+"""Per-searcher counters of the expand engine.
+
+While :func:`count_searchers` is active, :func:`~pytexmd.filter.core.find_nearest_classes`
+and :meth:`~pytexmd.filter.core.Element._process_children` report every
+``position()`` and ``split_and_create()`` call here. Counters are kept per
+expand phase and per searcher: a searcher class, or an instance labelled
+with its command (``JunkSearcher(\\em)``). When no counter is active the
+engine only pays one attribute lookup per call.
+
+Example:
+    with count_searchers() as counts:
+        string_to_tree(latex)
+    print(counts.format_table())
+"""
+
+__all__ = ["SearcherCounters", "count_searchers", "set_phase", "searcher_label"]
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+ACTIVE: Optional["SearcherCounters"] = None
+
+_FIELDS = ("position_calls", "found", "selected", "chars_scanned", "position_seconds", "split_seconds")
+
+
+def searcher_label(searcher) -> str:
+    """Name a searcher class, or a searcher instance after the command it looks for."""
+    if isinstance(searcher, type):
+        return searcher.__name__
+    for attribute in ("command_name", "junk_name", "theorem_env_name", "name"):
+        value = getattr(searcher, attribute, None)
+        if isinstance(value, str):
+            return f"{type(searcher).__name__}({value})"
+    return type(searcher).__name__
+
+
+class SearcherCounters:
+    """Calls, matches, characters scanned and time of every searcher, per expand phase.
+
+    ``position_calls`` and ``found`` count ``position()`` calls and those that
+    found something; ``selected`` counts ``split_and_create()`` calls;
+    ``chars_scanned`` adds up the length of the strings handed to ``position()``.
+    """
+
+    def __init__(self):
+        self.phase = "expand"
+        self.passes: Dict[str, int] = {}
+        self._counts: Dict[str, Dict[Any, List[float]]] = {}
+
+    def _record(self, searcher) -> List[float]:
+        phase = self._counts.setdefault(self.phase, {})
+        record = phase.get(searcher)
+        if record is None:
+            record = phase[searcher] = [0, 0, 0, 0, 0.0, 0.0]
+        return record
+
+    def count_pass(self) -> None:
+        """Count one pass of :meth:`Element.expand` over the tree."""
+        self.passes[self.phase] = self.passes.get(self.phase, 0) + 1
+
+    def position(self, searcher, string: str) -> int:
+        """Call ``searcher.position(string)`` and count it."""
+        started = time.perf_counter()
+        distance = searcher.position(string)
+        record = self._record(searcher)
+        record[4] += time.perf_counter() - started
+        record[0] += 1
+        record[3] += len(string)
+        if distance != -1:
+            record[1] += 1
+        return distance
+
+    def split_and_create(self, searcher, string: str, parent):
+        """Call ``searcher.split_and_create(string, parent)`` and count it."""
+        started = time.perf_counter()
+        result = searcher.split_and_create(string, parent)
+        record = self._record(searcher)
+        record[5] += time.perf_counter() - started
+        record[2] += 1
+        return result
+
+    def by_phase(self) -> List[Dict[str, Any]]:
+        """One row per phase and searcher label, in phase order, slowest first."""
+        rows = []
+        for phase, records in self._counts.items():
+            merged: Dict[str, List[float]] = {}
+            for searcher, record in records.items():
+                total = merged.setdefault(searcher_label(searcher), [0, 0, 0, 0, 0.0, 0.0])
+                for index, value in enumerate(record):
+                    total[index] += value
+            phase_rows = [
+                {"phase": phase, "searcher": label, **dict(zip(_FIELDS, record))}
+                for label, record in merged.items()
+            ]
+            phase_rows.sort(key=lambda row: row["position_seconds"] + row["split_seconds"], reverse=True)
+            rows.extend(phase_rows)
+        return rows
+
+    def by_searcher(self) -> List[Dict[str, Any]]:
+        """One row per searcher label over all phases, slowest first."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for row in self.by_phase():
+            total = totals.setdefault(row["searcher"], {"searcher": row["searcher"], **dict.fromkeys(_FIELDS, 0)})
+            for field in _FIELDS:
+                total[field] += row[field]
+        return sorted(totals.values(), key=lambda row: row["position_seconds"] + row["split_seconds"], reverse=True)
+
+    def report(self) -> Dict[str, Any]:
+        """The counters as a JSON-serializable dictionary."""
+        return {"searchers": self.by_searcher(), "phases": self.by_phase(), "passes": dict(self.passes)}
+
+    def format_table(self, limit: Optional[int] = 15) -> str:
+        """The slowest searchers over all phases as an aligned text table."""
+        rows = [("Searcher", "Calls", "Found", "Used", "MChars", "Seconds")]
+        for row in self.by_searcher()[:limit]:
+            rows.append((
+                row["searcher"],
+                str(row["position_calls"]),
+                str(row["found"]),
+                str(row["selected"]),
+                f"{row['chars_scanned'] / 1e6:.2f}",
+                f"{row['position_seconds'] + row['split_seconds']:.3f}",
+            ))
+        width = max(len(row[0]) for row in rows)
+        return "\n".join(
+            f"{row[0]:<{width}}" + "".join(f"  {cell:>8}" for cell in row[1:]) for row in rows
+        )
+
+
+def set_phase(name: str) -> None:
+    """Attribute the following searcher calls to the expand phase ``name``."""
+    if ACTIVE is not None:
+        ACTIVE.phase = name
+
+
+@contextmanager
+def count_searchers() -> Iterator[SearcherCounters]:
+    """Count the searcher calls of the block; nested use shares the outer counters."""
+    global ACTIVE
+    if ACTIVE is not None:
+        yield ACTIVE
+        return
+    ACTIVE = SearcherCounters()
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = None
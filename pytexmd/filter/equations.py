@@ -25,9 +25,13 @@ __all__ = [
 #from drawtex import contains_drawtex,get_drawtex_searchers
 from .splitting import *
 from .core import *
+from . import budget
 from typing import List,Tuple,Union
 from ..config import LATEX_REPLACEMENTS
 import re as _re
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def _handwritten_tag(content: str) -> str:
@@ -121,6 +125,8 @@ class InlineLatex(Element):
         content = ""
 
         while True:
+            if budget.ACTIVE is not None:
+                budget.ACTIVE.step("the search for a closing $")
             pending_pre_end,post = split_on_next(modifiable_content,"$",save_split=False)
             if not "\\text" in pending_pre_end:
                 content = in_outer_dollar + pending_pre_end
@@ -164,7 +170,7 @@ class DoubleDolarLatex(Element):
 
     def add_label(self,label: str):
         if self.label != "":
-            print("this label is going to be overwritten:", self.label, "new:", label)
+            logger.warning("label %s is going to be overwritten by %s", self.label, label)
         self.label = label.strip()
 
     def to_string(self) -> str:
@@ -238,7 +244,7 @@ class DefaultEquation(Element):
 
     def add_label(self,label: str):
         if self.label != "":
-            print("this label is going to be overwritten:", self.label, "new:", label)
+            logger.warning("label %s is going to be overwritten by %s", self.label, label)
         self.label = label.strip()
 
     def to_string(self) -> str:
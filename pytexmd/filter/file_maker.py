@@ -8,13 +8,18 @@ __all__ = ["string_to_tree",
            "string_to_filename",
            ]
 
-from . import preprocessor,enumitem,equations,antibugs,core,splitting, text
+from . import preprocessor,enumitem,equations,antibugs,core,counters,splitting, text
 
-from typing import List
-from pathlib import Path
-import os
+from ..profiling import stage
+from ..sinks import OutputSink, as_sink
+
+from typing import List, Union
+import io
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 NUM_FILES = 0
 
 WINDOWS_RESERVED_FILENAMES = {
@@ -44,6 +49,12 @@ SECTION_HIERARCHY = {
     "\\subparagraph*": 6,
 }
 
+def _phase_name(number:int,searchers:list)->str:
+    """Name an expand phase after the searchers it runs, for the profile report."""
+    names = list(dict.fromkeys(s.__name__ if isinstance(s,type) else type(s).__name__ for s in searchers))
+    more = f" +{len(names)-3}" if len(names) > 3 else ""
+    return f"expand {number}: {', '.join(names[:3])}{more}"
+
 def string_to_tree(string:str)->core.Document:
     """
     Converts a string to a document tree structure.
@@ -61,9 +72,18 @@ def string_to_tree(string:str)->core.Document:
         print(doc.to_string())
         ```
     """
-    string = antibugs.no_more_bugs_begin(string)
-    
-    string  = preprocessor.run_preprocessor(string)
+    text.CITED_KEYS.clear()
+    if text.TIKZ_PICTURES is not None:
+        text.TIKZ_PICTURES.clear()
+    text.IMAGE_REFERENCES.clear()
+    core.USED_LABELS.clear()
+    core.LABEL_TO_LABEL_TYPE.clear()
+    core.LABEL_TO_RENAME.clear()
+    with stage("antibugs"):
+        string = antibugs.no_more_bugs_begin(string)
+    
+    with stage("preprocessor"):
+        string  = preprocessor.run_preprocessor(string)
     all_expands = []
     
     #basic_expands += junkSearcher+replaceSearcher
@@ -72,6 +92,8 @@ def string_to_tree(string:str)->core.Document:
     theorem_searchers = text.get_theoremSearchers(string)
     para_searcher = text.ParaSearcher([s.theorem_env_name for s in theorem_searchers])
     all_expands += [theorem_searchers + [para_searcher]]+[[text.Proof]]+ [enumitem.get_all_filters()]
+    # Figures before the math split, which would cut a caption holding $...$ apart.
+    all_expands += [[text.Figure]]
     all_expands += [equations.get_all_filters()]
     all_expands += [text.get_all_filters()] 
     all_expands += [[core.OneArgumentJunkSearcher(r"\hspace")]]
@@ -91,15 +113,20 @@ def string_to_tree(string:str)->core.Document:
     pre_docmuent,document,post_document = text.Document.split_and_create(string,None)
     #document.globals.number_within_equation = number_within_equation
     
-    for expand_on in all_expands:
-        document.expand(expand_on)
-    document.expand([core.JunkSearcher("{",save_split=False),core.JunkSearcher("}",save_split=False)])
-    document.expand([core.JunkSearcher("\\ ",save_split=False)])
+    all_expands.append([core.JunkSearcher("{",save_split=False),core.JunkSearcher("}",save_split=False)])
+    all_expands.append([core.JunkSearcher("\\ ",save_split=False)])
+    for number, expand_on in enumerate(all_expands, start=1):
+        phase = _phase_name(number, expand_on)
+        counters.set_phase(phase)
+        with stage(phase):
+            document.expand(expand_on)
     
     
     #pre_content are just commands
-    print("processing finished! now the final file will be created.")
-    document._finish_up()
+    logger.info("processing finished! now the final file will be created.")
+    counters.set_phase("finish up")
+    with stage("finish up"):
+        document._finish_up()
     
     
     return document
@@ -131,7 +158,7 @@ def element_to_file_whole(element:core.SectionLike,output_folder:str,file_name:s
     file_name = output_folder+"/"+file_name+output_suffix
     with open(file_name,"w",encoding="utf-8") as f:
         f.write(element.to_string())
-    print(f"File {file_name} created.")
+    logger.debug("File %s created.", file_name)
     return [file_name.replace(output_suffix,"")]
 
 def element_to_file_only_begin(element:core.SectionLike,output_folder:str,file_name:str,file_names:List[str],output_suffix:str=".md"):
@@ -174,7 +201,7 @@ def element_to_file_only_begin(element:core.SectionLike,output_folder:str,file_n
     with open(file_name,"w",encoding="utf-8") as f:
         f.write(out_str)
 
-    print(f"File {file_name} created.")
+    logger.debug("File %s created.", file_name)
     return [file_name.replace(output_suffix,"")]
 
 
@@ -224,8 +251,8 @@ def split_by_sections(content_string, max_depth=2):
         
         # Debug: warn if command not found in hierarchy
         if level == 999:
-            print(f"Warning: Unknown section command '{command}' (repr: {repr(command)}) - treating as level 999")
-            print(f"  Available commands: {list(SECTION_HIERARCHY.keys())}")
+            logger.warning("Unknown section command %r - treating as level 999", command)
+            logger.debug("  Available commands: %s", list(SECTION_HIERARCHY.keys()))
         
         # Find corresponding PREFIX_BEGIN and PREFIX_END
         begin_marker = f"<!-- {core.SEC_PREFIX_BEGIN}{command}{name} -->"
@@ -354,7 +381,7 @@ def write_section_files(section, output_folder, max_depth, current_depth=0, outp
     
     Args:
         section (dict): Section structure
-        output_folder (str): Output directory
+        output_folder (str | OutputSink): Output directory, or the sink receiving the pages
         max_depth (int): Maximum splitting depth
         current_depth (int): Current recursion depth
         output_suffix (str): File extension
@@ -363,61 +390,64 @@ def write_section_files(section, output_folder, max_depth, current_depth=0, outp
     Returns:
         str: Filename of created file (without extension)
     """
-    os.makedirs(output_folder, exist_ok=True)
-    
+    sink = as_sink(output_folder)
     filename = string_to_filename(section['name'])
-    filepath = os.path.join(output_folder, filename + output_suffix)
+    filepath = filename + output_suffix
     
     should_split = current_depth < max_depth and len(section['children']) > 1
     extra_toc = append_toc or []
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        if should_split or extra_toc:
-            # Own content: for root use its content (preamble); for sections
-            # use content before the first child's DEF marker.
-            if section.get('command') == 'document':
-                own_content = section.get('content', '')
-            else:
-                own_content = _get_section_own_content(section)
-            if own_content.strip():
-                f.write(own_content.strip() + "\n\n")
-
-            # Toctree navigation must not add implicit section numbers.
-            f.write("```{toctree}\n")
-            f.write(":maxdepth: 2\n")
-            f.write("\n")
-
-            child_files = []
-            for child in section['children']:
-                child_filename = write_section_files(
-                    child,
-                    output_folder,
-                    max_depth,
-                    current_depth + 1,
-                    output_suffix
-                )
-                child_files.append(child_filename)
-
-            section['child_files'] = child_files
-
-            for child_file in child_files:
-                f.write(f"{child_file}\n")
-            for extra in extra_toc:
-                f.write(f"{extra}\n")
-            f.write("```\n")
-
-            # Write content that lives between/after numbered children:
-            # unnumbered sections (\section*), trailing text, appended
-            # inter-section content from split_by_sections.
-            if section.get('command') != 'document':
-                trailing = _get_inter_and_trailing_content(section)
-                if trailing.strip():
-                    f.write("\n" + trailing.strip() + "\n")
+    f = io.StringIO()
+    if should_split or extra_toc:
+        # Own content: for root use its content (preamble); for sections
+        # use content before the first child's DEF marker.
+        if section.get('command') == 'document':
+            own_content = section.get('content', '')
         else:
-            # Leaf section — write full content.
-            f.write(section['content'].strip() + "\n")
+            own_content = _get_section_own_content(section)
+        if own_content.strip():
+            f.write(own_content.strip() + "\n\n")
+
+        # Toctree navigation must not add implicit section numbers.
+        f.write("```{toctree}\n")
+        f.write(":maxdepth: 2\n")
+        f.write("\n")
+
+        child_files = []
+        for child in section['children']:
+            child_filename = write_section_files(
+                child,
+                sink,
+                max_depth,
+                current_depth + 1,
+                output_suffix
+            )
+            child_files.append(child_filename)
+
+        section['child_files'] = child_files
+
+        for child_file in child_files:
+            f.write(f"{child_file}\n")
+        for extra in extra_toc:
+            f.write(f"{extra}\n")
+        f.write("```\n")
+
+        # Write content that lives between/after numbered children:
+        # unnumbered sections (\section*), trailing text, appended
+        # inter-section content from split_by_sections.
+        if section.get('command') != 'document':
+            trailing = _get_inter_and_trailing_content(section)
+            if trailing.strip():
+                f.write("\n" + trailing.strip() + "\n")
+    else:
+        # Leaf section — write full content.
+        f.write(section['content'].strip() + "\n")
     
-    print(f"Created: {filepath}")
+    # Unchanged pages keep their modification time, so Sphinx does not re-read them.
+    if sink.write(filepath, f.getvalue()):
+        logger.debug("Created: %s in %s", filepath, sink)
+    else:
+        logger.debug("Unchanged: %s in %s", filepath, sink)
     return filename
 
 def reconstruct_content_from_structure(section):
@@ -488,7 +518,8 @@ def split_document_to_files(document_md, output_folder, depth=2, output_suffix="
     
     Args:
         document_md: Document tree object (from string_to_tree)
-        output_folder (str): Output directory path
+        output_folder (str | OutputSink): Output directory path, or the sink receiving the
+            pages (see :mod:`pytexmd.sinks`)
         depth (int): Splitting depth (0=no split, 1=chapter, 2=section, etc.)
         output_suffix (str): File extension
         verify (bool): Verify content integrity after parsing
@@ -505,38 +536,45 @@ def split_document_to_files(document_md, output_folder, depth=2, output_suffix="
         ```
     """
     # Convert document to string
-    content_string = document_md.to_string()
+    with stage("render"):
+        content_string = document_md.to_string()
     
     # Parse hierarchical structure
-    root = split_by_sections(content_string, depth)
+    with stage("split"):
+        root = split_by_sections(content_string, depth)
     
     # Verify content integrity if requested
     if verify:
-        is_valid, message, stats = verify_content_integrity(content_string, root)
-        print(f"\n{message}")
-        print(f"  Original: {stats['original_length']:,} chars")
-        print(f"  Reconstructed: {stats['reconstructed_length']:,} chars")
-        if not is_valid:
-            print("\nWarning: Proceeding with file creation despite content mismatch")
-    
-    # Write files
-    write_section_files(root, output_folder, depth, 0, output_suffix,
-                        append_toc=["references"])
-
-    # Create a dedicated references page so sphinxcontrib.bibtex renders the
-    # bibliography list.
-    refs_path = os.path.join(output_folder, "references" + output_suffix)
-    with open(refs_path, 'w', encoding='utf-8') as f:
-        f.write("# References\n\n")
-        f.write("```{bibliography}\n")
-        f.write(":style: unsrt\n")
-        f.write("```\n")
-    print(f"Created: {refs_path}")
+        with stage("verify"):
+            is_valid, message, stats = verify_content_integrity(content_string, root)
+        logger.debug("  Original: %s chars", f"{stats['original_length']:,}")
+        logger.debug("  Reconstructed: %s chars", f"{stats['reconstructed_length']:,}")
+        if is_valid:
+            logger.info(message)
+        else:
+            logger.warning(message)
+            logger.warning("Proceeding with file creation despite content mismatch")
+    
+    with stage("write"):
+        # Write files
+        sink = as_sink(output_folder)
+        write_section_files(root, sink, depth, 0, output_suffix,
+                            append_toc=["references"])
+
+        # Create a dedicated references page so sphinxcontrib.bibtex renders the
+        # bibliography list; \nocite{*} lists every entry.
+        refs_path = "references" + output_suffix
+        listing = ":all:\n" if "*" in text.CITED_KEYS else ""
+        references = "# References\n\n```{bibliography}\n" + listing + ":style: unsrt\n```\n"
+        if sink.write(refs_path, references):
+            logger.debug("Created: %s in %s", refs_path, sink)
+        else:
+            logger.debug("Unchanged: %s in %s", refs_path, sink)
 
-    print(f"\nDocument split into files in: {output_folder}")
+    logger.info("Document split into files in: %s", sink)
     return root
 
-def process_string(output_folder:str, string:str, depth=2, output_suffix:str=".md", verify=True):
+def process_string(output_folder:Union[str, OutputSink], string:str, depth=2, output_suffix:str=".md", verify=True):
     """
     Processes a LaTeX string and writes the document to hierarchical MyST files.
     
@@ -544,7 +582,8 @@ def process_string(output_folder:str, string:str, depth=2, output_suffix:str=".m
     files based on section hierarchy with automatic content verification.
 
     Args:
-        output_folder (str): The output folder path.
+        output_folder (str | OutputSink): The output folder path, or the sink receiving the
+            pages (see :mod:`pytexmd.sinks`).
         string (str): The input LaTeX string.
         depth (int, optional): Splitting depth (0=no split, 1=chapter, 2=section, etc.). Defaults to 2.
         output_suffix (str, optional): The file suffix. Defaults to ".md".
@@ -563,8 +602,8 @@ def process_string(output_folder:str, string:str, depth=2, output_suffix:str=".m
     """
     if not isinstance(depth, int) or depth < 0:
         raise ValueError("depth must be a non-negative integer")
-    if not isinstance(output_folder, str):
-        raise ValueError("output_folder must be a string")
+    if not isinstance(output_folder, str) and not hasattr(output_folder, "write"):
+        raise ValueError("output_folder must be a string or an output sink")
     if not isinstance(string, str):
         raise ValueError("string must be a string")
     
@@ -1,7 +1,12 @@
 __all__ = ["do_commands","do_newenvironment"]
 
+import logging
+
+from . import budget
 from .splitting import first_char_brace,split_on_first_brace,split_on_next,begin_end_split,position_of
 
+logger = logging.getLogger(__name__)
+
 def execute_on_pattern(string: str, arg_num: int, command_name: str, command_pattern: str) -> str:
     """
     Expands a LaTeX command pattern in the string.
@@ -22,6 +27,8 @@ def execute_on_pattern(string: str, arg_num: int, command_name: str, command_pat
     """
     out = ""
     while(True):
+        if budget.ACTIVE is not None:
+            budget.ACTIVE.step("the expansion of " + command_name, 1 + len(string) // 1024)
         pattern_instance = command_pattern
         pre,post = split_on_next(string,command_name)
         if string == pre:    
@@ -75,7 +82,12 @@ def do_commands(string: str) -> str:
         toprocess = post
         all_commands.append((arg_num,command_name,command_pattern))
 
+    level = 0
     while True:
+        level += 1
+        if budget.ACTIVE is not None:
+            budget.ACTIVE.expansion_level("\\newcommand expansion", level)
+            budget.ACTIVE.step("\\newcommand expansion", 1 + len(string) // 1024)
         tmp = string
         for arg_num,command_name,command_pattern in all_commands:
             tmp = execute_on_pattern(tmp,arg_num,command_name,command_pattern)
@@ -106,6 +118,8 @@ def execute_enviroment_on_pattern(string: str, environment_name: str, arg_num: i
     """
     out = ""
     while(True):
+        if budget.ACTIVE is not None:
+            budget.ACTIVE.step("the expansion of environment " + environment_name, 1 + len(string) // 1024)
         begin_instance = begin
         end_instance = end
         if not "\\begin{"+environment_name+"}" in string:    
@@ -162,10 +176,15 @@ def do_newenvironment(string: str) -> str:
         toprocess = post
         all_env.append((environment_name,arg_num,begin,end))
 
+    level = 0
     while True:
+        level += 1
+        if budget.ACTIVE is not None:
+            budget.ACTIVE.expansion_level("\\newenvironment expansion", level)
+            budget.ACTIVE.step("\\newenvironment expansion", 1 + len(string) // 1024)
         tmp = string
         for environment_name,arg_num,begin,end in all_env:
-            print("applying enviroment ",environment_name)
+            logger.debug("applying enviroment %s", environment_name)
             tmp = execute_enviroment_on_pattern(tmp,environment_name,arg_num,begin,end)
         if tmp == string:
             break
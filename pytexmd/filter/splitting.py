@@ -2,6 +2,8 @@ __all__ = ["get_all_allchars_no_abc","save_command_split","first_char_brace","sp
 
 from typing import Tuple, List, Optional, Union, Callable
 
+from . import budget
+
 def get_all_allchars_no_abc()->str:
     """
     Returns a string of non-alphabetic ASCII characters.
@@ -254,6 +256,8 @@ def begin_end_split(string:str, begin_name:str, end_name:str, save_split:bool =
     middle = ""
 
     while True:
+        if budget.ACTIVE is not None:
+            budget.ACTIVE.step("the search for " + end_name)
         posbegin = position_of(xanda,begin_name,save_split)
         posend = position_of(xanda,end_name,save_split)
         if posbegin!=-1 and posbegin < posend:
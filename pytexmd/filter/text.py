@@ -13,6 +13,9 @@ __all__ = [
     "ParaElement",
     "ParaSearcher",
     "Cite",
+    "NoCite",
+    "CITED_KEYS",
+    "TIKZ_PICTURES",
     "get_all_filters",
     "get_number_within_equation",
     "get_theoremSearchers",
@@ -21,12 +24,20 @@ __all__ = [
     "TikzElement",
     "TikzSearcher",
     "InlineTikz",
+    "IncludeGraphics",
+    "Figure",
+    "IMAGE_REFERENCES",
+    "image_asset_name",
 ]
+import logging
+import posixpath
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .core import *
 from .splitting import *
 
+logger = logging.getLogger(__name__)
+
 THEOREM_TYPES = {
     "algorithm": "Algorithm",
     "axiom": "Axiom",
@@ -283,6 +294,10 @@ class Textbf(Element):
         out += "**"
         return out
 
+# Citation keys seen by Cite and NoCite during the current conversion, in
+# first-use order; "*" stands for every entry (\nocite{*}).
+CITED_KEYS: list = []
+
 class Cite(Element):
     """Element for LaTeX \\cite command.
 
@@ -315,6 +330,10 @@ class Cite(Element):
         for elem in name.split(" "):
             tmp += elem
         citations = tmp.split(",")
+        for key in citations:
+            key = key.strip()
+            if key and key not in CITED_KEYS:
+                CITED_KEYS.append(key)
         return pre,Cite("",parent,citations,rename),post
 
     def to_string(self) -> str:
@@ -324,6 +343,40 @@ class Cite(Element):
         return f"{{cite}}`{keys}`"
 
 
+class NoCite(Element):
+    """Element for LaTeX \\nocite command.
+
+    Lists entries in the bibliography without citing them in the text;
+    ``\\nocite{*}`` lists every entry (see the references page).
+
+    Example:
+        >>> nocite = NoCite("content", None, ["ref1", "*"])
+        >>> nocite.to_string()
+        '{cite:empty}`ref1`'
+    """
+    def __init__(self, modifiable_content: str, parent: Element, citations: list[str]):
+        super().__init__(modifiable_content,parent)
+        self.citations = citations
+
+    @staticmethod
+    def position(input: str) -> int:
+        return position_of(input,"\\nocite")
+
+    @staticmethod
+    def split_and_create(input: str, parent: Element) -> Tuple[str, 'NoCite', str]:
+        pre,post = split_on_next(input,"\\nocite")
+        name,post = split_on_first_brace(post.strip())
+        citations = [key.strip() for key in name.split(",") if key.strip()]
+        for key in citations:
+            if key not in CITED_KEYS:
+                CITED_KEYS.append(key)
+        return pre,NoCite("",parent,citations),post
+
+    def to_string(self) -> str:
+        keys = ",".join(key for key in self.citations if key != "*")
+        return f"{{cite:empty}}`{keys}`" if keys else ""
+
+
 class Emph(Element):
     """Element for LaTeX \\emph command.
 
@@ -601,7 +654,7 @@ def get_theoremSearchers(input: str) -> list:
                 display_name,post = split_on_first_brace(post)
                 need_fix.append((theorem_env_name,shared_parent,display_name))
             else:
-                print("theoremenv error in ",theorem_env_name)
+                logger.warning("could not parse \\newtheorem for %s", theorem_env_name)
         input = post
         
     for theorem_env_name,shared_parent,display_name in need_fix:
@@ -609,7 +662,7 @@ def get_theoremSearchers(input: str) -> list:
     
     out = []
     for elem in pending_envs:
-        print(elem)
+        logger.debug("theorem environment %s", elem)
         out.append(TheoremSearcher(*elem))
     return out
 
@@ -645,6 +698,17 @@ _ALL_TIKZ_LIBS: list = [
     "quotes",
 ]
 
+# (code, libraries, inline) of every TikZ picture rendered while this is a
+# list, in document order, for pytexmd.tikz_prerender; None while pictures
+# are not collected.
+TIKZ_PICTURES: Optional[list] = None
+
+
+def _record_tikz(code: str, libs: str, inline: bool) -> None:
+    if TIKZ_PICTURES is not None:
+        TIKZ_PICTURES.append((code, libs, inline))
+
+
 class TikzElement(Element):
     """Element for LaTeX tikzpicture environment.
 
@@ -663,10 +727,15 @@ class TikzElement(Element):
         self._libs = libs
         self._label = label
 
+    def tikz_source(self) -> Tuple[str, str]:
+        """Return the picture source and ``:libs:`` option as sphinxcontrib-tikz receives them."""
+        return self._tikz_content.strip(), ", ".join(self._libs)
+
     def to_string(self) -> str:
         # Emit a MyST target label above the directive when a label is set.
         # sphinxcontrib-tikz does not support the :name: option, so we use
         # the standard MyST (label)= syntax instead.
+        _record_tikz(*self.tikz_source(), False)
         out = ""
         if self._label:
             out += "\n(" + self._label + ")="
@@ -754,10 +823,216 @@ class InlineTikz(Element):
         out = ""
         for child in self.children:
             out += child.to_string()
+        _record_tikz(out.strip(), "", True)
         # Emit as an inline tikz role
         return "{tikz}`" + out.strip() + "`"
 
 
+# Graphics files referenced by \includegraphics during the current conversion,
+# in first-use order, for pytexmd.image_assets to copy or convert.
+IMAGE_REFERENCES: list = []
+
+_GRAPHICS_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".tiff", ".svg", ".pdf", ".eps")
+_RELATIVE_WIDTHS = ("\\textwidth", "\\linewidth", "\\columnwidth")
+_LENGTH_PATTERN = re.compile(r"^\d*\.?\d+(cm|mm|in|pt|pc|px|em|ex)$")
+
+
+def image_asset_name(reference: str) -> str:
+    """Return where an ``\\includegraphics`` file goes, relative to the Sphinx source folder.
+
+    The extension is left off: the directive uses ``.*`` so Sphinx picks the
+    converted file (e.g. SVG for a PDF figure).
+
+    Example:
+        >>> image_asset_name("./figs/../plot.pdf")
+        'images/figs/_/plot'
+    """
+    parts = [
+        "_" if part == ".." else part
+        for part in reference.strip().replace("\\", "/").split("/")
+        if part not in ("", ".")
+    ]
+    name = "/".join(parts) or "image"
+    root, extension = posixpath.splitext(name)
+    if extension.lower() in _GRAPHICS_EXTENSIONS:
+        name = root
+    return "images/" + name
+
+
+def _graphics_options(options: str) -> List[str]:
+    """Translate ``\\includegraphics`` key=value options to MyST image options."""
+    out = []
+    for option in options.split(","):
+        key, _, value = option.partition("=")
+        key, value = key.strip(), value.replace(" ", "")
+        if key in ("width", "height"):
+            for relative in _RELATIVE_WIDTHS:
+                if key == "width" and value.endswith(relative):
+                    factor = value[: -len(relative)] or "1"
+                    try:
+                        out.append(f":width: {round(float(factor) * 100)}%")
+                    except ValueError:
+                        pass
+                    break
+            else:
+                if _LENGTH_PATTERN.match(value):
+                    out.append(f":{key}: {value}")
+        elif key == "scale":
+            try:
+                out.append(f":scale: {round(float(value) * 100)}")
+            except ValueError:
+                pass
+    return out
+
+
+def _split_includegraphics(input: str) -> Tuple[str, str, str, str]:
+    """Split off the first ``\\includegraphics[options]{file}`` as (pre, options, file, post)."""
+    pre, post = split_on_next(input, "\\includegraphics")
+    post = post.lstrip()
+    if post.startswith("*"):
+        post = post[1:].lstrip()
+    options = ""
+    if post.startswith("["):
+        options, post = split_on_first_brace(post, "[", "]")
+    reference, post = split_on_first_brace(post)
+    return pre, options, reference.strip(), post
+
+
+class IncludeGraphics(Element):
+    """Element for the LaTeX ``\\includegraphics`` command.
+
+    Converts to a MyST ``{image}`` directive pointing at the copied or
+    converted file under ``images/`` and records the file in
+    ``IMAGE_REFERENCES``.
+
+    Example:
+        >>> image = IncludeGraphics(None, "plot.pdf", "width=0.5\\\\textwidth")
+        >>> image.to_string().splitlines()[1:3]
+        ['```{image} images/plot.*', ':width: 50%']
+    """
+
+    def __init__(self, parent: Element, reference: str, options: str = ""):
+        super().__init__("", parent)
+        self.reference = reference
+        self._options = _graphics_options(options)
+        if reference and reference not in IMAGE_REFERENCES:
+            IMAGE_REFERENCES.append(reference)
+
+    @property
+    def uri(self) -> str:
+        return image_asset_name(self.reference) + ".*"
+
+    @staticmethod
+    def position(input: str) -> int:
+        return position_of(input, "\\includegraphics")
+
+    @staticmethod
+    def split_and_create(input: str, parent: Element) -> Tuple[str, Element, str]:
+        pre, options, reference, post = _split_includegraphics(input)
+        return pre, IncludeGraphics(parent, reference, options), post
+
+    def to_string(self) -> str:
+        lines = ["```{image} " + self.uri] + self._options + ["```"]
+        return "\n" + "\n".join(lines) + "\n"
+
+
+class Figure(Element):
+    """Element for LaTeX ``figure`` and ``figure*`` environments.
+
+    A figure holding ``\\includegraphics`` becomes a MyST ``{figure}``
+    directive whose caption is the element's (further expanded) content;
+    any other text of the body follows the figure. Figures without graphics,
+    e.g. around a ``tikzpicture``, keep their body with the caption as a
+    following paragraph. Figures are split off in their own expand phase,
+    before inline math.
+
+    Example:
+        >>> figure = Figure("A caption", None, [IncludeGraphics(None, "plot.png")], "")
+        >>> figure.to_string().splitlines()[1]
+        '```{figure} images/plot.*'
+    """
+
+    def __init__(self, modifiable_content: str, parent: Element, graphics: List[IncludeGraphics], label: str):
+        super().__init__(modifiable_content, parent)
+        self._graphics = graphics
+        self._label = label
+
+    @staticmethod
+    def _environment(input: str) -> Tuple[int, str]:
+        found = [
+            (position, name)
+            for name in ("figure", "figure*")
+            for position in [position_of(input, "\\begin{" + name + "}")]
+            if position != -1
+        ]
+        return min(found) if found else (-1, "")
+
+    @staticmethod
+    def position(input: str) -> int:
+        return Figure._environment(input)[0]
+
+    @staticmethod
+    def split_and_create(input: str, parent: Element) -> Tuple[str, Element, str]:
+        _, name = Figure._environment(input)
+        pre, body, post = begin_end_split(input, "\\begin{" + name + "}", "\\end{" + name + "}")
+        body = body.strip()
+        if body.startswith("["):
+            _, body = split_on_first_brace(body, "[", "]")
+
+        caption = ""
+        if "\\caption" in body:
+            before, after = split_on_next(body, "\\caption")
+            after = after.lstrip()
+            if after.startswith("["):
+                _, after = split_on_first_brace(after, "[", "]")
+            caption, after = split_on_first_brace(after)
+            body = before + after
+        raw_label = ""
+        if "\\label" in body:
+            before, after = split_on_next(body, "\\label")
+            raw_label, after = split_on_first_brace(after)
+            body = before + after
+        elif "\\label" in caption:
+            before, after = split_on_next(caption, "\\label")
+            raw_label, after = split_on_first_brace(after)
+            caption = before + after
+        body = body.replace("\\centering", "")
+
+        graphics = []
+        rest = []
+        while position_of(body, "\\includegraphics") != -1:
+            before, options, reference, body = _split_includegraphics(body)
+            rest.append(before)
+            graphics.append(IncludeGraphics(None, reference, options))
+        if not graphics:
+            body = body.strip()
+            if caption.strip():
+                body += "\n\n" + caption.strip() + "\n"
+            return pre, Undefined(body, parent), post
+
+        label = label_call(raw_label.strip(), LabelType.REF) if raw_label.strip() else ""
+        figure = Figure(caption.strip(), parent, graphics, label)
+        for image in graphics:
+            image.parent = figure
+        rest = "".join(rest + [body]).strip()
+        if rest:
+            post = "\n\n" + rest + "\n\n" + post
+        return pre, figure, post
+
+    def to_string(self) -> str:
+        caption = "".join(child.to_string() for child in self.children or []).strip()
+        # Several graphics in one figure: all but the last become plain images.
+        out = "".join(image.to_string() for image in self._graphics[:-1])
+        lines = ["```{figure} " + self._graphics[-1].uri]
+        if self._label:
+            lines.append(":name: " + self._label)
+        lines += self._graphics[-1]._options
+        if caption:
+            lines += ["", caption]
+        lines.append("```")
+        return out + "\n" + "\n".join(lines) + "\n"
+
+
 def get_all_filters() -> list:
     """Returns all section-related filter classes/searchers.
 
@@ -769,4 +1044,4 @@ def get_all_filters() -> list:
         >>> isinstance(filters, list)
         True
     """
-    return [TikzSearcher(), Emph, Textbf, Textit, Ref, EqRef, Cite]
+    return [TikzSearcher(), IncludeGraphics, Emph, Textbf, Textit, Ref, EqRef, NoCite, Cite]
@@ -0,0 +1,177 @@
+"""Copy and convert the graphics referenced by ``\\includegraphics`` into the Sphinx source.
+
+Every file recorded in ``text.IMAGE_REFERENCES`` during a conversion is
+resolved through the project's :class:`~pytexmd.file_loader.ProjectIndex` and
+written to ``source/images`` under the name the ``{figure}``/``{image}``
+directives point at (see :func:`pytexmd.filter.text.image_asset_name`).
+
+Browser-ready formats are copied. PDF and EPS figures are converted with the
+first available local tool (``pdf2svg``, ``pdftocairo``, ``pdftoppm`` or
+Ghostscript) in a thread pool, since the work happens in external processes.
+Converted files are kept in the shared render cache under a hash of the source
+bytes and the converter, so an unchanged figure is never converted twice, and
+an image already in place with the same bytes is not rewritten.
+"""
+
+__all__ = ["WEB_IMAGE_EXTENSIONS", "ImageAssetFailure", "convert_image", "prepare_image_assets"]
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from .file_writer import copy_if_changed
+from .filter.text import image_asset_name
+from .render_cache import RenderCache
+
+logger = logging.getLogger(__name__)
+
+WEB_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg")
+# Raster resolution for converters that produce PNG.
+_RESOLUTION = 150
+
+
+def _ghostscript() -> Optional[str]:
+    for name in ("gs", "gswin64c", "gswin32c", "ghostscript"):
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+def _pdf2svg(source: str, target: str) -> List[str]:
+    return [shutil.which("pdf2svg"), source, target]
+
+
+def _pdftocairo(source: str, target: str) -> List[str]:
+    return [shutil.which("pdftocairo"), "-svg", "-f", "1", "-l", "1", source, target]
+
+
+def _pdftoppm(source: str, target: str) -> List[str]:
+    # pdftoppm appends the extension to the output prefix itself.
+    return [shutil.which("pdftoppm"), "-png", "-singlefile", "-r", str(_RESOLUTION), source, target[: -len(".png")]]
+
+
+def _ghostscript_png(source: str, target: str) -> List[str]:
+    return [
+        _ghostscript(), "-dBATCH", "-dNOPAUSE", "-dSAFER", "-dEPSCrop", "-dFirstPage=1", "-dLastPage=1",
+        "-sDEVICE=pngalpha", f"-r{_RESOLUTION}", f"-sOutputFile={target}", source,
+    ]
+
+
+# (name, source extensions, target suffix, availability check, command builder), in order of preference.
+_CONVERTERS: List[Tuple[str, Tuple[str, ...], str, Callable[[], Optional[str]], Callable[[str, str], List[str]]]] = [
+    ("pdf2svg", (".pdf",), ".svg", lambda: shutil.which("pdf2svg"), _pdf2svg),
+    ("pdftocairo", (".pdf",), ".svg", lambda: shutil.which("pdftocairo"), _pdftocairo),
+    ("pdftoppm", (".pdf",), ".png", lambda: shutil.which("pdftoppm"), _pdftoppm),
+    ("ghostscript", (".pdf", ".eps"), ".png", _ghostscript, _ghostscript_png),
+]
+
+
+class ImageAssetFailure(NamedTuple):
+    """A referenced image that could not be placed in the Sphinx source."""
+
+    reference: str
+    message: str
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def convert_image(source: str, target_stem: str, cache: RenderCache) -> str:
+    """Place ``source`` at ``target_stem`` plus a browser-ready extension.
+
+    Args:
+        source: Resolved image file.
+        target_stem: Destination path without extension.
+        cache: Cache holding converted files.
+
+    Returns:
+        str: The written file.
+
+    Raises:
+        RuntimeError: If no converter is available or the conversion fails.
+        OSError: If the files cannot be read or written.
+    """
+    extension = os.path.splitext(source)[1].lower()
+    Path(target_stem).parent.mkdir(parents=True, exist_ok=True)
+    if extension in WEB_IMAGE_EXTENSIONS or extension not in (".pdf", ".eps"):
+        target = target_stem + extension
+        copy_if_changed(source, target)
+        return target
+    for name, extensions, suffix, available, command in _CONVERTERS:
+        if extension in extensions and available():
+            break
+    else:
+        raise RuntimeError(f"no converter for {extension} files (install pdf2svg, poppler-utils or Ghostscript)")
+    target = target_stem + suffix
+    key = hashlib.sha256(f"{_file_digest(source)}:{name}:{_RESOLUTION}".encode("utf-8")).hexdigest()
+    cached = cache.get(key, suffix)
+    if cached is not None:
+        copy_if_changed(cached, target)
+        return target
+    with tempfile.TemporaryDirectory() as work:
+        converted = os.path.join(work, "converted" + suffix)
+        result = subprocess.run(command(source, converted), capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.isfile(converted):
+            details = (result.stderr or result.stdout).strip().splitlines()
+            raise RuntimeError(f"{name} exited with code {result.returncode}" + (f": {details[-1]}" if details else ""))
+        cache.put(key, suffix, converted)
+        copy_if_changed(converted, target)
+    return target
+
+
+def prepare_image_assets(
+    references: List[str],
+    index,
+    source_folder: str | Path,
+    jobs: int | str = "auto",
+    cache: Optional[RenderCache] = None,
+) -> List[ImageAssetFailure]:
+    """Copy or convert every referenced image into ``source_folder``.
+
+    Args:
+        references: ``\\includegraphics`` arguments (``text.IMAGE_REFERENCES``).
+        index (ProjectIndex): Index of the LaTeX project the references belong to.
+        source_folder: Sphinx source folder.
+        jobs (int | str, optional): Conversion threads, ``"auto"`` or N. Defaults to ``"auto"``.
+        cache (RenderCache, optional): Cache for converted files; defaults to the user ``images`` cache.
+
+    Returns:
+        List[ImageAssetFailure]: The references that could not be placed, in order.
+    """
+    if not references:
+        return []
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .sphinx_doc import resolve_jobs
+
+    cache = cache if cache is not None else RenderCache("images")
+
+    def place(reference: str) -> Optional[ImageAssetFailure]:
+        try:
+            source = index.resolve_image(reference)
+        except FileNotFoundError:
+            return ImageAssetFailure(reference, "file not found")
+        target_stem = os.path.join(str(source_folder), *image_asset_name(reference).split("/"))
+        try:
+            convert_image(source, target_stem, cache)
+        except (OSError, RuntimeError) as exc:
+            return ImageAssetFailure(reference, str(exc))
+        return None
+
+    with ThreadPoolExecutor(max_workers=min(resolve_jobs(jobs), len(references))) as pool:
+        failures = [failure for failure in pool.map(place, references) if failure is not None]
+    logger.info("Images placed: %d of %d", len(references) - len(failures), len(references))
+    for failure in failures:
+        logger.warning("image %s was not placed: %s", failure.reference, failure.message)
+    return failures
@@ -0,0 +1,139 @@
+"""Conversion jobs shared by the ``pytexmd serve`` daemon and ``pytexmd batch``.
+
+A job names a main LaTeX file, an output folder and the keyword options of
+:func:`pytexmd.core.process_file`. HTML jobs also build the Sphinx site.
+:func:`run_job` never raises: it returns a plain, JSON-serializable result
+with the job's status, captured output and stage timings.
+"""
+
+__all__ = ["JOB_OPTIONS", "ConversionJob", "parse_job", "run_job"]
+
+import contextlib
+import io
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+# Accepted options and their types. "jobs" and "optimize_assets" only apply to HTML jobs.
+JOB_OPTIONS = {
+    "depth": int,
+    "output_suffix": str,
+    "project_name": str,
+    "author": str,
+    "version": str,
+    "mathjax_macros": dict,
+    "prune_bibliography": bool,
+    "prerender_tikz": bool,
+    "time_budget": (int, float),
+    "step_budget": int,
+    "jobs": (int, str),
+    "optimize_assets": bool,
+}
+_BUILD_OPTIONS = ("jobs", "optimize_assets")
+
+
+class ConversionJob(NamedTuple):
+    """One project to convert, and optionally to build to HTML."""
+
+    input_file: str
+    output_folder: str
+    html: bool = False
+    options: Optional[Dict[str, Any]] = None
+
+
+def parse_job(data: Dict[str, Any]) -> ConversionJob:
+    """Validate a job description such as ``{"input_file": ..., "output_folder": ..., "html": true}``.
+
+    Options may be given under ``"options"`` or at the top level.
+
+    Raises:
+        ValueError: If a field is missing, unknown or of the wrong type.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("a job must be a JSON object")
+    data = dict(data)
+    options = dict(data.pop("options", None) or {})
+    paths = {}
+    for field in ("input_file", "output_folder"):
+        value = data.pop(field, None)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{field} must be a non-empty string")
+        paths[field] = value
+    html = data.pop("html", False)
+    if not isinstance(html, bool):
+        raise ValueError("html must be true or false")
+    options.update(data)
+    for name, value in options.items():
+        if name not in JOB_OPTIONS:
+            raise ValueError(f"unknown option {name!r}")
+        expected = JOB_OPTIONS[name]
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ValueError(f"option {name!r} has the wrong type")
+    if "jobs" in options:
+        from .sphinx_doc import resolve_jobs
+
+        resolve_jobs(options["jobs"])
+    return ConversionJob(paths["input_file"], paths["output_folder"], html, options)
+
+
+def run_job(job: ConversionJob, builders: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Convert one project and optionally build it, capturing its output.
+
+    Args:
+        job: The job to run.
+        builders (dict, optional): Warm :class:`~pytexmd.sphinx_doc.SphinxBuilder`
+            objects by output folder. HTML jobs reuse and add to it; without it
+            every build is a cold :func:`~pytexmd.sphinx_doc.make_html` run.
+
+    Returns:
+        dict: ``status`` (``"ok"`` or ``"error"``), ``error``, ``html_index``,
+        ``timings`` in seconds (``convert``, ``build``, ``total``) and ``log``.
+    """
+    from .core import process_file
+    from .sphinx_doc import SphinxBuilder, make_html, resolve_jobs
+
+    options = dict(job.options or {})
+    build_options = {name: options.pop(name) for name in _BUILD_OPTIONS if name in options}
+    input_path = Path(job.input_file).expanduser().resolve()
+    output_path = Path(job.output_folder).expanduser().resolve()
+    result: Dict[str, Any] = {
+        "input_file": str(input_path),
+        "output_folder": str(output_path),
+        "status": "ok",
+        "error": None,
+        "html_index": None,
+        "timings": {},
+    }
+    log = io.StringIO()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            if not input_path.is_file():
+                raise FileNotFoundError(f"LaTeX input file not found: {input_path}")
+            process_file(str(input_path), str(output_path), **options)
+            converted = time.perf_counter()
+            result["timings"]["convert"] = converted - started
+            if job.html:
+                jobs = build_options.get("jobs", 1)
+                if builders is None:
+                    html_directory = make_html(str(output_path), raise_on_error=True, jobs=jobs)
+                else:
+                    builder = builders.get(str(output_path))
+                    if builder is None or builder.jobs != resolve_jobs(jobs):
+                        builder = builders[str(output_path)] = SphinxBuilder(output_path, jobs)
+                    html_directory = builder.build(raise_on_error=True)
+                if build_options.get("optimize_assets"):
+                    from .static_assets import optimize_html_output
+
+                    optimize_html_output(html_directory)
+                index_path = html_directory / "index.html"
+                if not index_path.is_file():
+                    raise RuntimeError(f"Sphinx did not generate {index_path}")
+                result["html_index"] = str(index_path)
+                result["timings"]["build"] = time.perf_counter() - converted
+    except Exception as exc:
+        result["status"] = "error"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["timings"]["total"] = time.perf_counter() - started
+    result["log"] = log.getvalue()
+    return result
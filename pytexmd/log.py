@@ -0,0 +1,123 @@
+"""Logging setup shared by the pytexmd modules and command-line tools.
+
+Every module logs to a child of the ``pytexmd`` logger. As a library,
+pytexmd only attaches a :class:`logging.NullHandler`, so the records reach
+the application's own logging configuration and nothing is printed without
+one. The command-line tools, the batch runner, the daemon and the GUI call
+:func:`configure_logging`, which writes the messages of level INFO and above
+to whatever ``sys.stdout`` is at that moment, so ``contextlib.redirect_stdout``
+still captures them. Warnings and errors are prefixed with ``Warning:`` and
+``Error:``. Per-file details and hot-path probes are DEBUG messages.
+
+Long loops report through :func:`progress`, which emits at most one message
+per interval however often it is called.
+
+Example:
+    configure_logging()                # INFO and above on standard output
+    configure_logging(quiet=True)      # warnings and errors only
+    configure_logging(verbose=True)    # everything, including per-file details
+    configure_logging(handler=None)    # back to the library default: records go to the root logger
+    configure_logging(handler=stderr_handler())  # keep standard output for data
+"""
+
+__all__ = ["configure_logging", "add_logging_arguments", "progress", "stderr_handler", "LOGGER_NAME", "PROGRESS_INTERVAL"]
+
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+LOGGER_NAME = "pytexmd"
+# Least number of seconds between two progress messages of the same kind.
+PROGRESS_INTERVAL = 1.0
+
+_PREFIXES = {logging.WARNING: "Warning: ", logging.ERROR: "Error: ", logging.CRITICAL: "Error: "}
+_last_progress: Dict[str, float] = {}
+
+
+class _Formatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        prefix = _PREFIXES.get(record.levelno, "")
+        return prefix + message if prefix and not message.startswith(prefix) else message
+
+
+class _CurrentStdoutHandler(logging.Handler):
+    """Write each record to ``sys.stdout`` (or another ``sys`` stream) as it is at write time."""
+
+    def __init__(self, stream_name: str = "stdout"):
+        super().__init__()
+        self.stream_name = stream_name
+        self.setFormatter(_Formatter("%(message)s"))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            getattr(sys, self.stream_name).write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+_DEFAULT_HANDLER = _CurrentStdoutHandler()
+_NULL_HANDLER = logging.NullHandler()
+_logger = logging.getLogger(LOGGER_NAME)
+_logger.addHandler(_NULL_HANDLER)
+
+_UNSET = object()
+# Whether configure_logging has chosen the destination of the records yet.
+_configured = False
+
+
+def configure_logging(
+    level: Optional[int | str] = None,
+    quiet: bool = False,
+    verbose: bool = False,
+    handler=_UNSET,
+) -> None:
+    """Set the level and destination of pytexmd's messages.
+
+    The first call without ``handler`` installs the standard-output handler;
+    later calls only change the level.
+
+    Args:
+        level (int | str, optional): Logging level such as ``"DEBUG"`` or ``logging.WARNING``.
+        quiet (bool, optional): Only report warnings and errors.
+        verbose (bool, optional): Also report DEBUG details.
+        handler (logging.Handler, optional): Write the records to this handler instead;
+            ``None`` passes them on to the root logger, as before any configuration.
+    """
+    global _configured
+    if level is None:
+        level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
+    if handler is _UNSET and not _configured:
+        handler = _DEFAULT_HANDLER
+    _logger.setLevel(level)
+    if handler is not _UNSET:
+        for existing in list(_logger.handlers):
+            _logger.removeHandler(existing)
+        _logger.addHandler(_NULL_HANDLER if handler is None else handler)
+        _logger.propagate = handler is None
+        _configured = True
+
+
+def stderr_handler() -> logging.Handler:
+    """A handler like the default one that writes to ``sys.stderr`` instead."""
+    return _CurrentStdoutHandler("stderr")
+
+
+def add_logging_arguments(parser) -> None:
+    """Add ``--quiet`` and ``--verbose`` to an :class:`argparse.ArgumentParser`.
+
+    Pass the parsed flags on with ``configure_logging(quiet=args.quiet, verbose=args.verbose)``.
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-q", "--quiet", action="store_true", help="Only report warnings and errors")
+    group.add_argument("-v", "--verbose", action="store_true", help="Also report per-file details and debug messages")
+
+
+def progress(key: str, message: str, *args, logger: Optional[logging.Logger] = None) -> None:
+    """Log an INFO progress message unless one with the same key was logged in the last interval."""
+    now = time.monotonic()
+    if now - _last_progress.get(key, float("-inf")) < PROGRESS_INTERVAL:
+        return
+    _last_progress[key] = now
+    (logger or _logger).info(message, *args)
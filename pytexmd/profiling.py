@@ -0,0 +1,199 @@
+"""Stage timing and memory profile of a conversion (``--profile``).
+
+The conversion marks its stages with :func:`stage`. While a :class:`Profiler`
+is active (see :func:`profiled`), each stage records wall time, CPU time,
+peak traced memory (:mod:`tracemalloc`) and the resident set size of the
+process when the stage ends. Otherwise :func:`stage` costs one
+global lookup. Stages nest, and a parent's figures include its children.
+The report also holds the per-searcher counters of the expand engine
+(:mod:`pytexmd.filter.counters`) under ``"searchers"``.
+
+Example:
+    with profiled("profile.json"):
+        process_file("main.tex", "site")
+"""
+
+__all__ = ["Profiler", "profiled", "stage", "active_profiler", "resident_memory", "peak_resident_memory"]
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE: Optional["Profiler"] = None
+
+
+def resident_memory() -> Optional[int]:
+    """Current resident set size of the process in bytes, or None where unknown."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return peak_resident_memory()
+
+
+def peak_resident_memory() -> Optional[int]:
+    """Largest resident set size of the process so far in bytes, or None where unknown."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Frame:
+    __slots__ = ("record", "wall", "cpu", "peak")
+
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.peak = 0
+
+
+class Profiler:
+    """Collect the stages of one conversion.
+
+    Args:
+        memory (bool, optional): Trace allocations for peak memory figures.
+            Tracing slows Python code down noticeably. Defaults to True.
+    """
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.stages: List[Dict[str, Any]] = []
+        self.sections: Dict[str, Any] = {}
+        self._stack: List[_Frame] = []
+        self._started_tracing = False
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self.total: Dict[str, Any] = {}
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if self.memory:
+            tracemalloc.reset_peak()
+
+    def stop(self) -> None:
+        self.total = {
+            "wall": time.perf_counter() - self._start_wall,
+            "cpu": time.process_time() - self._start_cpu,
+            "peak_bytes": max((record["peak_bytes"] or 0 for record in self.stages), default=0)
+            if self.memory else None,
+            "rss_bytes": resident_memory(),
+        }
+        observed = [record["rss_bytes"] for record in self.stages + [self.total] if record["rss_bytes"] is not None]
+        self.total["max_rss_bytes"] = max(observed + [peak_resident_memory() or 0]) if observed else None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _traced_peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] if self.memory and tracemalloc.is_tracing() else 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the block as a stage named ``name``."""
+        record = {
+            "stage": name, "depth": len(self._stack), "wall": 0.0, "cpu": 0.0, "peak_bytes": None, "rss_bytes": None,
+        }
+        self.stages.append(record)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, self._traced_peak())
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        frame = _Frame(record)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            record["wall"] = time.perf_counter() - frame.wall
+            record["cpu"] = time.process_time() - frame.cpu
+            record["rss_bytes"] = resident_memory()
+            if self.memory:
+                record["peak_bytes"] = max(frame.peak, self._traced_peak())
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent.peak = max(parent.peak, record["peak_bytes"])
+
+    def report(self) -> Dict[str, Any]:
+        """The profile as a JSON-serializable dictionary."""
+        return {"stages": self.stages, "total": self.total, **self.sections}
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def format_table(self) -> str:
+        """The stages as an aligned text table."""
+        def mebibytes(value: Optional[int]) -> str:
+            return f"{value / 1048576:.2f}" if value is not None else "-"
+
+        rows = [("Stage", "Wall s", "CPU s", "Peak MiB", "RSS MiB")]
+        for record in self.stages + [dict(self.total, stage="total", depth=0)]:
+            rows.append((
+                "  " * record["depth"] + record["stage"],
+                f"{record['wall']:.3f}",
+                f"{record['cpu']:.3f}",
+                mebibytes(record.get("peak_bytes")),
+                mebibytes(record.get("rss_bytes")),
+            ))
+        width = max(len(row[0]) for row in rows)
+        return "\n".join(f"{row[0]:<{width}}" + "".join(f"  {cell:>8}" for cell in row[1:]) for row in rows)
+
+
+def active_profiler() -> Optional[Profiler]:
+    """The profiler recording the current conversion, if any."""
+    return _ACTIVE
+
+
+def stage(name: str):
+    """Context manager recording ``name`` on the active profiler, or doing nothing."""
+    return _ACTIVE.stage(name) if _ACTIVE is not None else nullcontext()
+
+
+@contextmanager
+def profiled(report_path: str | Path | None = None, memory: bool = True) -> Iterator[Profiler]:
+    """Profile the block; then print the table and write the JSON report to ``report_path``.
+
+    Nested use records into the outer profiler, which writes the report.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        yield _ACTIVE
+        return
+    from .filter.counters import count_searchers
+
+    profiler = Profiler(memory)
+    _ACTIVE = profiler
+    profiler.start()
+    try:
+        with count_searchers() as searchers:
+            yield profiler
+    finally:
+        _ACTIVE = None
+        profiler.stop()
+    profiler.sections["searchers"] = searchers.report()
+    logger.info("%s", profiler.format_table())
+    logger.info("%s", searchers.format_table())
+    if report_path is not None:
+        profiler.write_json(report_path)
+        logger.info("Profile written to %s", report_path)
@@ -0,0 +1,242 @@
+"""Content-addressed cache for rendered images, shared across builds and projects.
+
+Rendering a TikZ picture runs a TeX engine and an image converter, which takes
+seconds per picture. :class:`RenderCache` stores each result under a hash of
+everything that influences it, in a user-level cache folder with a bounded
+size; the least recently used files are evicted first.
+
+The folder is ``$PYTEXMD_CACHE_DIR`` when set, else the platform's user cache
+folder (``~/.cache/pytexmd`` on Linux).
+"""
+
+__all__ = [
+    "RenderCache",
+    "user_cache_dir",
+    "tikz_cache_key",
+    "install_tikz_cache",
+    "DEFAULT_MAX_BYTES",
+]
+
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def user_cache_dir() -> Path:
+    """Return the user-level pytexmd cache folder for this platform."""
+    override = os.environ.get("PYTEXMD_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "pytexmd" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "pytexmd"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pytexmd"
+
+
+class RenderCache:
+    """Size-bounded, content-addressed file cache with LRU eviction.
+
+    Entries are files named after their key. Reading an entry refreshes its
+    modification time, which is the recency used for eviction.
+
+    Args:
+        namespace (str): Subfolder of the user cache folder, e.g. ``"tikz"``.
+        directory (str | Path, optional): Explicit cache folder instead of the user one.
+        max_bytes (int, optional): Total size above which old entries are evicted.
+    """
+
+    def __init__(self, namespace: str, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.namespace = namespace
+        self._directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._size_directory: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        """The cache folder; without an explicit one, the user folder is looked up on every access."""
+        return self._directory if self._directory is not None else user_cache_dir() / self.namespace
+
+    def path(self, key: str, suffix: str) -> Path:
+        """Location of the entry for ``key``."""
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Optional[Path]:
+        """Return the cached file for ``key`` and mark it as recently used, or None."""
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, key: str, suffix: str, destination: str | Path) -> bool:
+        """Copy the entry for ``key`` to ``destination``; False when it is not cached."""
+        path = self.get(key, suffix)
+        if path is None:
+            return False
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(path, destination)
+        except OSError:
+            return False
+        return True
+
+    def put(self, key: str, suffix: str, source: str | Path) -> Path:
+        """Store a copy of ``source`` as the entry for ``key`` and evict if over budget."""
+        path = self.path(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as target, open(source, "rb") as origin:
+                shutil.copyfileobj(origin, target)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            if self._size is None or self._size_directory != self.directory:
+                self._size = self._total_size()
+                self._size_directory = self.directory
+            else:
+                self._size += path.stat().st_size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.prune()
+        return path
+
+    def _entries(self) -> list:
+        entries = []
+        for folder in self.directory.glob("*"):
+            for path in folder.glob("*"):
+                if path.name.startswith("."):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def _total_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used entries until the cache fits ``max_bytes``.
+
+        Returns:
+            int: Number of bytes removed.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += size
+            self._size = total
+            self._size_directory = self.directory
+        return removed
+
+
+def tikz_cache_key(
+    code: str,
+    libraries: str,
+    preamble: str,
+    proc_suite: str,
+    resolution: int | str,
+    transparent: bool,
+    latex_engine: str,
+) -> str:
+    """Hash every input that changes a rendered TikZ picture.
+
+    Args:
+        code: Picture source after sphinxcontrib-tikz's cleanup.
+        libraries: Comma-separated ``\\usetikzlibrary`` list.
+        preamble: LaTeX preamble used for the picture.
+        proc_suite: Converter suite (``pdf2svg``, ``GhostScript``, ...).
+        resolution: Raster resolution in DPI.
+        transparent: Whether the background is made transparent.
+        latex_engine: TeX engine used to compile the picture.
+    """
+    fields = [code, libraries, preamble, proc_suite, str(resolution), bool(transparent), latex_engine]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
+
+
+def install_tikz_cache(tikz_module: ModuleType, cache: Optional[RenderCache] = None) -> RenderCache:
+    """Serve ``sphinxcontrib.tikz`` renders from a :class:`RenderCache`.
+
+    Replaces ``tikz_module.render_tikz`` with a wrapper that copies a cached
+    image into the build instead of running LaTeX, and stores every newly
+    rendered image. Installing again replaces the previous wrapper.
+
+    Args:
+        tikz_module: The imported ``sphinxcontrib.tikz`` module.
+        cache (RenderCache, optional): Cache to use; defaults to the user ``tikz`` cache.
+
+    Returns:
+        RenderCache: The cache serving the renders.
+    """
+    cache = cache if cache is not None else RenderCache("tikz")
+    if not hasattr(tikz_module, "_pytexmd_original_render_tikz"):
+        tikz_module._pytexmd_original_render_tikz = tikz_module.render_tikz
+    render_tikz = tikz_module._pytexmd_original_render_tikz
+
+    def cached_render_tikz(translator, node, libs="", stringsubst=False):
+        builder = translator.builder
+        config = builder.config
+        extension = tikz_module.OUT_EXTENSION.get(config.tikz_proc_suite)
+        if extension is None:
+            return render_tikz(translator, node, libs, stringsubst)
+        code = tikz_module.cleanup_tikzcode(translator, node)
+        preamble = getattr(builder, "_tikz_preamble", "") + (
+            config.tikz_latex_preamble or config.latex_elements.get("preamble", "")
+        )
+        key = tikz_cache_key(
+            code,
+            libs,
+            preamble,
+            config.tikz_proc_suite,
+            config.tikz_resolution,
+            config.tikz_transparent,
+            config.latex_engine,
+        )
+        suffix = "." + extension
+        # sphinxcontrib-tikz names its output after the SHA-1 of the picture source.
+        filename = "tikz-%s%s" % (hashlib.sha1(code.encode("utf-8")).hexdigest(), suffix)
+        output_path = os.path.join(builder.outdir, "_images", filename)
+        if not os.path.isfile(output_path) and cache.fetch(key, suffix, output_path):
+            return posixpath.join(builder.imgpath, filename)
+        result = render_tikz(translator, node, libs, stringsubst)
+        if result is not None and os.path.isfile(output_path) and cache.get(key, suffix) is None:
+            try:
+                cache.put(key, suffix, output_path)
+            except OSError:
+                pass
+        return result
+
+    tikz_module.render_tikz = cached_render_tikz
+    return cache
@@ -0,0 +1,327 @@
+"""Long-running conversion daemon (``pytexmd serve``).
+
+The daemon accepts conversion jobs over HTTP on localhost or on a Unix
+socket and runs them in a bounded pool of worker processes. Workers live as
+long as the daemon, so imports, templates, project indexes and the Sphinx
+applications of the output folders they built last stay warm between jobs.
+Jobs for the same output folder never run at the same time.
+
+Endpoints:
+
+* ``POST /jobs`` with a job object (see :func:`pytexmd.jobs.parse_job`) runs the
+  job and answers with its result from :func:`pytexmd.jobs.run_job`, plus the
+  time it waited for a worker (``timings.queued``).
+* ``GET /status`` reports the worker count and job counters.
+
+Web pages open in the user's browser can send requests to localhost too.
+Jobs must therefore be sent as ``application/json``, which browsers only
+send cross-origin after a CORS preflight the daemon never answers, and over
+TCP the ``Host`` header must name the listening address, which rules out
+DNS rebinding.
+
+Example:
+    $ pytexmd serve --port 8765
+    $ curl -H 'Content-Type: application/json' \\
+        -d '{"input_file": "main.tex", "output_folder": "site", "html": true}' \\
+        http://127.0.0.1:8765/jobs
+"""
+
+__all__ = ["ConversionServer", "submit_job", "serve_main"]
+
+import argparse
+import http.client
+import ipaddress
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from .jobs import parse_job, run_job
+from .log import LOGGER_NAME, add_logging_arguments, configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+# Largest accepted request body.
+_MAX_REQUEST_BYTES = 1 << 20
+
+# SphinxBuilder objects of a worker process, by output folder, least recently
+# used first; each holds a whole Sphinx application, so only a few are kept.
+_BUILDERS: "OrderedDict[str, Any]" = OrderedDict()
+_MAX_BUILDERS = 4
+
+
+def _warm_worker(log_level: int) -> None:
+    """Log at the daemon's level and import the conversion and build machinery once per worker process."""
+    configure_logging(log_level)
+    import sphinx.application  # noqa: F401
+
+    from . import core, static_assets  # noqa: F401
+
+
+def _worker_run(job) -> Dict[str, Any]:
+    result = run_job(job, _BUILDERS)
+    if result["output_folder"] in _BUILDERS:
+        _BUILDERS.move_to_end(result["output_folder"])
+    while len(_BUILDERS) > _MAX_BUILDERS:
+        _BUILDERS.popitem(last=False)
+    return result
+
+
+def _is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _host_allowed(host_header: Optional[str], names: set, port: int) -> bool:
+    """Return True if the ``Host`` header names the server: one of ``names`` at ``port``, or any
+    IP address at ``port`` when the server listens on all addresses."""
+    host = (host_header or "").strip().lower()
+    if host.endswith(f":{port}"):
+        host = host[: -len(str(port)) - 1]
+    elif port != 80:
+        return False
+    host = host.strip("[]")
+    if host in names:
+        return True
+    if not names & {"", "0.0.0.0"}:
+        return False
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "pytexmd"
+
+    def address_string(self) -> str:
+        # Unix socket clients have no host address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, code: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _host_ok(self) -> bool:
+        allowed = self.server.allowed_hosts
+        if allowed is None or _host_allowed(self.headers.get("Host"), *allowed):
+            return True
+        self._reply(403, {"status": "error", "error": "the Host header does not name this server"})
+        return False
+
+    def do_GET(self) -> None:
+        if not self._host_ok():
+            return
+        if self.path != "/status":
+            self._reply(404, {"status": "error", "error": f"unknown path {self.path}"})
+            return
+        self._reply(200, self.server.conversion.status())
+
+    def do_POST(self) -> None:
+        if not self._host_ok():
+            return
+        if self.path != "/jobs":
+            self._reply(404, {"status": "error", "error": f"unknown path {self.path}"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._reply(415, {"status": "error", "error": "jobs must be sent as application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            if not 0 < length <= _MAX_REQUEST_BYTES:
+                raise ValueError("the request needs a JSON body of at most 1 MiB")
+            job = parse_job(json.loads(self.rfile.read(length)))
+        except ValueError as exc:
+            self._reply(400, {"status": "error", "error": str(exc)})
+            return
+        self._reply(200, self.server.conversion.run(job))
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ConversionServer:
+    """Serve conversion jobs from a pool of warm worker processes.
+
+    Args:
+        workers (int | str, optional): Worker processes, ``"auto"`` or N. Defaults to ``"auto"``.
+        host (str, optional): Address to listen on when no socket is given.
+        port (int, optional): TCP port; 0 picks a free one.
+        socket_path (str, optional): Listen on this Unix socket instead of TCP. A socket
+            left at the path by an earlier daemon is replaced.
+
+    Raises:
+        FileExistsError: If ``socket_path`` exists and is not a socket.
+    """
+
+    def __init__(
+        self,
+        workers: int | str = "auto",
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        socket_path: Optional[str] = None,
+    ):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .sphinx_doc import resolve_jobs
+
+        self.workers = resolve_jobs(workers)
+        self.socket_path = socket_path
+        if socket_path is not None and os.path.lexists(socket_path):
+            if not _is_socket(socket_path):
+                raise FileExistsError(f"{socket_path} exists and is not a socket; not replacing it")
+            os.unlink(socket_path)
+        # Worker processes are started from request threads, where forking is unsafe.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            initargs=(logging.getLogger(LOGGER_NAME).level or logging.INFO,),
+        )
+        self._lock = threading.Lock()
+        self._folder_locks: Dict[str, threading.Lock] = {}
+        self._counters = {"running": 0, "completed": 0, "failed": 0}
+        if socket_path is not None:
+            self._http = _UnixHTTPServer(socket_path, _Handler)
+            self._http.allowed_hosts = None
+        else:
+            self._http = ThreadingHTTPServer((host, port), _Handler)
+            bound_host, bound_port = self._http.server_address[:2]
+            names = {host.lower(), bound_host}
+            if ipaddress.ip_address(bound_host).is_loopback:
+                names.add("localhost")
+            self._http.allowed_hosts = (names, bound_port)
+        self._http.conversion = self
+
+    @property
+    def address(self) -> str:
+        """``unix:<path>`` or ``http://host:port`` of the listening socket."""
+        if self.socket_path is not None:
+            return f"unix:{self.socket_path}"
+        host, port = self._http.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"status": "ok", "workers": self.workers, **self._counters}
+
+    def run(self, job) -> Dict[str, Any]:
+        """Run ``job`` on the pool once no other job uses its output folder."""
+        folder = os.path.realpath(os.path.expanduser(job.output_folder))
+        with self._lock:
+            folder_lock = self._folder_locks.setdefault(folder, threading.Lock())
+        submitted = time.perf_counter()
+        with folder_lock:
+            with self._lock:
+                self._counters["running"] += 1
+            try:
+                future = self._pool.submit(_worker_run, job)
+                started = time.perf_counter()
+                result = future.result()
+                result["timings"]["queued"] = started - submitted
+            except Exception as exc:
+                result = {"status": "error", "error": f"{type(exc).__name__}: {exc}", "timings": {}, "log": ""}
+            with self._lock:
+                self._counters["running"] -= 1
+                self._counters["completed" if result["status"] == "ok" else "failed"] += 1
+        return result
+
+    def serve_forever(self) -> None:
+        self._http.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving (from another thread)."""
+        self._http.shutdown()
+
+    def close(self) -> None:
+        """Release the socket and the worker processes."""
+        self._http.server_close()
+        self._pool.shutdown(cancel_futures=True)
+        if self.socket_path is not None and _is_socket(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def submit_job(job: Optional[Dict[str, Any]], address: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send a job to a running daemon and return its result.
+
+    Args:
+        job: Job object for ``POST /jobs``, or None to request ``GET /status``.
+        address: ``unix:<path>`` or ``http://host:port``, as in :attr:`ConversionServer.address`.
+        timeout (float, optional): Socket timeout in seconds.
+    """
+    if address.startswith("unix:"):
+        connection = _UnixHTTPConnection(address[len("unix:"):], timeout=timeout)
+    else:
+        host_port = address.split("://", 1)[-1].rstrip("/")
+        connection = http.client.HTTPConnection(host_port, timeout=timeout)
+    try:
+        if job is None:
+            connection.request("GET", "/status")
+        else:
+            body = json.dumps(job).encode("utf-8")
+            connection.request("POST", "/jobs", body, {"Content-Type": "application/json"})
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def serve_main(argv=None) -> None:
+    """Entry point of ``pytexmd serve``."""
+    from .sphinx_doc import resolve_jobs
+
+    def workers_argument(value: str) -> int | str:
+        try:
+            resolve_jobs(value)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+        return value if value == "auto" else int(value)
+
+    parser = argparse.ArgumentParser(prog="pytexmd serve", description="Run the pytexmd conversion daemon.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", default=DEFAULT_PORT, type=int, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--socket", dest="socket_path", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", default="auto", type=workers_argument,
+                        help='Worker processes: a number or "auto" (default: auto)')
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
+    server = ConversionServer(args.workers, args.host, args.port, args.socket_path)
+    logger.info("pytexmd serve listening on %s with %d workers", server.address, server.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
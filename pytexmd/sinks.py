@@ -0,0 +1,95 @@
+"""Destinations for the pages of a conversion.
+
+The converter hands every page to an :class:`OutputSink` under a relative
+POSIX path such as ``"intro.md"``. :class:`FileSystemSink` writes below a
+folder and leaves unchanged files alone, :class:`MemorySink` keeps the pages
+in a dictionary, and :class:`ZipSink` packs them into a zip archive. Any
+object with the same ``write`` method works, for example one that uploads
+to an object store.
+
+Example:
+    sink = MemorySink()
+    process_string(sink, latex, depth=1)
+    sink.files["index.md"]
+"""
+
+__all__ = ["OutputSink", "FileSystemSink", "MemorySink", "ZipSink", "as_sink"]
+
+import io
+import os
+import zipfile
+from typing import BinaryIO, Dict, Union
+
+from .file_writer import write_if_changed
+
+
+class OutputSink:
+    """Base class of the page destinations."""
+
+    def write(self, path: str, content: str) -> bool:
+        """Store ``content`` as the page ``path``.
+
+        Returns:
+            bool: False if the page already held exactly this content.
+        """
+        raise NotImplementedError
+
+
+class FileSystemSink(OutputSink):
+    """Write the pages below ``folder``; unchanged files keep their modification time."""
+
+    def __init__(self, folder: Union[str, os.PathLike]):
+        self.folder = os.fspath(folder)
+
+    def write(self, path: str, content: str) -> bool:
+        return write_if_changed(os.path.join(self.folder, *path.split("/")), content)
+
+    def __str__(self) -> str:
+        return self.folder
+
+
+class MemorySink(OutputSink):
+    """Keep the pages in :attr:`files`, a dictionary from path to content."""
+
+    def __init__(self):
+        self.files: Dict[str, str] = {}
+
+    def write(self, path: str, content: str) -> bool:
+        changed = self.files.get(path) != content
+        self.files[path] = content
+        return changed
+
+    def __str__(self) -> str:
+        return "memory"
+
+
+class ZipSink(OutputSink):
+    """Pack the pages into a zip archive at ``target``, a path or a binary file object.
+
+    Close the sink (or use it as a context manager) to finish the archive.
+    """
+
+    def __init__(self, target: Union[str, os.PathLike, BinaryIO]):
+        self.target = target
+        self.archive = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, path: str, content: str) -> bool:
+        self.archive.writestr(path, content.encode("utf-8"))
+        return True
+
+    def close(self) -> None:
+        self.archive.close()
+
+    def __enter__(self) -> "ZipSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return "zip archive" if isinstance(self.target, io.IOBase) else os.fspath(self.target)
+
+
+def as_sink(output: Union[str, os.PathLike, OutputSink]) -> OutputSink:
+    """Return ``output`` itself if it is a sink, else a :class:`FileSystemSink` for the folder."""
+    return output if hasattr(output, "write") else FileSystemSink(output)
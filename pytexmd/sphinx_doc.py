@@ -1,14 +1,25 @@
-"""Create and build the Sphinx project used by pytexmd."""
+"""Create and build the Sphinx project used by pytexmd.
+
+The project scaffold is written directly from the packaged templates, and
+Sphinx is imported only when a project is built, so importing pytexmd for
+plain conversions does not pay for it.
+"""
 
 import ast
+import logging
 import os
-import time
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from pprint import pformat
-from typing import Optional
+from typing import Iterator, Optional, Tuple
+
+from .file_writer import write_if_changed
+from .log import LOGGER_NAME
+from .profiling import stage
 
-from sphinx.cmd.build import main as sphinx_build
-from sphinx.cmd.quickstart import main as sphinx_quickstart
+logger = logging.getLogger(__name__)
 
 
 DEFAULT_MATHJAX_MACROS = {
@@ -55,55 +66,72 @@ def _ensure_mathjax_manual_tags(source_dir: str | Path) -> None:
     )
 
 
-def load_config_template() -> str:
-    """Load the Sphinx configuration template."""
-    template_path = Path(__file__).parent / "templates" / "conf.txt"
+def load_template(name: str) -> str:
+    """Load a packaged template from ``pytexmd/templates``."""
+    template_path = Path(__file__).parent / "templates" / name
     with open(template_path, "r", encoding="utf-8") as file:
         return file.read()
 
 
-def create_config_file(
-    output_dir: str,
+def load_config_template() -> str:
+    """Load the Sphinx configuration template."""
+    return load_template("conf.txt")
+
+
+def render_config_file(
     project_name: str,
     author: str,
     version: str,
     bib_filenames: list = None,
     mathjax_macros: dict = None,
-) -> None:
-    """Create the Sphinx ``conf.py`` in the source directory."""
-    try:
-        source_dir = Path(output_dir) / "source"
-        source_dir.mkdir(parents=True, exist_ok=True)
-        config_path = source_dir / "conf.py"
-
-        config_content = (
-            load_config_template()
-            .replace("XXPROJECTXX", repr(project_name))
-            .replace("XXAUTHORSXX", repr(author))
-            .replace("XXRELEASEXX", repr(version))
-            .replace(
-                "XXMATHJAXMACROSXX",
-                pformat(
-                    mathjax_macros
-                    if mathjax_macros is not None
-                    else DEFAULT_MATHJAX_MACROS,
-                    sort_dicts=False,
-                ),
-            )
+) -> str:
+    """Return the content of the Sphinx ``conf.py`` for these settings."""
+    config_content = (
+        load_config_template()
+        .replace("XXPROJECTXX", repr(project_name))
+        .replace("XXAUTHORSXX", repr(author))
+        .replace("XXRELEASEXX", repr(version))
+        .replace(
+            "XXMATHJAXMACROSXX",
+            pformat(
+                mathjax_macros
+                if mathjax_macros is not None
+                else DEFAULT_MATHJAX_MACROS,
+                sort_dicts=False,
+            ),
         )
+    )
 
-        bib_list = bib_filenames if bib_filenames else ["references.bib"]
-        config_content = config_content.replace(
-            "bibtex_bibfiles = ['references.bib']",
-            f"bibtex_bibfiles = {bib_list!r}",
-        )
+    bib_list = bib_filenames if bib_filenames else ["references.bib"]
+    return config_content.replace(
+        "bibtex_bibfiles = ['references.bib']",
+        f"bibtex_bibfiles = {bib_list!r}",
+    )
 
-        with open(config_path, "w", encoding="utf-8") as file:
-            file.write(config_content)
 
-        print(f"Configuration file created at {config_path}")
+def create_config_file(
+    output_dir: str,
+    project_name: str,
+    author: str,
+    version: str,
+    bib_filenames: list = None,
+    mathjax_macros: dict = None,
+) -> None:
+    """Create the Sphinx ``conf.py`` in the source directory.
+
+    The file is only rewritten when its content changes: Sphinx rebuilds
+    from scratch after a configuration change, so an identical ``conf.py``
+    keeps its modification time.
+    """
+    try:
+        config_path = Path(output_dir) / "source" / "conf.py"
+        config_content = render_config_file(project_name, author, version, bib_filenames, mathjax_macros)
+        if write_if_changed(config_path, config_content):
+            logger.info("Configuration file created at %s", config_path)
+        else:
+            logger.info("Configuration file unchanged at %s", config_path)
     except Exception as exc:
-        print(f"An error occurred while creating the configuration file: {exc}")
+        logger.error("An error occurred while creating the configuration file: %s", exc)
 
 
 def create_sphinx_documentation(
@@ -112,59 +140,250 @@ def create_sphinx_documentation(
     author: str = "Author",
     version: str = "1.0",
 ) -> None:
-    """Create a Sphinx documentation structure with source and build folders."""
+    """Create a Sphinx documentation structure with source and build folders.
+
+    Writes ``source/conf.py``, ``Makefile``, ``make.bat`` and the ``source/_static``,
+    ``source/_templates`` and ``build`` folders from the packaged templates.
+    """
     if os.path.exists(output_dir) and os.path.exists(
         os.path.join(output_dir, "Makefile")
     ):
-        print(f"Sphinx documentation already exists at {output_dir}. Skipping creation.")
+        logger.debug("Sphinx documentation already exists at %s. Skipping creation.", output_dir)
         return
 
-    output_dir = os.path.abspath(output_dir)
-    sphinx_quickstart(
-        [
-            output_dir,
-            "--release",
-            version,
-            "--sep",
-            "--project",
-            project_name,
-            "--author",
-            author,
-            "--makefile",
-            "--batchfile",
-            "--language",
-            "en",
-        ]
-    )
+    root = Path(output_dir).resolve()
+    for folder in (root / "source" / "_static", root / "source" / "_templates", root / "build"):
+        folder.mkdir(parents=True, exist_ok=True)
+    write_if_changed(root / "Makefile", load_template("Makefile.txt"))
+    write_if_changed(root / "make.bat", load_template("make_bat.txt").replace("\n", "\r\n"))
+    logger.info("Sphinx project scaffold created at %s", root)
+
+    create_config_file(str(root), project_name, author, version)
+
+
+def resolve_jobs(jobs: int | str = 1) -> int:
+    """Return the number of Sphinx worker processes for a ``jobs`` setting.
 
-    print("waiting 0.5 seconds to let the file system catch up")
-    time.sleep(0.5)
+    Args:
+        jobs (int | str, optional): ``"auto"`` for one worker per CPU, or a positive integer.
 
+    Raises:
+        ValueError: If ``jobs`` is neither ``"auto"`` nor a positive integer.
+    """
+    if jobs == "auto":
+        return os.cpu_count() or 1
     try:
-        index_rst_path = Path(output_dir) / "source" / "index.rst"
-        if index_rst_path.exists():
-            index_rst_path.unlink()
-            print(f"Deleted auto-generated index.rst file at {index_rst_path}")
-    except Exception as exc:
-        print(f"Warning: Could not delete index.rst: {exc}")
+        count = int(jobs)
+    except (TypeError, ValueError):
+        count = 0
+    if count < 1:
+        raise ValueError(f"jobs must be 'auto' or a positive integer, not {jobs!r}")
+    return count
 
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    create_config_file(output_dir, project_name, author, version)
 
+def make_html(
+    output_dir: str,
+    raise_on_error: bool = False,
+    jobs: int | str = 1,
+    optimize_assets: bool = False,
+) -> Optional[Path]:
+    """Build the Sphinx documentation to HTML format.
 
-def make_html(output_dir: str, raise_on_error: bool = False) -> Optional[Path]:
-    """Build the Sphinx documentation to HTML format."""
+    Args:
+        output_dir (str): Sphinx project folder holding ``source``.
+        raise_on_error (bool, optional): Re-raise build errors instead of printing them.
+        jobs (int | str, optional): Parallel Sphinx read/write workers, ``"auto"`` or N.
+            Defaults to 1 (serial build).
+        optimize_assets (bool, optional): Precompress the output and write its asset
+            manifest (see :mod:`pytexmd.static_assets`). Defaults to False.
+    """
     try:
         source_dir = os.path.join(output_dir, "source")
         build_dir = os.path.join(output_dir, "build")
+        workers = resolve_jobs(jobs)
         _ensure_mathjax_manual_tags(source_dir)
-        result = sphinx_build(["-M", "html", source_dir, build_dir])
+        from sphinx.cmd.build import main as sphinx_build
+
+        arguments = ["-M", "html", source_dir, build_dir]
+        if workers > 1:
+            arguments += ["-j", str(workers)]
+        if _quiet(logging.INFO):
+            arguments.append("-q")
+        with stage("sphinx build"):
+            result = sphinx_build(arguments)
         if result != 0:
             raise RuntimeError(f"Sphinx HTML build failed with exit code {result}")
-        print(f"Sphinx documentation built successfully at {build_dir}")
-        return Path(build_dir) / "html"
+        logger.info("Sphinx documentation built successfully at %s", build_dir)
+        html_dir = Path(build_dir) / "html"
+        if optimize_assets:
+            from .static_assets import optimize_html_output
+
+            with stage("static assets"):
+                optimize_html_output(html_dir)
+        return html_dir
     except Exception as exc:
-        print(f"An error occurred while building the documentation: {exc}")
+        logger.error("An error occurred while building the documentation: %s", exc)
         if raise_on_error:
             raise
         return None
+
+
+def _quiet(level: int) -> bool:
+    """Return True if pytexmd's log level was explicitly set above ``level``.
+
+    Without :func:`pytexmd.log.configure_logging` the level is unset, and
+    Sphinx reports its progress as usual.
+    """
+    configured = logging.getLogger(LOGGER_NAME).level
+    return configured != logging.NOTSET and configured > level
+
+
+class _CurrentStdout:
+    """Stream that writes to whatever ``sys.stdout`` is at write time.
+
+    A persistent Sphinx application keeps the status stream it was created
+    with; this proxy lets callers capture each build with ``redirect_stdout``.
+    Text is dropped while pytexmd's log level is set above ``level`` (quiet mode).
+    """
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def write(self, text: str) -> int:
+        if _quiet(self.level):
+            return len(text)
+        return sys.stdout.write(text)
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class SphinxBuilder:
+    """Keep one Sphinx application per project alive for repeated HTML builds.
+
+    Each :meth:`build` is incremental: only changed documents are read and
+    written again. The application is recreated when ``conf.py`` or a
+    bibliography file changes, or when the build folder has been removed.
+
+    Example:
+        builder = SphinxBuilder("docs")
+        builder.build()  # full build
+        builder.build()  # only what changed since
+    """
+
+    def __init__(self, output_dir: str | Path, jobs: int | str = 1):
+        self.output_dir = Path(output_dir).resolve()
+        self.jobs = resolve_jobs(jobs)
+        self.source_dir = self.output_dir / "source"
+        self.build_dir = self.output_dir / "build"
+        self._app = None
+        self._signature: Optional[Tuple] = None
+        self._directives: dict = {}
+        self._roles: dict = {}
+        self._nodes: set = set()
+        self._lock = threading.Lock()
+
+    def _configuration_signature(self) -> Tuple:
+        """Stat ``conf.py`` and the bibliography files the application loads once."""
+        paths = [self.source_dir / "conf.py", *sorted(self.source_dir.glob("*.bib"))]
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    @contextmanager
+    def _docutils_state(self) -> Iterator[None]:
+        """Install the application's docutils registrations for one build.
+
+        Sphinx registers extension directives, roles and nodes globally in
+        docutils; they are recorded when the application is created and
+        restored around every later build, then removed again afterwards.
+        """
+        from docutils.parsers.rst import directives, roles
+        from sphinx.util.docutils import additional_nodes, docutils_namespace, patch_docutils, register_node
+
+        with patch_docutils(self.source_dir), docutils_namespace():
+            if self._app is not None:
+                directives._directives.update(self._directives)
+                roles._roles.update(self._roles)
+                for node in self._nodes - additional_nodes:
+                    register_node(node)
+            yield
+
+    def _create_app(self) -> None:
+        from docutils.parsers.rst import directives, roles
+        from sphinx.application import Sphinx
+        from sphinx.util.docutils import additional_nodes
+
+        known_directives = dict(directives._directives)
+        known_roles = dict(roles._roles)
+        known_nodes = set(additional_nodes)
+        self._app = Sphinx(
+            srcdir=self.source_dir,
+            confdir=self.source_dir,
+            outdir=self.build_dir / "html",
+            doctreedir=self.build_dir / "doctrees",
+            buildername="html",
+            status=_CurrentStdout(logging.INFO),
+            warning=_CurrentStdout(logging.WARNING),
+            parallel=self.jobs,
+        )
+        self._directives = {
+            name: directive
+            for name, directive in directives._directives.items()
+            if known_directives.get(name) is not directive
+        }
+        self._roles = {
+            name: role for name, role in roles._roles.items() if known_roles.get(name) is not role
+        }
+        self._nodes = set(additional_nodes) - known_nodes
+
+    def build(self, raise_on_error: bool = False) -> Optional[Path]:
+        """Build the project to HTML, reusing the application when possible.
+
+        Args:
+            raise_on_error (bool, optional): Re-raise build errors instead of printing them.
+
+        Returns:
+            Optional[Path]: The HTML folder, or None when the build failed.
+        """
+        with self._lock:
+            try:
+                _ensure_mathjax_manual_tags(self.source_dir)
+                signature = self._configuration_signature()
+                if signature != self._signature or not self.build_dir.is_dir():
+                    self._app = None
+                from sphinx.util.console import color_terminal, nocolor
+
+                if not color_terminal():
+                    nocolor()
+                with stage("sphinx build"), self._docutils_state():
+                    if self._app is None:
+                        self._create_app()
+                        self._signature = signature
+                    else:
+                        from sphinx.util import logging as sphinx_logging
+
+                        # Another application may have taken over Sphinx's log handlers.
+                        sphinx_logging.setup(self._app, self._app._status, self._app._warning)
+                        self._app._warncount = 0
+                    self._app.build(False, [])
+                if self._app.statuscode != 0:
+                    raise RuntimeError(
+                        f"Sphinx HTML build failed with exit code {self._app.statuscode}"
+                    )
+                logger.info("Sphinx documentation built successfully at %s", self.build_dir)
+                return self.build_dir / "html"
+            except Exception as exc:
+                self._app = None
+                logger.error("An error occurred while building the documentation: %s", exc)
+                if raise_on_error:
+                    raise
+                return None
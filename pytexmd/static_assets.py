@@ -0,0 +1,166 @@
+"""Prepare a built HTML site for static hosting.
+
+:func:`optimize_html_output` runs after the Sphinx build. It writes
+precompressed ``.gz`` siblings (and ``.br`` siblings when the optional
+``brotli`` package is installed) next to text files above a size threshold,
+for servers that deliver them directly (``gzip_static``, ``brotli_static``).
+It also writes ``asset-manifest.json``, which records the SHA-256 fingerprint
+of every file.
+
+Sphinx already appends checksums (``?v=...``) to its CSS and JavaScript links,
+so assets keep their names and the manifest serves as the fingerprint list.
+A deploy step can compare it with the manifest of the previous deployment to
+upload only changed files. Files whose fingerprint matches the previous
+manifest are not compressed again, and compressed output is deterministic, so
+unchanged siblings keep their bytes and modification times.
+"""
+
+__all__ = [
+    "COMPRESSIBLE_EXTENSIONS",
+    "DEFAULT_MIN_SIZE",
+    "MANIFEST_NAME",
+    "OptimizeReport",
+    "changed_files",
+    "optimize_html_output",
+]
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .file_writer import write_if_changed
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".js", ".css", ".svg", ".json", ".xml", ".txt", ".map")
+DEFAULT_MIN_SIZE = 1024
+MANIFEST_NAME = "asset-manifest.json"
+_SIBLING_SUFFIXES = (".gz", ".br")
+
+
+def _encoders() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    """Available ``(suffix, compress)`` pairs; brotli is an optional dependency."""
+    encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        encoders.append((".br", lambda data: brotli.compress(data, quality=11)))
+    return encoders
+
+
+class OptimizeReport(NamedTuple):
+    """Outcome of :func:`optimize_html_output`."""
+
+    manifest: Path
+    files: int
+    compressed: int
+    unchanged: int
+    changed: List[str]
+
+
+def changed_files(previous: Dict[str, dict], current: Dict[str, dict]) -> List[str]:
+    """Paths of ``current`` manifest entries that are new or differ from ``previous``."""
+    return sorted(
+        path
+        for path, entry in current.items()
+        if previous.get(path, {}).get("sha256") != entry["sha256"]
+    )
+
+
+def _read_manifest(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            files = json.load(file).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return files if isinstance(files, dict) else {}
+
+
+def optimize_html_output(
+    html_dir: str | Path,
+    min_size: int = DEFAULT_MIN_SIZE,
+    jobs: int | str = "auto",
+) -> OptimizeReport:
+    """Precompress and fingerprint the files of a built HTML site.
+
+    Args:
+        html_dir: The HTML output folder, e.g. ``build/html``.
+        min_size (int, optional): Smallest file size, in bytes, that is precompressed.
+        jobs (int | str, optional): Compression threads, ``"auto"`` or N. Defaults to ``"auto"``.
+
+    Returns:
+        OptimizeReport: The manifest path, file counts and the files changed since
+        the previous run.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .sphinx_doc import resolve_jobs
+
+    root = Path(html_dir)
+    manifest_path = root / MANIFEST_NAME
+    previous = _read_manifest(manifest_path)
+    encoders = _encoders()
+
+    paths = []
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = Path(folder, name)
+            if path == manifest_path or name.startswith("."):
+                continue
+            base, suffix = os.path.splitext(name)
+            if suffix in _SIBLING_SUFFIXES:
+                base_path = path.with_name(base)
+                if base_path.is_file():
+                    continue
+                recorded = previous.get(base_path.relative_to(root).as_posix(), {})
+                if suffix[1:] in recorded.get("encodings", []):
+                    # The file this sibling was compressed from has been removed.
+                    path.unlink()
+                    continue
+            paths.append(path)
+
+    def process(path: Path) -> Tuple[str, dict, Optional[bool]]:
+        data = path.read_bytes()
+        relative = path.relative_to(root).as_posix()
+        entry = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "encodings": []}
+        compressible = path.suffix.lower() in COMPRESSIBLE_EXTENSIONS and len(data) >= min_size
+        known = previous.get(relative, {})
+        reused = compressible and known.get("sha256") == entry["sha256"]
+        for suffix, compress in encoders:
+            sibling = path.with_name(path.name + suffix)
+            if reused and suffix[1:] in known.get("encodings", []) and sibling.is_file():
+                entry["encodings"].append(suffix[1:])
+                continue
+            reused = False
+            packed = compress(data) if compressible else None
+            if packed is not None and len(packed) < len(data):
+                write_if_changed(sibling, packed)
+                entry["encodings"].append(suffix[1:])
+            elif suffix[1:] in known.get("encodings", []) and sibling.exists():
+                sibling.unlink()
+        return relative, entry, (reused if entry["encodings"] else None)
+
+    with ThreadPoolExecutor(max_workers=min(resolve_jobs(jobs), max(len(paths), 1))) as pool:
+        results = list(pool.map(process, paths))
+
+    files = {relative: entry for relative, entry, _ in sorted(results, key=lambda result: result[0])}
+    write_if_changed(manifest_path, json.dumps({"version": 1, "files": files}, indent=1, sort_keys=True) + "\n")
+    report = OptimizeReport(
+        manifest=manifest_path,
+        files=len(files),
+        compressed=sum(1 for _, _, reused in results if reused is False),
+        unchanged=sum(1 for _, _, reused in results if reused),
+        changed=changed_files(previous, files),
+    )
+    encodings = ", ".join(suffix for suffix, _ in encoders)
+    logger.info(
+        "Static assets: %d files, %d compressed (%s), %d precompressed files reused, %d changed since the last build",
+        report.files, report.compressed, encodings, report.unchanged, len(report.changed),
+    )
+    return report
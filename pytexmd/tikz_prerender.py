@@ -0,0 +1,234 @@
+"""Render the TikZ pictures of a conversion in parallel, before the Sphinx build.
+
+Sphinx renders ``{tikz}`` directives one at a time while writing pages. After
+a conversion, :func:`prerender_tikz` compiles every collected picture in a
+process pool with sphinxcontrib-tikz's own renderer, using the settings of the
+generated ``conf.py``, which is parsed, not run. The results go into the
+shared render cache (see :mod:`pytexmd.render_cache`), where the Sphinx build
+then finds them instead of compiling again. A picture that fails is reported
+with its source location instead of failing the Sphinx run late.
+"""
+
+__all__ = [
+    "TikzPicture",
+    "TikzRenderFailure",
+    "collect_tikz_pictures",
+    "load_tikz_settings",
+    "prerender_tikz",
+]
+
+import ast
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Defaults sphinxcontrib-tikz and Sphinx use when conf.py does not set a value.
+_TIKZ_SETTINGS = {
+    "tikz_tikzlibraries": "",
+    "tikz_latex_preamble": "",
+    "tikz_proc_suite": "pdf2svg",
+    "tikz_resolution": 184,
+    "tikz_transparent": True,
+    "tikz_includegraphics_path": "",
+    "latex_engine": "pdflatex",
+    "latex_elements": {},
+}
+
+
+class TikzPicture(NamedTuple):
+    """One picture of a conversion, as sphinxcontrib-tikz will receive it."""
+
+    code: str
+    libs: str
+    inline: bool
+    location: str
+
+
+class TikzRenderFailure(NamedTuple):
+    """A picture that could not be rendered, with the renderer's message."""
+
+    picture: TikzPicture
+    message: str
+
+
+def _locate(code: str, sources: List[str], read: Callable[[str], str]) -> str:
+    """Return ``file:line`` of the first source containing ``code``, else ``"unknown location"``."""
+    first_line = code.strip().splitlines()[0].strip() if code.strip() else ""
+    for path in sources:
+        try:
+            content = read(path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        position = content.find(code)
+        if position == -1 and first_line:
+            position = content.find(first_line)
+        if position != -1:
+            return f"{os.path.basename(path)}:{content.count(chr(10), 0, position) + 1}"
+    return "unknown location"
+
+
+def collect_tikz_pictures(
+    recorded: Iterable[Tuple[str, str, bool]], sources: List[str], read: Optional[Callable[[str], str]] = None
+) -> List[TikzPicture]:
+    """Turn the TikZ pictures of a conversion into unique :class:`TikzPicture` jobs.
+
+    Args:
+        recorded: ``(code, libs, inline)`` of each rendered picture (``text.TIKZ_PICTURES``).
+        sources: LaTeX files searched, in order, for each picture's location.
+        read: Function returning a file's text; defaults to reading it as UTF-8.
+
+    Returns:
+        List[TikzPicture]: One entry per distinct picture, in document order.
+    """
+    read = read or (lambda path: Path(path).read_text(encoding="utf-8"))
+    pictures = []
+    seen = set()
+    for code, libs, inline in recorded:
+        if not code or (code, libs, inline) in seen:
+            continue
+        seen.add((code, libs, inline))
+        pictures.append(TikzPicture(code, libs, inline, _locate(code, sources, read)))
+    return pictures
+
+
+def _proc_suite() -> str:
+    """The converter the generated ``conf.py`` selects on this machine (see ``templates/conf.txt``)."""
+    if shutil.which("pdf2svg"):
+        return "pdf2svg"
+    if any(shutil.which(name) for name in ("ghostscript", "gs", "gswin64", "gswin64c", "gswin32c", "mgs")):
+        return "GhostScript"
+    if shutil.which("pdftoppm") and shutil.which("pnmtopng"):
+        return "Netpbm"
+    return "pdf2svg"
+
+
+def _literal_assignments(conf_path: str | Path) -> dict:
+    """Map the names assigned a literal value at the top level of ``conf_path``; the last assignment wins."""
+    values = {}
+    for node in ast.parse(Path(conf_path).read_text(encoding="utf-8")).body:
+        if not isinstance(node, ast.Assign):
+            continue
+        try:
+            value = ast.literal_eval(node.value)
+        except (ValueError, TypeError, SyntaxError):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                values[target.id] = value
+    return values
+
+
+def load_tikz_settings(conf_path: str | Path) -> dict:
+    """Read the TikZ rendering settings from a Sphinx ``conf.py`` without running it.
+
+    Settings not assigned a literal at the top level keep sphinxcontrib-tikz's
+    defaults, except ``tikz_proc_suite``, which the generated ``conf.py`` picks
+    from the installed converters, as :func:`_proc_suite` does.
+    """
+    values = _literal_assignments(conf_path)
+    settings = {name: values.get(name, default) for name, default in _TIKZ_SETTINGS.items()}
+    if "tikz_proc_suite" not in values:
+        settings["tikz_proc_suite"] = _proc_suite()
+    # sphinxcontrib-tikz's builder_inited turns tikz_includegraphics_path into a preamble.
+    graphics = settings.pop("tikz_includegraphics_path")
+    if isinstance(graphics, str):
+        graphics = [graphics] if graphics else []
+    source_dir = Path(conf_path).resolve().parent
+    settings["_tikz_preamble"] = (
+        "\\graphicspath{" + "".join('{"%s/%s"}' % (source_dir, path.rstrip("/") + "/") for path in graphics) + "}\n"
+        if graphics
+        else ""
+    )
+    return settings
+
+
+def _libraries(settings: dict, picture: TikzPicture) -> str:
+    """The library list sphinxcontrib-tikz's HTML visitors pass to ``render_tikz``."""
+    libs = settings["tikz_tikzlibraries"]
+    if not picture.inline:
+        libs += "," + picture.libs
+    return libs.replace(" ", "").replace("\t", "").strip(", ")
+
+
+def _render_picture(settings: dict, picture: TikzPicture) -> Optional[str]:
+    """Render one picture into the shared cache; return an error message on failure.
+
+    Module-level so it can run in a worker process.
+    """
+    import sphinxcontrib.tikz as tikz_module
+
+    from .render_cache import install_tikz_cache
+
+    if not hasattr(tikz_module, "_pytexmd_original_render_tikz"):
+        install_tikz_cache(tikz_module)
+    config = SimpleNamespace(**{name: value for name, value in settings.items() if not name.startswith("_")})
+    node = {"tikz": picture.code}
+    if not picture.inline:
+        node["stringsubst"] = False
+    with tempfile.TemporaryDirectory() as work:
+        builder = SimpleNamespace(
+            config=config,
+            outdir=os.path.join(work, "html"),
+            imgpath="_images",
+            _tikz_tempdir=work,
+            _tikz_preamble=settings["_tikz_preamble"],
+        )
+        try:
+            result = tikz_module.render_tikz(SimpleNamespace(builder=builder), node, _libraries(settings, picture))
+        except Exception as exc:
+            return str(exc)
+    return None if result is not None else "the picture was not rendered"
+
+
+def _summary(message: str) -> str:
+    """Shorten a renderer message to its LaTeX error lines."""
+    lines = [line.strip() for line in message.splitlines() if line.startswith("!")]
+    if not lines:
+        lines = [line.strip() for line in message.splitlines() if "exited with error code" in line]
+    if not lines and message.strip():
+        lines = [message.strip().splitlines()[-1]]
+    return "; ".join(lines) or "unknown error"
+
+
+def prerender_tikz(pictures: List[TikzPicture], conf_path: str | Path, jobs: int | str = "auto") -> List[TikzRenderFailure]:
+    """Render ``pictures`` into the shared TikZ cache with a bounded process pool.
+
+    Args:
+        pictures: Pictures from :func:`collect_tikz_pictures`.
+        conf_path: The project's ``conf.py``, which supplies the rendering settings.
+        jobs (int | str, optional): Worker processes, ``"auto"`` or N. Defaults to ``"auto"``.
+
+    Returns:
+        List[TikzRenderFailure]: The pictures that failed, in document order.
+    """
+    if not pictures:
+        return []
+    from .sphinx_doc import resolve_jobs
+
+    settings = load_tikz_settings(conf_path)
+    if shutil.which(settings["latex_engine"]) is None:
+        logger.warning("TikZ pre-rendering skipped: %s was not found", settings["latex_engine"])
+        return []
+    workers = min(resolve_jobs(jobs), len(pictures))
+    if workers == 1:
+        errors = [_render_picture(settings, picture) for picture in pictures]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(_render_picture, [settings] * len(pictures), pictures))
+    failures = [
+        TikzRenderFailure(picture, _summary(error))
+        for picture, error in zip(pictures, errors)
+        if error is not None
+    ]
+    logger.info("TikZ pictures pre-rendered: %d of %d", len(pictures) - len(failures), len(pictures))
+    for failure in failures:
+        logger.warning("TikZ picture at %s failed to render: %s", failure.picture.location, failure.message)
+    return failures
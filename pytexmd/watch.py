@@ -0,0 +1,192 @@
+"""Rebuild a project when its sources change (``pytexmd-html --watch``).
+
+:class:`ProjectWatcher` polls the modification times of the files the loader
+works with: the main file, every ``.tex``, bibliography and image file of
+the project folder (from the shared :class:`~pytexmd.file_loader.ProjectIndex`),
+every file its ``\\input`` graph reaches, also outside the folder, and
+bibliographies found next to those files. The graph is read again on every
+poll, so a newly added ``\\input`` is watched from the next poll on. The output
+folder is ignored, so a build never triggers the next one. Polling needs no
+inotify support or extra service, so it also works on headless machines and
+network drives.
+
+:class:`PreviewServer` serves the HTML output on localhost and adds a small
+script to every page that reloads it after the next build.
+"""
+
+__all__ = ["ProjectWatcher", "PreviewServer", "watch"]
+
+import logging
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .file_loader import get_project_index
+
+logger = logging.getLogger(__name__)
+
+_RELOAD_PATH = "/__pytexmd_build__"
+_RELOAD_SCRIPT = (
+    "<script>(function(){var seen=null;setInterval(function(){"
+    "fetch('%s').then(function(r){return r.text();}).then(function(b){"
+    "if(seen!==null&&b!==seen){location.reload();}seen=b;}).catch(function(){});"
+    "},1000);})();</script>" % _RELOAD_PATH
+)
+
+
+class ProjectWatcher:
+    """Detect changes to the source files of a LaTeX project.
+
+    Args:
+        input_file (str): Main LaTeX file.
+        output_folder (str): Generated Sphinx project, whose files are ignored.
+        extra_files (Iterable[str], optional): More files to watch, such as
+            bibliographies outside the project folder (``LatexFile.bib_paths``).
+    """
+
+    def __init__(self, input_file: str, output_folder: str, extra_files: Iterable[str] = ()):
+        self.input_file = os.path.realpath(input_file)
+        self.root = os.path.dirname(self.input_file)
+        self.output_folder = os.path.realpath(output_folder)
+        self.extra_files = [os.path.realpath(path) for path in extra_files]
+        self._snapshot = self.snapshot()
+
+    def _ignored(self, path: str) -> bool:
+        try:
+            return os.path.commonpath([self.output_folder, path]) == self.output_folder
+        except ValueError:
+            return False
+
+    def snapshot(self) -> Dict[str, Optional[int]]:
+        """Map every watched file to its modification time (None once it is gone)."""
+        index = get_project_index(self.root)
+        paths = [self.input_file, *index.files, *index.include_graph(self.input_file), *self.extra_files]
+        snapshot: Dict[str, Optional[int]] = {}
+        for path in paths:
+            if path in snapshot or self._ignored(path):
+                continue
+            try:
+                snapshot[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                snapshot[path] = None
+        return snapshot
+
+    def changes(self) -> List[str]:
+        """Return the files added, removed or modified since the last call."""
+        current = self.snapshot()
+        changed = sorted(
+            path
+            for path in set(current) | set(self._snapshot)
+            if current.get(path) != self._snapshot.get(path)
+        )
+        self._snapshot = current
+        return changed
+
+    def wait_for_changes(
+        self,
+        poll_interval: float = 0.5,
+        debounce: float = 0.3,
+        stop: Optional[threading.Event] = None,
+    ) -> List[str]:
+        """Block until files change, then until they stay unchanged for ``debounce`` seconds.
+
+        Editors often write a file several times in a row, and saving a whole
+        project touches many files; the burst is reported as one change.
+
+        Returns:
+            List[str]: Every file changed during the burst, or ``[]`` when ``stop`` was set.
+        """
+        stop = stop or threading.Event()
+        changed: set = set()
+        while not stop.is_set():
+            latest = self.changes()
+            if latest:
+                changed.update(latest)
+                stop.wait(debounce)
+                continue
+            if changed:
+                return sorted(changed)
+            stop.wait(poll_interval)
+        return []
+
+
+class _PreviewHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] == _RELOAD_PATH:
+            self._send(str(self.server.build_number).encode("ascii"), "text/plain")
+            return
+        path = Path(self.translate_path(self.path))
+        if path.is_dir():
+            path = path / "index.html"
+        if path.suffix == ".html" and path.is_file():
+            page = path.read_bytes()
+            marker = page.rfind(b"</body>")
+            if marker == -1:
+                marker = len(page)
+            self._send(page[:marker] + _RELOAD_SCRIPT.encode("ascii") + page[marker:], "text/html; charset=utf-8")
+            return
+        super().do_GET()
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PreviewServer:
+    """Serve an HTML folder on localhost; open pages reload after :meth:`notify`.
+
+    Args:
+        html_dir (str | Path): The HTML output folder.
+        port (int, optional): TCP port; 0 picks a free one.
+    """
+
+    def __init__(self, html_dir: str | Path, port: int = 8000):
+        self._http = ThreadingHTTPServer(("127.0.0.1", port), partial(_PreviewHandler, directory=str(html_dir)))
+        self._http.build_number = 0
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._http.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def notify(self) -> None:
+        """Tell open pages that a new build is available."""
+        self._http.build_number += 1
+
+    def close(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+
+
+def watch(
+    watcher: ProjectWatcher,
+    rebuild: Callable[[List[str]], None],
+    poll_interval: float = 0.5,
+    debounce: float = 0.3,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Call ``rebuild(changed_files)`` after every debounced burst of changes until ``stop`` is set."""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        changed = watcher.wait_for_changes(poll_interval, debounce, stop)
+        if not changed:
+            continue
+        names = ", ".join(os.path.relpath(path, watcher.root) for path in changed[:5])
+        more = f" and {len(changed) - 5} more" if len(changed) > 5 else ""
+        logger.info("Changed: %s%s", names, more)
+        started = time.perf_counter()
+        rebuild(changed)
+        logger.info("Rebuilt in %.1f s; watching for changes", time.perf_counter() - started)
@@ -1,9 +1,12 @@
+import argparse
+import os
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from app.PytexmdConverter.cli import generate_html
+from app.PytexmdConverter.cli import _jobs_argument, generate_html
+from pytexmd.sphinx_doc import resolve_jobs
 
 
 class HtmlApplicationTests(unittest.TestCase):
@@ -41,8 +44,12 @@ class HtmlApplicationTests(unittest.TestCase):
             author="Author",
             version="2.0",
             mathjax_macros={"R": r"\mathbb{R}"},
+            prune_bibliography=False,
+            prerender_tikz=False,
+        )
+        build.assert_called_once_with(
+            str(output_folder.resolve()), raise_on_error=True, jobs=1, optimize_assets=False
         )
-        build.assert_called_once_with(str(output_folder.resolve()), raise_on_error=True)
 
     def test_generate_html_rejects_missing_input(self):
         with (
@@ -51,6 +58,15 @@ class HtmlApplicationTests(unittest.TestCase):
         ):
             generate_html(str(Path(directory) / "missing.tex"), directory)
 
+    def test_jobs_setting_accepts_auto_and_positive_counts(self):
+        self.assertEqual(resolve_jobs("auto"), os.cpu_count() or 1)
+        self.assertEqual(resolve_jobs("4"), 4)
+        self.assertEqual(_jobs_argument("auto"), "auto")
+        self.assertEqual(_jobs_argument("2"), 2)
+        for invalid in ("0", "-1", "many"):
+            with self.subTest(jobs=invalid), self.assertRaises(argparse.ArgumentTypeError):
+                _jobs_argument(invalid)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import contextlib
+import io
+import json
+import signal
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytexmd import batch
+from pytexmd.batch import jobs_from_glob, load_manifest, run_batch, write_report
+from pytexmd.jobs import ConversionJob
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+\section{Intro}
+Text.
+\end{document}
+"""
+
+
+class BatchTests(unittest.TestCase):
+    def test_manifests_and_globs_describe_jobs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "jobs.json").write_text(json.dumps({
+                "defaults": {"depth": 1},
+                "jobs": [{"input_file": "a/main.tex", "output_folder": "out/a", "html": True}],
+            }), encoding="utf-8")
+            (root / "jobs.csv").write_text(
+                "input_file,output_folder,html,depth,prune_bibliography\n"
+                "a/main.tex,out/a,yes,2,\n",
+                encoding="utf-8",
+            )
+            for name in ("a", "b"):
+                (root / "papers" / name).mkdir(parents=True)
+                (root / "papers" / name / "main.tex").write_text(DOCUMENT, encoding="utf-8")
+
+            from_json = load_manifest(root / "jobs.json")
+            from_csv = load_manifest(root / "jobs.csv")
+            from_glob = jobs_from_glob(str(root / "papers" / "*" / "main.tex"), root / "out")
+
+        self.assertEqual(from_json, [ConversionJob(str(root / "a/main.tex"), str(root / "out/a"), True, {"depth": 1})])
+        self.assertEqual(from_csv, [ConversionJob(str(root / "a/main.tex"), str(root / "out/a"), True, {"depth": 2})])
+        self.assertEqual([job.output_folder for job in from_glob], [str(root / "out" / "a"), str(root / "out" / "b")])
+
+    def test_failures_are_isolated_and_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "good").mkdir()
+            (root / "good" / "main.tex").write_text(DOCUMENT, encoding="utf-8")
+            jobs = [
+                ConversionJob(str(root / "good" / "main.tex"), str(root / "out" / "good"), False, {"depth": 1}),
+                ConversionJob(str(root / "missing.tex"), str(root / "out" / "missing")),
+            ]
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = run_batch(jobs, workers=2)
+            report = write_report(results, root / "report.json", 1.0)
+
+            self.assertTrue((root / "out" / "good" / "source" / "intro.md").is_file())
+        self.assertEqual([result["status"] for result in results], ["ok", "error"])
+        self.assertEqual(report["summary"], {"jobs": 2, "ok": 1, "error": 1, "timeout": 0, "seconds": 1.0})
+        self.assertNotIn("log", report["jobs"][0])
+        self.assertIn("convert", report["jobs"][0]["timings"])
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "time limits need SIGALRM")
+    def test_slow_jobs_time_out(self):
+        def slow_job(job):
+            time.sleep(5)
+
+        with patch.object(batch, "run_job", slow_job):
+            started = time.perf_counter()
+            result = batch._run_with_timeout(ConversionJob("main.tex", "out"), 0.2)
+
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertEqual(result["status"], "timeout")
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "time limits need SIGALRM")
+    def test_cleanup_of_a_timed_out_job_is_not_interrupted(self):
+        cleaned = []
+
+        def slow_job(job):
+            try:
+                time.sleep(5)
+            finally:
+                time.sleep(1.2)
+                cleaned.append(job)
+
+        with patch.object(batch, "run_job", slow_job):
+            result = batch._run_with_timeout(ConversionJob("main.tex", "out"), 0.2)
+
+        self.assertEqual(result["status"], "timeout")
+        self.assertEqual(len(cleaned), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
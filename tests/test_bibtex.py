@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pytexmd.core import _convert_bbl_files
+from pytexmd.filter.bibtex import TheBibliography, convert_bbl_to_bib, iter_bbl_entries
+from pytexmd.filter.core import Undefined
+
+BBL = r"""\begin{thebibliography}{10}
+\bibitem[Knuth(1984)]{knuth} D.~E. Knuth (1984).
+\newblock {\em The {\TeX}book}.
+\newblock Addison-Wesley.
+
+\bibitem{lamport}
+L.~Lamport, \textbf{B.} (1994a).
+\newblock A document preparation system.
+\newblock {\it Second ed.}
+
+\bibitem{plain}
+No blocks here
+\bibitem{late}\newblock x {\it inner {nested} words} y
+\end{thebibliography}
+"""
+
+
+def _tree_conversion(bbl_content: str) -> str:
+    wrapper = Undefined(bbl_content, None)
+    wrapper.expand([TheBibliography])
+    for child in wrapper.children or []:
+        if isinstance(child, TheBibliography):
+            return child.to_string()
+    return ""
+
+
+class BblConversionTests(unittest.TestCase):
+    def test_streaming_converter_matches_element_tree(self):
+        for content in (BBL, "no bibliography", r"\begin{thebibliography}{1}\end{thebibliography}"):
+            with self.subTest(content=content[:20]):
+                self.assertEqual(convert_bbl_to_bib(content), _tree_conversion(content))
+        self.assertEqual(len(list(iter_bbl_entries(BBL))), 4)
+        self.assertIn("  title = {A document preparation system},", convert_bbl_to_bib(BBL))
+
+    def test_several_bbl_files_are_converted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = []
+            for name in ("first", "second"):
+                source = Path(directory, f"{name}.bbl")
+                source.write_text(BBL, encoding="utf-8")
+                jobs.append((str(source), os.path.join(directory, f"{name}.bib")))
+            jobs.append((os.path.join(directory, "missing.bbl"), os.path.join(directory, "missing.bib")))
+
+            errors = _convert_bbl_files(jobs)
+            converted = Path(jobs[1][1]).read_text(encoding="utf-8")
+
+        self.assertEqual(errors[:2], [None, None])
+        self.assertIsNotNone(errors[2])
+        self.assertEqual(converted, convert_bbl_to_bib(BBL))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import ast
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from pytexmd.core import process_file
+
+
+def _bibtex_bibfiles(conf: Path) -> list:
+    module = ast.parse(conf.read_text(encoding="utf-8"))
+    assignment = next(
+        node
+        for node in module.body
+        if isinstance(node, ast.Assign)
+        and any(
+            isinstance(target, ast.Name) and target.id == "bibtex_bibfiles"
+            for target in node.targets
+        )
+    )
+    return ast.literal_eval(assignment.value)
+
+
+class ProcessFileTests(unittest.TestCase):
+    def test_pruned_bibliography_holds_only_cited_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            project = Path(directory, "project")
+            project.mkdir()
+            main = project / "main.tex"
+            main.write_text(
+                r"\begin{document}See \cite{kept}.\end{document}", encoding="utf-8"
+            )
+            (project / "shared.bib").write_text(
+                "@book{kept, title = {Kept}}\n@book{dropped, title = {Dropped}}\n",
+                encoding="utf-8",
+            )
+            output = Path(directory, "site")
+
+            with redirect_stdout(StringIO()):
+                process_file(str(main), str(output), depth=0, prune_bibliography=True)
+
+            source = output / "source"
+            pruned = (source / "references.bib").read_text(encoding="utf-8")
+            bibfiles = _bibtex_bibfiles(source / "conf.py")
+            copied = (source / "shared.bib").exists()
+
+        self.assertEqual(pruned, "@book{kept, title = {Kept}}")
+        self.assertEqual(bibfiles, ["references.bib"])
+        self.assertFalse(copied)
+
+    def test_nocite_star_keeps_every_entry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            project = Path(directory, "project")
+            project.mkdir()
+            main = project / "main.tex"
+            main.write_text(
+                r"\begin{document}See \cite{kept}.\nocite{*}\end{document}", encoding="utf-8"
+            )
+            (project / "shared.bib").write_text(
+                "@book{kept, title = {Kept}}\n@book{listed, title = {Listed}}\n",
+                encoding="utf-8",
+            )
+            output = Path(directory, "site")
+
+            with redirect_stdout(StringIO()):
+                process_file(str(main), str(output), depth=0, prune_bibliography=True)
+
+            source = output / "source"
+            pruned = (source / "references.bib").read_text(encoding="utf-8")
+            page = (source / "index.md").read_text(encoding="utf-8")
+            references = (source / "references.md").read_text(encoding="utf-8")
+
+        self.assertEqual(pruned, "@book{kept, title = {Kept}}\n\n@book{listed, title = {Listed}}")
+        self.assertNotIn("nocite", page)
+        self.assertIn("```{bibliography}\n:all:\n", references)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from pytexmd.file_loader import (
+    index_bib_files,
+    load_tex_file,
+    merge_bib_files,
+    write_merged_bib,
+    write_pruned_bib,
+)
+
+FIRST_BIB = """% shared database
+@string{jams = {J. Amer. Math. Soc.}}
+@article{alpha,
+  title = {Nested {Braces} Survive},
+  journal = jams,
+}
+
+@book{beta, title={B}}
+"""
+
+SECOND_BIB = """@misc{alpha, title = {Duplicate}}
+@misc{gamma, note = {ü}}
+"""
+
+
+class BibMergeTests(unittest.TestCase):
+    def _write(self, directory: str) -> list[str]:
+        first = Path(directory, "first.bib")
+        second = Path(directory, "second.bib")
+        empty = Path(directory, "empty.bib")
+        first.write_text(FIRST_BIB, encoding="utf-8")
+        second.write_text(SECOND_BIB, encoding="utf-8")
+        empty.write_bytes(b"")
+        return [str(first), str(empty), str(second)]
+
+    def test_merge_keeps_first_occurrence_and_keyless_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            merged = merge_bib_files(self._write(directory))
+
+        self.assertEqual(
+            merged,
+            "@string{jams = {J. Amer. Math. Soc.}}\n\n"
+            "@article{alpha,\n  title = {Nested {Braces} Survive},\n"
+            "  journal = jams,\n}\n\n"
+            "@book{beta, title={B}}\n\n"
+            "@misc{gamma, note = {ü}}",
+        )
+
+    def test_index_points_at_entry_bytes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self._write(directory)
+            index = index_bib_files(paths)
+            alpha = index["alpha"].read()
+            gamma = index["gamma"].read()
+
+        self.assertEqual(sorted(index), ["alpha", "beta", "gamma"])
+        self.assertEqual(index["alpha"].path, paths[0])
+        self.assertTrue(alpha.startswith(b"@article{alpha,"))
+        self.assertTrue(alpha.endswith(b"}"))
+        self.assertEqual(gamma.decode("utf-8"), "@misc{gamma, note = {ü}}")
+
+    def test_streamed_output_matches_merged_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self._write(directory)
+            output = io.BytesIO()
+            written = write_merged_bib(paths, output)
+
+            self.assertEqual(
+                output.getvalue().decode("utf-8"), merge_bib_files(paths)
+            )
+        self.assertEqual(set(written), {"alpha", "beta", "gamma"})
+
+    def test_loader_merges_bibliography_on_demand(self):
+        with tempfile.TemporaryDirectory() as directory:
+            main = Path(directory, "main.tex")
+            main.write_text("text", encoding="utf-8")
+            Path(directory, "refs.bib").write_text(SECOND_BIB, encoding="utf-8")
+
+            loaded = load_tex_file(str(main))
+            merged = loaded.merge_bib_content()
+
+        self.assertEqual(len(loaded.bib_paths), 1)
+        self.assertIn("@misc{gamma", merged)
+
+
+class BibPruningTests(unittest.TestCase):
+    def test_only_cited_entries_and_crossref_parents_are_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = Path(directory, "database.bib")
+            database.write_text(
+                "@string{pub = {Publisher}}\n"
+                "@inproceedings{child, crossref = {proc}, publisher = pub}\n"
+                "@article{unused, title = {Unused}}\n"
+                "@proceedings{proc, crossref = {series}}\n"
+                "@book{series, title = {Series}}\n",
+                encoding="utf-8",
+            )
+            output = io.BytesIO()
+
+            missing = write_pruned_bib([str(database)], ["child", "nowhere"], output)
+
+        pruned = output.getvalue().decode("utf-8")
+        self.assertEqual(missing, ["nowhere"])
+        self.assertIn("@string{pub", pruned)
+        self.assertIn("@inproceedings{child", pruned)
+        self.assertIn("@proceedings{proc", pruned)
+        self.assertIn("@book{series", pruned)
+        self.assertNotIn("unused", pruned)
+        self.assertLess(pruned.index("{child"), pruned.index("{proc"))
+
+    def test_star_keeps_every_entry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = Path(directory, "first.bib")
+            first.write_text("@article{alpha, title = {A}}\n", encoding="utf-8")
+            second = Path(directory, "second.bib")
+            second.write_text("@article{beta, title = {B}}\n@article{alpha, title = {Duplicate}}\n", encoding="utf-8")
+            output = io.BytesIO()
+
+            missing = write_pruned_bib([str(first), str(second)], ["*", "nowhere"], output)
+
+        self.assertEqual(missing, ["nowhere"])
+        self.assertEqual(output.getvalue(), b"@article{alpha, title = {A}}\n\n@article{beta, title = {B}}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytexmd import log
+from pytexmd.core import process_file
+from pytexmd.filter import string_to_tree, text
+
+FAKE_PDF2SVG = """#!{python}
+import os, shutil, sys
+with open(os.environ["FAKE_CONVERTER_LOG"], "a") as log:
+    log.write(sys.argv[1] + "\\n")
+shutil.copyfile(sys.argv[1], sys.argv[2])
+"""
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+\section{Figures}
+See Figure~\ref{fig:plot}.
+\begin{figure}[ht]
+\centering
+\includegraphics[width=0.5\textwidth]{figs/plot}
+\caption{A \textbf{plot}.}
+\label{fig:plot}
+\end{figure}
+\includegraphics{photo.png}
+\includegraphics{missing}
+\end{document}
+"""
+
+
+class FigureConversionTests(unittest.TestCase):
+    def test_figure_becomes_myst_figure_with_label_and_width(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            markdown = string_to_tree(DOCUMENT).to_string()
+
+        self.assertIn("```{figure} images/figs/plot.*", markdown)
+        self.assertIn(":width: 50%", markdown)
+        self.assertIn("A **plot**.", markdown)
+        self.assertIn("```{image} images/photo.*", markdown)
+        self.assertNotIn("\\includegraphics", markdown)
+        self.assertEqual(text.IMAGE_REFERENCES, ["figs/plot", "photo.png", "missing"])
+
+    def test_caption_with_math_stays_in_the_figure(self):
+        latex = (
+            "\\begin{document}\\begin{figure}\\centering\\includegraphics[width=\\linewidth]{plot.pdf}"
+            "\\caption{Density of $X_t$ for $t>0$.}\\label{fig:density}\\end{figure}"
+            "See \\ref{fig:density}.\\end{document}"
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            markdown = string_to_tree(latex).to_string()
+
+        self.assertIn(":name: fig:density_0\n:width: 100%\n\nDensity of $X_t$ for $t > 0$.\n```", markdown)
+        self.assertIn("See {ref}`fig:density_0`.", markdown)
+        self.assertNotIn("\\end", markdown)
+        self.assertNotIn("ERROR_UNDEFINED_LABEL", markdown)
+
+
+@unittest.skipIf(sys.platform == "win32", "the fake converter is a POSIX script")
+class ImageAssetTests(unittest.TestCase):
+    def setUp(self):
+        log.configure_logging(handler=log._DEFAULT_HANDLER)
+        self.addCleanup(log.configure_logging, level=logging.NOTSET, handler=None)
+
+    def test_images_are_copied_converted_and_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            tools = root / "bin"
+            tools.mkdir()
+            converter = tools / "pdf2svg"
+            converter.write_text(FAKE_PDF2SVG.format(python=sys.executable), encoding="utf-8")
+            converter.chmod(0o755)
+            (root / "figs").mkdir()
+            (root / "figs" / "plot.pdf").write_bytes(b"%PDF-1.4 plot")
+            (root / "photo.png").write_bytes(b"\x89PNG photo")
+            main = root / "main.tex"
+            main.write_text(DOCUMENT, encoding="utf-8")
+            log = root / "converter.log"
+            environment = {
+                "PATH": str(tools) + os.pathsep + os.environ.get("PATH", ""),
+                "PYTEXMD_CACHE_DIR": str(root / "cache"),
+                "FAKE_CONVERTER_LOG": str(log),
+            }
+            output = io.StringIO()
+
+            with patch.dict(os.environ, environment), contextlib.redirect_stdout(output):
+                process_file(str(main), str(root / "site"), depth=0)
+                process_file(str(main), str(root / "again"), depth=0)
+
+            images = root / "site" / "source" / "images"
+            self.assertEqual((images / "figs" / "plot.svg").read_bytes(), b"%PDF-1.4 plot")
+            self.assertEqual((images / "photo.png").read_bytes(), b"\x89PNG photo")
+            self.assertTrue((root / "again" / "source" / "images" / "figs" / "plot.svg").is_file())
+            self.assertEqual(len(log.read_text().splitlines()), 1)
+            self.assertIn("Warning: image missing was not placed: file not found", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
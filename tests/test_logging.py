@@ -0,0 +1,80 @@
+import contextlib
+import io
+import logging
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytexmd import log
+from pytexmd.core import process_file
+from pytexmd.filter import core
+
+
+class LoggingTests(unittest.TestCase):
+    def setUp(self):
+        log.configure_logging(handler=log._DEFAULT_HANDLER)
+        self.addCleanup(log.configure_logging, level=logging.NOTSET, handler=None)
+
+    def _convert(self, directory):
+        main = Path(directory) / "main.tex"
+        main.write_text("\\begin{document}\\section{A}\\ref{missing}\\end{document}", encoding="utf-8")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            process_file(str(main), str(Path(directory) / "site"), depth=0)
+        return output.getvalue()
+
+    def test_levels_control_what_a_conversion_reports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            normal = self._convert(directory)
+            log.configure_logging(verbose=True)
+            verbose = self._convert(directory)
+            log.configure_logging(quiet=True)
+            quiet = self._convert(directory)
+
+        self.assertIn("Document split into files in:", normal)
+        self.assertNotIn("Unchanged:", normal)
+        self.assertIn("Unchanged:", verbose)
+        self.assertIn("TEX files:", verbose)
+        self.assertNotIn("Document split into files in:", quiet)
+        self.assertIn("Warning: ref_call called on label that was not defined before", quiet)
+
+    def test_hot_path_probes_are_silent_unless_debugging(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            core.BackMatter().position("text")
+            log.configure_logging(verbose=True)
+            core.BackMatter().position("text")
+        self.assertEqual(output.getvalue(), "checking for backmatter\n")
+
+    def test_progress_messages_are_rate_limited(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), patch.object(log.time, "monotonic") as clock:
+            for now in (100.0, 100.2, 100.9, 101.5):
+                clock.return_value = now
+                log.progress("test", "step at %.1f", now)
+        self.assertEqual(output.getvalue(), "step at 100.0\nstep at 101.5\n")
+
+    def test_records_can_go_to_the_root_logger(self):
+        log.configure_logging(handler=None)
+        with self.assertLogs("pytexmd", level="WARNING") as captured:
+            logging.getLogger("pytexmd.core").warning("moved")
+        self.assertEqual(captured.output, ["WARNING:pytexmd.core:moved"])
+
+    def test_the_library_prints_nothing_until_configured(self):
+        code = (
+            "import logging, pytexmd\n"
+            "logger = logging.getLogger('pytexmd')\n"
+            "logger.warning('library')\n"
+            "assert logger.propagate and all(isinstance(h, logging.NullHandler) for h in logger.handlers)\n"
+            "pytexmd.log.configure_logging()\n"
+            "logger.info('application')\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual((result.stdout, result.stderr), ("application\n", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.corpus import write_corpus
+from pytexmd.core import process_file
+from pytexmd.profiling import profiled
+
+BUDGET = Path(__file__).with_name("memory_budget.json")
+
+
+class MemoryBudgetTests(unittest.TestCase):
+    """Traced peak memory of the reference document must stay within ``memory_budget.json``.
+
+    After an intended change in memory use, refresh the budget with
+    ``python benchmarks/memory.py --write-budget``.
+    """
+
+    def test_reference_document_stays_within_the_memory_budget(self):
+        budget = json.loads(BUDGET.read_text(encoding="utf-8"))
+        document = budget["document"]
+        with tempfile.TemporaryDirectory() as directory:
+            main = write_corpus(Path(directory) / "corpus", scale=document["scale"], seed=document["seed"])
+            with contextlib.redirect_stdout(io.StringIO()):
+                with profiled(memory=True) as profiler:
+                    process_file(str(main), str(Path(directory) / "site"), depth=document["depth"])
+        peaks = {record["stage"]: record["peak_bytes"] for record in profiler.stages}
+        peaks["total"] = profiler.total["peak_bytes"]
+        for stage, limit in budget["peak_bytes"].items():
+            with self.subTest(stage=stage):
+                self.assertIn(stage, peaks)
+                self.assertLessEqual(peaks[stage], limit, f"{stage} peaked at {peaks[stage]:,} bytes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import contextlib
+import io
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from pytexmd import log, profiling
+from pytexmd.core import process_file
+from pytexmd.filter import counters, string_to_tree
+
+
+class ProfilerTests(unittest.TestCase):
+    def setUp(self):
+        log.configure_logging(handler=log._DEFAULT_HANDLER)
+        self.addCleanup(log.configure_logging, level=logging.NOTSET, handler=None)
+
+    def test_nested_stages_record_time_and_memory(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            with profiling.profiled() as profiler:
+                with profiling.stage("outer"):
+                    with profiling.stage("inner"):
+                        data = [bytes(1000) for _ in range(1000)]
+                    del data
+        outer, inner = profiler.stages
+        self.assertEqual((outer["stage"], outer["depth"]), ("outer", 0))
+        self.assertEqual((inner["stage"], inner["depth"]), ("inner", 1))
+        self.assertGreaterEqual(inner["peak_bytes"], 1000 * 1000)
+        self.assertGreaterEqual(outer["peak_bytes"], inner["peak_bytes"])
+        self.assertGreaterEqual(outer["wall"], inner["wall"])
+        self.assertIn("  inner", output.getvalue())
+        self.assertIn("RSS MiB", output.getvalue())
+        self.assertIsNone(profiling.active_profiler())
+
+    def test_stages_are_ignored_without_a_profiler(self):
+        with profiling.stage("nothing"):
+            pass
+        self.assertIsNone(profiling.active_profiler())
+
+    def test_process_file_writes_the_stage_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            main = Path(directory) / "main.tex"
+            main.write_text(
+                "\\begin{document}\\section{Intro}Text $x$.\\begin{equation}y\\end{equation}\\end{document}",
+                encoding="utf-8",
+            )
+            report = Path(directory) / "profile.json"
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                process_file(str(main), str(Path(directory) / "site"), depth=0, profile=str(report))
+            stages = [record["stage"] for record in json.loads(report.read_text(encoding="utf-8"))["stages"]]
+        for name in ("load", "bibliography", "antibugs", "preprocessor", "finish up", "render", "split", "write", "config"):
+            self.assertIn(name, stages)
+        self.assertTrue(any(name.startswith("expand 1: ") for name in stages))
+        self.assertIn("Profile written to", output.getvalue())
+
+
+class SearcherCounterTests(unittest.TestCase):
+    def test_searcher_calls_are_counted_per_phase(self):
+        latex = "\\begin{document}\\section{A}$x$ and $y$.\\section{B}\\em text\\end{document}"
+        with contextlib.redirect_stdout(io.StringIO()):
+            with counters.count_searchers() as counts:
+                string_to_tree(latex)
+        self.assertIsNone(counters.ACTIVE)
+        searchers = {row["searcher"]: row for row in counts.by_searcher()}
+        self.assertEqual(searchers["InlineLatex"]["selected"], 2)
+        self.assertEqual(searchers["SectionLikeSearcher(\\section)"]["selected"], 2)
+        self.assertEqual(searchers["JunkSearcher(\\em)"]["selected"], 1)
+        for row in searchers.values():
+            self.assertGreaterEqual(row["position_calls"], row["found"])
+            self.assertGreater(row["chars_scanned"], 0)
+        phases = {row["phase"] for row in counts.by_phase() if row["searcher"] == "InlineLatex"}
+        self.assertEqual(len(phases), 1)
+        self.assertTrue(phases.pop().startswith("expand "))
+        self.assertIn("InlineLatex", counts.format_table(limit=None))
+
+    def test_profile_report_includes_searcher_counters(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            with profiling.profiled(memory=False) as profiler:
+                string_to_tree("\\begin{document}$x$\\end{document}")
+        searchers = profiler.report()["searchers"]
+        self.assertIn("InlineLatex", [row["searcher"] for row in searchers["searchers"]])
+        self.assertTrue(searchers["passes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.PytexmdConverter.file_detection import detect_project_files
+from pytexmd import file_loader
+from pytexmd.file_loader import get_project_index, load_tex_file
+
+
+class ProjectIndexTests(unittest.TestCase):
+    def test_unchanged_project_reuses_the_scan(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "main.tex").write_text("main", encoding="utf-8")
+
+            first = get_project_index(directory)
+            second = get_project_index(directory)
+            (root / "figures").mkdir()
+            third = get_project_index(directory)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+    def test_modified_file_is_read_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory, "main.tex")
+            source.write_text("old", encoding="utf-8")
+            index = get_project_index(directory)
+            self.assertEqual(index.read(str(source)), "old")
+
+            source.write_text("new", encoding="utf-8")
+            stat = source.stat()
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            self.assertEqual(index.read(str(source)), "new")
+
+    def test_conversion_reuses_the_detection_scan(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            main = root / "main.tex"
+            main.write_text(r"A \input{chapter} B", encoding="utf-8")
+            (root / "chapter.tex").write_text("chapter", encoding="utf-8")
+
+            report = detect_project_files(main)
+            with patch.object(
+                file_loader, "ProjectIndex", side_effect=AssertionError("rescanned")
+            ):
+                loaded = load_tex_file(str(main))
+
+        self.assertIn("chapter.tex", {item.path.name for item in report.files})
+        self.assertEqual(loaded.content, "A chapter B")
+
+    def test_include_graph_records_unresolved_inputs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            main = root / "main.tex"
+            main.write_text(r"\input{part}\input{missing}", encoding="utf-8")
+            (root / "part.tex").write_text(r"\input{leaf}", encoding="utf-8")
+            (root / "leaf.tex").write_text("leaf", encoding="utf-8")
+
+            graph = get_project_index(directory).include_graph(str(main))
+
+        edges = graph[os.path.realpath(main)]
+        self.assertEqual([argument for argument, _ in edges], ["part", "missing"])
+        self.assertIsNone(edges[1][1])
+        self.assertEqual(len(graph), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+from pytexmd.render_cache import RenderCache, install_tikz_cache
+
+
+def _fake_tikz_module(calls: list) -> ModuleType:
+    module = ModuleType("fake_tikz")
+    module.OUT_EXTENSION = {"pdf2svg": "svg"}
+    module.cleanup_tikzcode = lambda translator, node: node["tikz"]
+
+    def render_tikz(translator, node, libs="", stringsubst=False):
+        calls.append(node["tikz"])
+        images = Path(translator.builder.outdir, "_images")
+        images.mkdir(parents=True, exist_ok=True)
+        name = "tikz-%s.svg" % hashlib.sha1(node["tikz"].encode("utf-8")).hexdigest()
+        (images / name).write_text("<svg>" + node["tikz"] + "</svg>", encoding="utf-8")
+        return "_images/" + name
+
+    module.render_tikz = render_tikz
+    return module
+
+
+def _translator(outdir: str, preamble: str = "") -> SimpleNamespace:
+    config = SimpleNamespace(
+        tikz_proc_suite="pdf2svg",
+        tikz_latex_preamble=preamble,
+        latex_elements={},
+        tikz_resolution=184,
+        tikz_transparent=True,
+        latex_engine="pdflatex",
+    )
+    builder = SimpleNamespace(config=config, outdir=outdir, imgpath="_images", _tikz_preamble="")
+    return SimpleNamespace(builder=builder)
+
+
+class RenderCacheTests(unittest.TestCase):
+    def test_least_recently_used_entries_are_evicted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = RenderCache("test", Path(directory, "cache"), max_bytes=10)
+            source = Path(directory, "image")
+            source.write_bytes(b"1234")
+            paths = [cache.put(key * 8, ".png", source) for key in ("aa", "bb")]
+            os.utime(paths[0], ns=(3_000_000_000, 3_000_000_000))
+            os.utime(paths[1], ns=(1_000_000_000, 1_000_000_000))
+
+            cache.put("cc" * 8, ".png", source)
+
+            self.assertIsNotNone(cache.get("aa" * 8, ".png"))
+            self.assertIsNone(cache.get("bb" * 8, ".png"))
+            self.assertIsNotNone(cache.get("cc" * 8, ".png"))
+
+    def test_identical_pictures_are_rendered_once_across_builds(self):
+        calls = []
+        module = _fake_tikz_module(calls)
+        node = {"tikz": r"\draw (0,0) -- (1,1);"}
+        with tempfile.TemporaryDirectory() as directory:
+            install_tikz_cache(module, RenderCache("tikz", Path(directory, "cache")))
+
+            first = module.render_tikz(_translator(os.path.join(directory, "one")), node, "calc")
+            second = module.render_tikz(_translator(os.path.join(directory, "two")), node, "calc")
+            copied = Path(directory, "two", second).read_text(encoding="utf-8")
+            module.render_tikz(_translator(os.path.join(directory, "three"), r"\usepackage{bm}"), node, "calc")
+
+        self.assertEqual(first, second)
+        self.assertEqual(copied, "<svg>" + node["tikz"] + "</svg>")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import contextlib
+import http.client
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytexmd import server as server_module
+from pytexmd.jobs import ConversionJob, parse_job
+from pytexmd.server import ConversionServer, submit_job
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+\section{Intro}
+Text $x$.
+\end{document}
+"""
+
+
+class ConversionServerTests(unittest.TestCase):
+    def _start(self, **arguments) -> ConversionServer:
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+        server = ConversionServer(workers=1, **arguments)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.close()
+
+        self.addCleanup(stop)
+        return server
+
+    def test_jobs_are_validated(self):
+        job = parse_job({"input_file": "main.tex", "output_folder": "site", "depth": 1, "options": {"jobs": "auto"}})
+        self.assertEqual(job.options, {"jobs": "auto", "depth": 1})
+        for invalid in (
+            {"output_folder": "site"},
+            {"input_file": "main.tex", "output_folder": "site", "colour": True},
+            {"input_file": "main.tex", "output_folder": "site", "depth": "deep"},
+            {"input_file": "main.tex", "output_folder": "site", "jobs": 0},
+        ):
+            with self.subTest(job=invalid), self.assertRaises(ValueError):
+                parse_job(invalid)
+
+    def test_workers_keep_only_the_recently_used_builders(self):
+        def run_job(job, builders):
+            builders.setdefault(job.output_folder, object())
+            return {"output_folder": job.output_folder}
+
+        self.addCleanup(server_module._BUILDERS.clear)
+        with patch.object(server_module, "run_job", run_job):
+            for folder in ["a", "b", "c", "d", "a", "e", "f"]:
+                server_module._worker_run(ConversionJob("main.tex", folder, True, {}))
+        self.assertEqual(list(server_module._BUILDERS), ["d", "a", "e", "f"])
+
+    def test_jobs_run_on_warm_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "main.tex").write_text(DOCUMENT, encoding="utf-8")
+            (root / "refs.bib").write_text("", encoding="utf-8")
+            server = self._start(port=0)
+            job = {"input_file": str(root / "main.tex"), "output_folder": str(root / "site"), "html": True, "depth": 1}
+
+            first = submit_job(job, server.address)
+            second = submit_job(job, server.address)
+            missing = submit_job(dict(job, input_file=str(root / "missing.tex")), server.address)
+            invalid = submit_job({"input_file": "main.tex"}, server.address)
+            status = submit_job(None, server.address)
+
+            self.assertEqual(first["status"], "ok", first.get("error"))
+            self.assertTrue(Path(first["html_index"]).is_file())
+            self.assertEqual(set(second["timings"]), {"convert", "build", "total", "queued"})
+            self.assertIn("0 added, 0 changed, 0 removed", second["log"])
+            self.assertEqual(missing["status"], "error")
+            self.assertIn("not found", missing["error"])
+            self.assertIn("output_folder", invalid["error"])
+            self.assertEqual(status, {"status": "ok", "workers": 1, "running": 0, "completed": 2, "failed": 1})
+
+    def test_requests_from_web_pages_are_rejected(self):
+        server = self._start(port=0)
+        host_port = server.address.split("://", 1)[1]
+        body = json.dumps({"input_file": "main.tex", "output_folder": "site"})
+
+        def post(headers):
+            connection = http.client.HTTPConnection(host_port, timeout=10)
+            self.addCleanup(connection.close)
+            connection.request("POST", "/jobs", body, headers)
+            return connection.getresponse().status
+
+        self.assertEqual(post({"Content-Type": "text/plain"}), 415)
+        port = host_port.rsplit(":", 1)[1]
+        self.assertEqual(post({"Content-Type": "application/json", "Host": f"attacker.example:{port}"}), 403)
+        self.assertEqual(submit_job(None, server.address)["completed"], 0)
+
+    @unittest.skipIf(sys.platform == "win32", "Unix sockets are not available")
+    def test_unix_socket_never_replaces_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "keep.txt")
+            Path(path).write_text("keep", encoding="utf-8")
+            with self.assertRaises(FileExistsError):
+                ConversionServer(workers=1, socket_path=path)
+            self.assertEqual(Path(path).read_text(encoding="utf-8"), "keep")
+
+    @unittest.skipIf(sys.platform == "win32", "Unix sockets are not available")
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pytexmd.sock")
+            server = self._start(socket_path=path)
+
+            self.assertEqual(submit_job(None, server.address)["workers"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
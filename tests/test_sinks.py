@@ -0,0 +1,66 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from pytexmd import convert_to_files, write_myst
+from pytexmd.filter import process_string, string_to_tree
+from pytexmd.sinks import FileSystemSink, MemorySink, ZipSink
+
+LATEX = (
+    "\\begin{document}Preamble text."
+    "\\section{Intro}Intro text $x$.\\subsection{Details}More.\\subsection{Notes}Notes."
+    "\\section{Results}Results text.\\end{document}"
+)
+
+
+class OutputSinkTests(unittest.TestCase):
+    def _disk_files(self, depth):
+        with tempfile.TemporaryDirectory() as directory:
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_string(directory, LATEX, depth=depth)
+            return {path.name: path.read_text(encoding="utf-8") for path in Path(directory).iterdir()}
+
+    def test_convert_to_files_matches_the_files_written_to_disk(self):
+        for depth in (0, 2):
+            with self.subTest(depth=depth):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pages = convert_to_files(LATEX, depth=depth)
+                self.assertEqual(pages, self._disk_files(depth))
+                self.assertIn("references.md", pages)
+        self.assertIn("```{toctree}", pages["index.md"])
+        self.assertIn("{bibliography}", pages["references.md"])
+
+    def test_zip_sink_holds_the_same_pages(self):
+        buffer = io.BytesIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ZipSink(buffer) as sink:
+                process_string(sink, LATEX, depth=2)
+            pages = convert_to_files(LATEX, depth=2)
+        with zipfile.ZipFile(buffer) as archive:
+            self.assertEqual({name: archive.read(name).decode("utf-8") for name in archive.namelist()}, pages)
+
+    def test_write_myst_streams_the_rendered_document(self):
+        pieces = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_myst(LATEX, SimpleNamespace(write=pieces.append))
+            expected = string_to_tree(LATEX).to_string()
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), expected)
+
+    def test_sinks_report_unchanged_pages(self):
+        memory = MemorySink()
+        self.assertTrue(memory.write("page.md", "text"))
+        self.assertFalse(memory.write("page.md", "text"))
+        with tempfile.TemporaryDirectory() as directory:
+            disk = FileSystemSink(Path(directory) / "nested")
+            self.assertTrue(disk.write("sub/page.md", "text"))
+            self.assertFalse(disk.write("sub/page.md", "text"))
+            self.assertEqual((Path(directory) / "nested" / "sub" / "page.md").read_text(encoding="utf-8"), "text")
+
+
+if __name__ == "__main__":
+    unittest.main()
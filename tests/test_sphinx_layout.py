@@ -1,12 +1,21 @@
 import tempfile
 import unittest
 import ast
+import io
+from contextlib import redirect_stderr, redirect_stdout
 from html.parser import HTMLParser
 from pathlib import Path
 
 from sphinx.cmd.build import build_main
 
-from pytexmd.sphinx_doc import _ensure_mathjax_manual_tags, create_config_file
+from pytexmd.core import process_file
+from pytexmd.sphinx_doc import (
+    SphinxBuilder,
+    _ensure_mathjax_manual_tags,
+    create_config_file,
+    create_sphinx_documentation,
+    make_html,
+)
 
 
 class _DivBalanceParser(HTMLParser):
@@ -61,6 +70,97 @@ class SphinxLayoutTests(unittest.TestCase):
                 ast.literal_eval(assignment.value)["tex"]["tags"], "ams"
             )
 
+    def test_scaffold_is_written_from_templates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory) / "site"
+
+            create_sphinx_documentation(str(root), "Scaffold", "Author", "2.0")
+
+            self.assertTrue((root / "source" / "_static").is_dir())
+            self.assertTrue((root / "source" / "_templates").is_dir())
+            self.assertTrue((root / "build").is_dir())
+            self.assertFalse((root / "source" / "index.rst").exists())
+            self.assertIn("SOURCEDIR     = source", (root / "Makefile").read_text())
+            self.assertIn(b"set SOURCEDIR=source\r\n", (root / "make.bat").read_bytes())
+            config = (root / "source" / "conf.py").read_text(encoding="utf-8")
+            self.assertIn("project = 'Scaffold'", config)
+            self.assertEqual(
+                [path.name for path in root.rglob("*.tmp")], []
+            )
+
+    def test_builder_reuses_application_until_config_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            create_sphinx_documentation(str(root), "Builder", "Author", "1.0")
+            source = root / "source"
+            (source / "references.bib").write_text("", encoding="utf-8")
+            (source / "index.md").write_text("# Index\n\nFirst.\n", encoding="utf-8")
+            builder = SphinxBuilder(root)
+            output = io.StringIO()
+
+            with redirect_stdout(output), redirect_stderr(output):
+                builder.build(raise_on_error=True)
+                application = builder._app
+                (source / "index.md").write_text("# Index\n\nSecond.\n", encoding="utf-8")
+                log = io.StringIO()
+                with redirect_stdout(log):
+                    html = builder.build(raise_on_error=True)
+                reused = builder._app
+                with (source / "conf.py").open("a", encoding="utf-8") as config:
+                    config.write("\n# changed\n")
+                builder.build(raise_on_error=True)
+
+            self.assertIs(reused, application)
+            self.assertIsNot(builder._app, application)
+            self.assertIn("0 added, 1 changed, 0 removed", log.getvalue())
+            self.assertIn("Second.", (html / "index.html").read_text(encoding="utf-8"))
+
+    def test_unchanged_conversion_reads_no_documents_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "main.tex").write_text(
+                "\\documentclass{article}\n\\begin{document}\n"
+                "\\section{One}\\label{s:a}\nText $x$ \\cite{a}.\n\\section{Two}\nMore, see \\ref{s:a}.\n"
+                "\\end{document}\n",
+                encoding="utf-8",
+            )
+            (root / "refs.bib").write_text("@misc{a, title={A}}\n", encoding="utf-8")
+            site = root / "site"
+            log = io.StringIO()
+
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                process_file(str(root / "main.tex"), str(site), depth=1, prune_bibliography=True)
+                make_html(str(site))
+                config_mtime = (site / "source" / "conf.py").stat().st_mtime_ns
+                process_file(str(root / "main.tex"), str(site), depth=1, prune_bibliography=True)
+                with redirect_stdout(log):
+                    make_html(str(site))
+
+            self.assertEqual((site / "source" / "conf.py").stat().st_mtime_ns, config_mtime)
+            self.assertIn("0 added, 0 changed, 0 removed", log.getvalue())
+
+    def test_mathjax_is_only_loaded_on_pages_with_math(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            with redirect_stdout(io.StringIO()):
+                create_sphinx_documentation(str(root), "Math", "Author", "1.0")
+            source = root / "source"
+            (source / "references.bib").write_text("", encoding="utf-8")
+            (source / "index.md").write_text(
+                "# Index\n\n```{toctree}\nplain\nmath\n```\n", encoding="utf-8"
+            )
+            (source / "plain.md").write_text("# Plain\n\nNo formulas.\n", encoding="utf-8")
+            (source / "math.md").write_text("# Math\n\nInline $x^2$.\n", encoding="utf-8")
+
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                html = make_html(str(root), raise_on_error=True)
+
+            loads_mathjax = {
+                page: "window.MathJax" in (html / f"{page}.html").read_text(encoding="utf-8")
+                for page in ("index", "plain", "math")
+            }
+            self.assertEqual(loads_mathjax, {"index": False, "plain": False, "math": True})
+
     def test_older_config_is_migrated_without_overriding_explicit_tag_mode(self):
         with tempfile.TemporaryDirectory() as directory:
             source = Path(directory)
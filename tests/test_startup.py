@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# Cumulative ``-X importtime`` budget for ``import pytexmd.filter``, in
+# microseconds. Importing Sphinx alone takes several times this.
+FILTER_IMPORT_BUDGET_US = 250_000
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+class StartupTests(unittest.TestCase):
+    def test_filter_import_stays_within_budget(self):
+        result = _run("import pytexmd.filter", "-X", "importtime")
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, total, name = line.split("|")
+                if total.strip().isdigit():
+                    cumulative[name.strip()] = int(total)
+
+        self.assertLess(cumulative["pytexmd.filter"], FILTER_IMPORT_BUDGET_US)
+
+    def test_sphinx_is_not_imported_with_the_package(self):
+        result = _run(
+            "import sys, pytexmd; "
+            "print(sorted(m for m in sys.modules "
+            "if m.split('.')[0] in ('sphinx', 'docutils', 'babel', 'regex')))"
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_stdin_mode_writes_myst_without_importing_sphinx(self):
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, pytexmd.cli; pytexmd.cli.main(['-']); "
+                "print(sorted(m for m in sys.modules if m.split('.')[0] in ('sphinx', 'docutils')), file=sys.stderr)",
+            ],
+            cwd=ROOT,
+            input="\\section{Intro}Text with $x$.\\ref{missing}",
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True,
+        )
+
+        self.assertIn("## Intro\nText with $x$.", result.stdout)
+        self.assertNotIn("Warning", result.stdout)
+        self.assertIn("Warning: ref_call called on label that was not defined before", result.stderr)
+        self.assertEqual(result.stderr.splitlines()[-1], "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
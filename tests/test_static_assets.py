@@ -0,0 +1,53 @@
+import contextlib
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pytexmd.static_assets import MANIFEST_NAME, optimize_html_output
+
+
+class StaticAssetTests(unittest.TestCase):
+    def _optimize(self, root):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return optimize_html_output(root, min_size=100, jobs=2)
+
+    def test_assets_are_precompressed_once_and_changes_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "_static").mkdir()
+            page = root / "index.html"
+            page.write_text("<p>text</p>\n" * 50, encoding="utf-8")
+            (root / "other.html").write_text("<p>other</p>\n" * 50, encoding="utf-8")
+            (root / "_static" / "small.css").write_text("p{}", encoding="utf-8")
+            (root / "_static" / "logo.png").write_bytes(b"\x89PNG" * 100)
+            (root / "_static" / "data.tar.gz").write_bytes(b"archive")
+
+            first = self._optimize(root)
+            compressed = root / "index.html.gz"
+            self.assertEqual(gzip.decompress(compressed.read_bytes()), page.read_bytes())
+            self.assertFalse((root / "_static" / "small.css.gz").exists())
+            self.assertFalse((root / "_static" / "logo.png.gz").exists())
+            manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
+            self.assertIn("_static/data.tar.gz", manifest)
+            self.assertIn("gz", manifest["index.html"]["encodings"])
+            self.assertEqual((first.files, first.compressed, len(first.changed)), (5, 2, 5))
+
+            page.write_text("<p>new</p>\n" * 50, encoding="utf-8")
+            (root / "other.html").unlink()
+            second = self._optimize(root)
+
+            self.assertEqual(second.changed, ["index.html"])
+            self.assertEqual((second.compressed, second.unchanged), (1, 0))
+            self.assertFalse((root / "other.html.gz").exists())
+            self.assertTrue((root / "_static" / "data.tar.gz").exists())
+            self.assertEqual(gzip.decompress(compressed.read_bytes()), page.read_bytes())
+
+            third = self._optimize(root)
+            self.assertEqual((third.compressed, third.unchanged, third.changed), (0, 1, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.stress import CASES, STOPPED, exponent, run_case
+from pytexmd import log
+from pytexmd.core import process_file
+from pytexmd.filter import budget, string_to_tree
+from pytexmd.filter.preprocessor import run_preprocessor
+
+# Wall-clock budget of one stress run; the sizes below take well under a second.
+CASE_SECONDS = 20
+SIZES = (50, 200)
+
+
+class StressTests(unittest.TestCase):
+    """Pathological inputs must finish within their budget.
+
+    Growth is checked on the budget's step counts only. The conversion time of
+    the nested and label-heavy cases still grows about with the square of the
+    size; ``benchmarks/stress.py`` reports both.
+    """
+
+    def setUp(self):
+        log.configure_logging(level=logging.CRITICAL)
+        self.addCleanup(log.configure_logging, level=logging.NOTSET, handler=None)
+
+    def test_pathological_inputs_finish_with_bounded_step_growth(self):
+        for name in CASES:
+            with self.subTest(case=name):
+                runs = [run_case(name, size, CASE_SECONDS) for size in SIZES]
+                for run in runs:
+                    self.assertEqual(run["stopped"], STOPPED.get(name))
+                if name not in STOPPED:
+                    self.assertLessEqual(exponent(SIZES, [run["steps"] for run in runs]), 1.2)
+
+    def test_recursive_definitions_are_stopped_with_a_diagnostic(self):
+        for latex in (
+            "\\newcommand{\\foo}{\\foo x}\\foo",
+            "\\newcommand{\\a}{\\b x}\\newcommand{\\b}{\\a}\\a",
+        ):
+            with self.subTest(latex=latex):
+                with self.assertRaises(budget.ConversionBudgetExceeded) as caught:
+                    with budget.conversion_budget():
+                        run_preprocessor(latex)
+                self.assertEqual(caught.exception.kind, "depth")
+                self.assertIn("\\newcommand expansion", str(caught.exception))
+
+    def test_step_and_time_limits_abort_the_conversion(self):
+        latex = CASES["labels"](50)
+        with self.assertRaises(budget.ConversionBudgetExceeded) as caught:
+            with budget.conversion_budget(steps=100):
+                string_to_tree(latex)
+        self.assertEqual((caught.exception.kind, caught.exception.steps), ("steps", 101))
+        with self.assertRaises(budget.ConversionBudgetExceeded) as caught:
+            with budget.conversion_budget(seconds=0):
+                string_to_tree(latex)
+        self.assertEqual(caught.exception.kind, "time")
+        self.assertIsNone(budget.ACTIVE)
+
+    def test_process_file_applies_the_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            main = Path(directory) / "main.tex"
+            main.write_text(CASES["labels"](20), encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                with self.assertRaises(budget.ConversionBudgetExceeded):
+                    process_file(str(main), str(Path(directory) / "site"), depth=0, step_budget=10)
+                process_file(str(main), str(Path(directory) / "site"), depth=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytexmd import log
+from pytexmd.core import process_file
+from pytexmd.sphinx_doc import make_html
+from pytexmd.filter import text
+from pytexmd.tikz_prerender import TikzPicture, load_tikz_settings, prerender_tikz
+
+FAKE_PDFLATEX = """#!{python}
+import os, sys
+tex = sys.argv[-1]
+with open(os.environ["FAKE_TEX_LOG"], "a") as log:
+    log.write(tex + "\\n")
+source = open(tex, encoding="utf-8").read()
+if "\\\\undefinedmacro" in source:
+    print("! Undefined control sequence.")
+    sys.exit(1)
+with open(tex[:-4] + ".pdf", "w", encoding="utf-8") as pdf:
+    pdf.write(source)
+"""
+
+FAKE_PDF2SVG = """#!{python}
+import shutil, sys
+shutil.copyfile(sys.argv[1], sys.argv[2])
+"""
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+\section{Pictures}
+\begin{tikzpicture}
+\draw (0,0) -- (1,1);
+\end{tikzpicture}
+
+Broken:
+\begin{tikzpicture}
+\undefinedmacro
+\end{tikzpicture}
+\end{document}
+"""
+
+
+@unittest.skipIf(sys.platform == "win32", "fake TeX tools are POSIX scripts")
+class TikzPrerenderTests(unittest.TestCase):
+    def setUp(self):
+        log.configure_logging(handler=log._DEFAULT_HANDLER)
+        self.addCleanup(log.configure_logging, level=logging.NOTSET, handler=None)
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        tools = self.root / "bin"
+        tools.mkdir()
+        for name, script in (("pdflatex", FAKE_PDFLATEX), ("pdf2svg", FAKE_PDF2SVG)):
+            path = tools / name
+            path.write_text(script.format(python=sys.executable), encoding="utf-8")
+            path.chmod(0o755)
+        self.log = self.root / "latex.log"
+        environment = {
+            "PATH": str(tools) + os.pathsep + os.environ.get("PATH", ""),
+            "PYTEXMD_CACHE_DIR": str(self.root / "cache"),
+            "FAKE_TEX_LOG": str(self.log),
+        }
+        self._environment = patch.dict(os.environ, environment)
+        self._environment.start()
+
+    def tearDown(self):
+        self._environment.stop()
+        self._directory.cleanup()
+
+    def _latex_runs(self) -> int:
+        return len(self.log.read_text().splitlines()) if self.log.exists() else 0
+
+    def test_prerendered_pictures_are_reused_and_failures_located(self):
+        main = self.root / "main.tex"
+        main.write_text(DOCUMENT, encoding="utf-8")
+        (self.root / "refs.bib").write_text("", encoding="utf-8")
+        site = self.root / "site"
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            process_file(str(main), str(site), depth=0, prerender_tikz=True)
+        self.assertIn("TikZ pictures pre-rendered: 1 of 2", output.getvalue())
+        self.assertIn("TikZ picture at main.tex:10 failed to render: ! Undefined control sequence.", output.getvalue())
+        self.assertEqual(self._latex_runs(), 2)
+        self.assertEqual(len(list((self.root / "cache" / "tikz").rglob("*.svg"))), 1)
+
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            make_html(str(site))
+        # Only the broken picture is compiled again by the Sphinx build.
+        self.assertEqual(self._latex_runs(), 3)
+        self.assertEqual(len(list((site / "build" / "html" / "_images").glob("tikz-*.svg"))), 1)
+
+    def test_pool_renders_each_picture(self):
+        conf = self.root / "conf.py"
+        conf.write_text("tikz_proc_suite = 'pdf2svg'\n", encoding="utf-8")
+        pictures = [
+            TikzPicture(rf"\draw (0,0) -- ({index},1);", "calc", False, f"main.tex:{index}")
+            for index in range(3)
+        ]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            failures = prerender_tikz(pictures, conf, jobs=2)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(self._latex_runs(), 3)
+
+    def test_pictures_are_only_recorded_for_prerendering(self):
+        main = self.root / "main.tex"
+        main.write_text(DOCUMENT, encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_file(str(main), str(self.root / "site"), depth=0)
+        self.assertIsNone(text.TIKZ_PICTURES)
+        self.assertEqual(self._latex_runs(), 0)
+
+    def test_settings_are_read_without_running_conf_py(self):
+        conf = self.root / "conf.py"
+        conf.write_text(
+            "import sys\n"
+            "sys.exit('conf.py was run')\n"
+            "tikz_resolution = 150\n"
+            "tikz_resolution = 400\n"
+            "tikz_tikzlibraries = 'calc, ' + 'fit'\n",
+            encoding="utf-8",
+        )
+        settings = load_tikz_settings(conf)
+        self.assertEqual((settings["tikz_resolution"], settings["tikz_tikzlibraries"]), (400, ""))
+        self.assertEqual(settings["tikz_proc_suite"], "pdf2svg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from pathlib import Path
+
+from pytexmd.watch import PreviewServer, ProjectWatcher, watch
+
+
+def _touch(path: Path, text: str, seconds: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(seconds * 1_000_000_000, seconds * 1_000_000_000))
+
+
+class ProjectWatcherTests(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self.root = Path(self._directory.name)
+        _touch(self.root / "main.tex", r"\input{chapter}", 1)
+        _touch(self.root / "chapter.tex", "Text", 1)
+        (self.root / "site" / "source").mkdir(parents=True)
+        self.watcher = ProjectWatcher(str(self.root / "main.tex"), str(self.root / "site"))
+
+    def test_sources_are_watched_and_output_is_ignored(self):
+        _touch(self.root / "site" / "source" / "chapter.md", "Generated", 2)
+        (self.root / "site" / "source" / "figure.png").write_bytes(b"png")
+        self.assertEqual(self.watcher.changes(), [])
+
+        _touch(self.root / "chapter.tex", "Edited", 2)
+        (self.root / "figure.png").write_bytes(b"png")
+        (self.root / "refs.bib").write_text("", encoding="utf-8")
+
+        self.assertEqual(
+            [os.path.basename(path) for path in self.watcher.changes()],
+            ["chapter.tex", "figure.png", "refs.bib"],
+        )
+        self.assertEqual(self.watcher.changes(), [])
+
+    def test_inputs_outside_the_project_folder_are_watched(self):
+        project = self.root / "proj"
+        project.mkdir()
+        (self.root / "shared").mkdir()
+        _touch(project / "main.tex", "Main", 1)
+        _touch(self.root / "shared" / "ch.tex", "Chapter", 1)
+        watcher = ProjectWatcher(str(project / "main.tex"), str(project / "site"))
+
+        _touch(project / "main.tex", r"\input{../shared/ch}", 2)
+        self.assertEqual([os.path.basename(path) for path in watcher.changes()], ["main.tex", "ch.tex"])
+        _touch(self.root / "shared" / "ch.tex", "Edited", 3)
+        self.assertEqual([os.path.basename(path) for path in watcher.changes()], ["ch.tex"])
+
+    def test_bursts_of_changes_trigger_one_rebuild(self):
+        stop = threading.Event()
+        rebuilds = []
+
+        def rebuild(changed):
+            rebuilds.append([os.path.basename(path) for path in changed])
+            stop.set()
+
+        thread = threading.Thread(target=watch, args=(self.watcher, rebuild, 0.05, 0.2, stop))
+        with contextlib.redirect_stdout(io.StringIO()):
+            thread.start()
+            _touch(self.root / "chapter.tex", "One", 2)
+            _touch(self.root / "main.tex", r"\input{chapter} Two", 3)
+            thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(rebuilds, [["chapter.tex", "main.tex"]])
+
+
+class PreviewServerTests(unittest.TestCase):
+    def test_pages_poll_for_new_builds(self):
+        with tempfile.TemporaryDirectory() as directory:
+            (Path(directory) / "index.html").write_text("<html><body>Site</body></html>", encoding="utf-8")
+            server = PreviewServer(directory, port=0)
+            self.addCleanup(server.close)
+
+            with urllib.request.urlopen(server.url) as response:
+                page = response.read().decode("utf-8")
+            with urllib.request.urlopen(server.url + "__pytexmd_build__") as response:
+                before = response.read()
+            server.notify()
+            with urllib.request.urlopen(server.url + "__pytexmd_build__") as response:
+                after = response.read()
+
+        self.assertIn("Site<script>", page)
+        self.assertTrue(page.endswith("</script></body></html>"))
+        self.assertNotEqual(before, after)
+
+
+if __name__ == "__main__":
+    unittest.main()